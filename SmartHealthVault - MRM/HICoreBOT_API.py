@@ -8,19 +8,20 @@ import io
 import json
 import faiss
 import numpy as np
-from fastapi import FastAPI, UploadFile, Form
+from fastapi import Depends, FastAPI, UploadFile, Form
 from fastapi.responses import FileResponse, JSONResponse
 from sentence_transformers import SentenceTransformer
 from langdetect import detect, DetectorFactory
 from unstructured.partition.auto import partition
-import pytesseract
-from PIL import Image
-import fitz
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.pagesizes import letter
-from openai import AzureOpenAI
+from database.migrations import upgrade_database
+from services.llm_gateway import llm_gateway
+from services.llm_resilience import LLMError, llm_error_handler
+from services.pdf_extraction import PdfTextExtractor
+from services.rate_limiter import rate_limit
 
 # ========== CONFIG ==========
 DetectorFactory.seed = 0
@@ -29,11 +30,7 @@ os.environ["AZURE_OPENAI_API_KEY"] = "G3AKaFyet7mSiT9cDWoxol7bpTfQ9U91IrWUiD1mvg
 os.environ["AZURE_OPENAI_ENDPOINT"] = "https://hicor-megtc6ig-eastus2.cognitiveservices.azure.com/openai/deployments/gpt-4/chat/completions?api-version=2025-01-01-preview"  # ✅ base URL only
 deployment_name = "gpt-4"
 
-client = AzureOpenAI(
-    api_key=os.environ["AZURE_OPENAI_API_KEY"],
-    azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"],
-    api_version="2025-01-01-preview"
-)
+# Azure calls go through the shared gateway, which reads the AZURE_OPENAI_* settings above
 
 # ========== GLOBAL STATE ==========
 processed_text = None
@@ -50,38 +47,23 @@ def extract_text_with_unstructured(file_path):
     elements = partition(filename=file_path)
     return "\n".join([el.text for el in elements if el.text])
 
-def extract_and_ocr_images_from_pdf(file_path):
-    ocr_text = ""
-    doc = fitz.open(file_path)
-    for i, page in enumerate(doc):
-        for j, img in enumerate(page.get_images(full=True)):
-            xref = img[0]
-            pix = fitz.Pixmap(doc, xref)
-            if pix.n > 4:
-                pix0 = fitz.Pixmap(fitz.csGRAY, pix)
-            else:
-                pix0 = pix
-            img_path = f"temp_{i}_{j}.png"
-            pix0.save(img_path)
-            ocr_text += pytesseract.image_to_string(Image.open(img_path))
-            os.remove(img_path)
-    return ocr_text
-
 def detect_language_with_fallback(text):
     try:
         return detect(text) if text.strip() else "Unknown"
     except Exception:
         return "Unknown"
 
-def call_azure_openai_api(prompt, max_tokens=512, temperature=0.7):
-    response = client.chat.completions.create(
-        model=deployment_name,
-        messages=[{"role": "system", "content": "You are a helpful assistant. Respond in JSON when asked for questions."},
-                  {"role": "user", "content": prompt}],
+async def call_azure_openai_api(prompt, max_tokens=512, temperature=0.7, cache=True):
+    return await llm_gateway.complete(
+        "You are a helpful assistant. Respond in JSON when asked for questions.",
+        prompt,
         max_tokens=max_tokens,
-        temperature=temperature
+        temperature=temperature,
+        model=deployment_name,
+        provider="azure",
+        route="hicorebot",
+        cache=cache,
     )
-    return response.choices[0].message.content
 
 def safe_json_parse(output):
     try:
@@ -91,6 +73,17 @@ def safe_json_parse(output):
 
 # ========== FASTAPI APP ==========
 app = FastAPI(title="HICoreBOT API", description="AI-powered Document Processing & QnA API")
+app.add_exception_handler(LLMError, llm_error_handler)
+
+@app.on_event("startup")
+def on_startup():
+    # LLM calls are recorded in the application database's usage ledger
+    upgrade_database()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Close pooled LLM connections and write out buffered usage rows
+    llm_gateway.close()
 
 @app.post("/process_document")
 async def process_document(file: UploadFile, encoding: str = Form("Auto-Detect")):
@@ -100,9 +93,12 @@ async def process_document(file: UploadFile, encoding: str = Form("Auto-Detect")
         with open(file_path, "wb") as f:
             f.write(await file.read())
 
-        text = extract_text_with_unstructured(file_path)
-        if file.filename.endswith(".pdf"):
-            text += extract_and_ocr_images_from_pdf(file_path)
+        if file.filename.lower().endswith(".pdf"):
+            # shared extraction engine: page text + image OCR, cached by content hash
+            with PdfTextExtractor().extract(file_path, ocr=True) as doc:
+                text = doc.text("\n")
+        else:
+            text = extract_text_with_unstructured(file_path)
 
         processed_text = text
         detected_lang = detect_language_with_fallback(text[:2000])
@@ -120,16 +116,16 @@ async def process_document(file: UploadFile, encoding: str = Form("Auto-Detect")
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
-@app.get("/summary/{summary_type}")
+@app.get("/summary/{summary_type}", dependencies=[Depends(rate_limit("hicorebot.summary"))])
 async def generate_summary(summary_type: str):
     if processed_text is None:
         return {"error": "Upload and process a document first"}
     prompt = f"Create a {'concise (3-5 sentences)' if summary_type=='short' else 'detailed (2-3 paragraphs)'} summary:\n{processed_text[:3000]}"
-    summary = call_azure_openai_api(prompt)
+    summary = await call_azure_openai_api(prompt)
     summaries[summary_type] = summary
     return {"summary_type": summary_type, "summary": summary}
 
-@app.post("/generate_questions")
+@app.post("/generate_questions", dependencies=[Depends(rate_limit("hicorebot.generate_questions"))])
 async def generate_questions(levels: str = Form("Basic-2, Intermediate-2, Advanced-1")):
     global generated_questions
     if processed_text is None:
@@ -138,7 +134,8 @@ async def generate_questions(levels: str = Form("Basic-2, Intermediate-2, Advanc
     for part in levels.split(","):
         level, count = part.strip().split("-")
         prompt = f"Generate {count} {level} multiple-choice and descriptive questions in JSON with fields: mcq=[{{question, options, answer, explanation}}], descriptive=[{{question, answer}}]. Source:\n{processed_text[:4000]}"
-        output = call_azure_openai_api(prompt)
+        # each call should add new questions, so never reuse a cached answer
+        output = await call_azure_openai_api(prompt, cache=False)
         parsed = safe_json_parse(output)
 
         if isinstance(parsed, dict):
@@ -158,7 +155,7 @@ async def generate_questions(levels: str = Form("Basic-2, Intermediate-2, Advanc
         "latest_descriptive": generated_questions["descriptive"][-3:]  # last 3 descriptives
     }
 
-@app.post("/ask")
+@app.post("/ask", dependencies=[Depends(rate_limit("hicorebot.ask"))])
 async def ask_question(query: str = Form(...)):
     global asked_questions
     if faiss_index is None:
@@ -168,7 +165,7 @@ async def ask_question(query: str = Form(...)):
     _, idx = faiss_index.search(np.array(query_emb).astype('float32'), 3)
     context = "\n".join([text_chunks[i] for i in idx[0]])
     prompt = f"Answer using this context only:\n{context}\nQ: {query}\nA:"
-    answer = call_azure_openai_api(prompt)
+    answer = await call_azure_openai_api(prompt)
     asked_questions.append({"question": query, "answer": answer})
     return {"answer": answer}
 
@@ -1,14 +1,21 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
 import os
 import uuid
 from pathlib import Path
 
 # Import existing functions from ml_agent_llm_summarizer
 from ml_agent_llm_summarizer import search_tool, summarize_tool, template_tool
+from database.db_manager import get_db_session
+from database.migrations import upgrade_database
+from services.job_engine import JobContext, JobManager, job_engine
+from services.llm_gateway import llm_gateway
+from services.rate_limiter import rate_limit
+from services.single_flight import SingleFlight
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,6 +33,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def on_startup():
+    # Reports run as jobs, and LLM calls are recorded in the usage ledger, both in the application database
+    upgrade_database()
+    job_engine.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    job_engine.shutdown()
+    # Close pooled LLM connections and write out buffered usage rows
+    llm_gateway.close()
+
 # Pydantic models for request/response
 class ReportRequest(BaseModel):
     topic: str
@@ -36,55 +55,92 @@ class ReportResponse(BaseModel):
     message: str
     report_path: Optional[str] = None
     download_url: Optional[str] = None
+    job_id: Optional[str] = None
+    status_url: Optional[str] = None
+    progress: Optional[float] = None
+
+report_flight = SingleFlight("report.generate")
+
+def research_summary(topic: str) -> str:
+    return summarize_tool(search_tool(topic))
 
 # Configuration
 REPORTS_DIR = "reports"
 os.makedirs(REPORTS_DIR, exist_ok=True)
 BASE_URL = "http://localhost:8000"  # Update this in production
 
-@app.post("/api/generate-report", response_model=ReportResponse)
-async def generate_report(request: ReportRequest):
+REPORT_JOB = "report"
+
+def run_report_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Job handler: research the topic, summarize it and write the report"""
+    topic = payload["topic"]
+    
+    # Generate a unique filename
+    report_id = str(uuid.uuid4())
+    safe_topic = "".join(c if c.isalnum() or c in ' _-' else '_' for c in topic)
+    filename = f"{safe_topic}_{report_id[:8]}.docx"
+    filepath = os.path.join(REPORTS_DIR, filename)
+    
+    # Generate the report using existing functions
+    # Concurrent jobs for the same topic share one search + summary
+    ctx.progress(0.1, "Researching and summarizing")
+    summary = report_flight.do(topic.strip().lower(), research_summary, topic)
+    
+    # Save the report
+    ctx.progress(0.9, "Writing report")
+    template_tool({
+        "topic": topic,
+        "summary": summary,
+        "output_path": filepath  # Modified template_tool to accept output_path
+    })
+    
+    return {
+        "report_path": filepath,
+        "download_url": f"{BASE_URL}/api/download/{filename}"
+    }
+
+job_engine.register(REPORT_JOB, run_report_job)
+
+@app.post("/api/generate-report", response_model=ReportResponse, status_code=202,
+          dependencies=[Depends(rate_limit("report.generate"))])
+def generate_report(request: ReportRequest, db: Session = Depends(get_db_session)):
     """
-    Generate a research report for the given topic.
+    Start generating a research report for the given topic.
     
     Args:
         request (ReportRequest): The request containing the topic and output format
     
     Returns:
-        ReportResponse: The response containing the status and download URL
+        ReportResponse: The queued job's id and status URL; poll it for the download URL
     """
-    try:
-        # Generate a unique filename
-        report_id = str(uuid.uuid4())
-        safe_topic = "".join(c if c.isalnum() or c in ' _-' else '_' for c in request.topic)
-        filename = f"{safe_topic}_{report_id[:8]}.docx"
-        filepath = os.path.join(REPORTS_DIR, filename)
-        
-        # Generate the report using existing functions
-        raw_results = search_tool(request.topic)
-        summary = summarize_tool(raw_results)
-        
-        # Save the report
-        template_tool({
-            "topic": request.topic,
-            "summary": summary,
-            "output_path": filepath  # Modified template_tool to accept output_path
-        })
-        
-        download_url = f"{BASE_URL}/api/download/{filename}"
-        
-        return {
-            "status": "success",
-            "message": "Report generated successfully",
-            "report_path": filepath,
-            "download_url": download_url
-        }
-        
-    except Exception as e:
+    job = JobManager(db).submit(REPORT_JOB, request.model_dump())
+    return ReportResponse(
+        status=job.status,
+        message="Report generation started",
+        job_id=job.id,
+        status_url=f"/api/reports/{job.id}",
+        progress=job.progress
+    )
+
+@app.get("/api/reports/{job_id}", response_model=ReportResponse)
+def report_status(job_id: str, db: Session = Depends(get_db_session)):
+    """Status of a report job; includes the download URL once it has succeeded."""
+    job = JobManager(db).get_job(job_id)
+    if not job or job.kind != REPORT_JOB:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating report: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
         )
+    result = job.result or {}
+    return ReportResponse(
+        status=job.status,
+        message=job.error or job.message or "",
+        report_path=result.get("report_path"),
+        download_url=result.get("download_url"),
+        job_id=job.id,
+        status_url=f"/api/reports/{job.id}",
+        progress=job.progress
+    )
 
 @app.get("/api/download/{filename}")
 async def download_report(filename: str):
@@ -0,0 +1,137 @@
+"""
+End-to-end throughput of the LLM-backed endpoints with the offline
+backends: the stub LLM provider (deterministic completions with
+configurable latency/usage) and fixture-based web search. Requests go
+through the full ASGI app in-process, so routing, extraction, coalescing,
+the gateway's limiter and the response cache are all exercised.
+
+Run from the application root:
+    python -m benchmarks.llm_pipeline_bench --requests 200 --concurrency 32 --latency-ms 400
+
+Scenarios use distinct queries/documents unless --repeat-ratio is set, in
+which case that fraction of requests repeats an earlier one (cache hits).
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def configure(args, tmp):
+    # must run before the app is imported: these are read at import time
+    os.environ.update({
+        "LLM_PROVIDER": "stub",
+        "SEARCH_BACKEND": "fixture",
+        "RATE_LIMIT_ENABLED": "false",  # one client: measure the pipeline, not admission control
+        "LLM_STUB_LATENCY_MS": str(args.latency_ms),
+        "LLM_STUB_LATENCY_DIST": args.latency_dist,
+        "LLM_STUB_COMPLETION_TOKENS": str(args.completion_tokens),
+        "LLM_MAX_IN_FLIGHT": str(args.max_in_flight),
+        "LLM_CACHE_BACKEND": "memory" if args.repeat_ratio else "none",
+        "SUMMARY_CACHE_BACKEND": "none",
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        "BLOB_STORE_DIR": os.path.join(tmp, "blobs"),
+        "PROCESSED_DIR": os.path.join(tmp, "processed"),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "offline"),
+    })
+
+
+def build_pdf(path, pages, seed):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(
+            fitz.Rect(36, 36, 576, 756),
+            f"Document {seed} page {number}. " + "Clinical note: stable, continue treatment. " * 40,
+            fontsize=8,
+        )
+    doc.save(path)
+    doc.close()
+
+
+def pick(i, args):
+    if args.repeat_ratio and i and random.random() < args.repeat_ratio:
+        return random.randrange(i)
+    return i
+
+
+async def run(client, scenario, args, tmp):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    pdfs = {}
+
+    async def one(i):
+        nonlocal errors
+        n = pick(i, args)
+        async with semaphore:
+            start = time.perf_counter()
+            if scenario == "search":
+                r = await client.post("/ai/search-and-summarize/", json={"query": f"treatment options {n}", "max_results": 3})
+            else:
+                if n not in pdfs:
+                    pdfs[n] = os.path.join(tmp, f"doc{n}.pdf")
+                    build_pdf(pdfs[n], args.pages, n)
+                with open(pdfs[n], "rb") as f:
+                    r = await client.post("/analyze/pdf", files={"file": (f"doc{n}.pdf", f.read(), "application/pdf")})
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += r.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "req_per_s": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "errors": errors,
+    }
+
+
+async def main_async(args, tmp):
+    import httpx
+    import main
+    from services.llm_gateway import llm_gateway
+
+    main.on_startup()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for scenario in args.scenarios:
+            before = llm_gateway.snapshot()
+            result = await run(client, scenario, args, tmp)
+            after = llm_gateway.snapshot()
+            print(f"{scenario:>8}: {result['req_per_s']:7.1f} req/s  p50 {result['p50_ms']:7.0f} ms"
+                  f"  p95 {result['p95_ms']:7.0f} ms  errors {result['errors']}"
+                  f"  llm calls {after['calls'] - before['calls']}"
+                  f"  tokens {after['total_tokens'] - before['total_tokens']}")
+    llm_gateway.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenarios", nargs="+", default=["search", "pdf"], choices=["search", "pdf"])
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--latency-dist", default="lognormal", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--completion-tokens", type=int, default=200)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=5, help="pages per synthetic PDF")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(args, tmp)
+        sys.path.insert(0, os.getcwd())
+        asyncio.run(main_async(args, tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Per-patient record listing: legacy full-table load + Python filter vs the
+indexed keyset page, with and without the ``content`` projection.
+
+Seeds --records rows across --patients patients (default 1M / 10k) into a
+temporary, fully migrated SQLite database. Seeding 1M rows takes a minute
+or two and roughly --content-bytes x --records of disk.
+
+Run from the application root:
+    python -m benchmarks.patient_records_bench
+    python -m benchmarks.patient_records_bench --records 100000 --patients 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from database.concrete.record_db import RecordDatabase
+from database.engine_config import EngineSettings, build_engine
+from database.migrations import upgrade_database
+from models.record_model import RecordModel
+from schemas.record_schema import RecordParser
+
+CATEGORIES = ["lab", "prescription", "imaging", "discharge", "vaccination"]
+SEED_CHUNK = 50_000
+
+
+def seed(engine, records: int, patients: int, content_bytes: int):
+    start = datetime(2020, 1, 1)
+    content = "x" * content_bytes
+    with engine.begin() as conn:
+        for offset in range(0, records, SEED_CHUNK):
+            conn.execute(insert(RecordModel), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": f"patient-{random.randrange(patients)}",
+                    "category": random.choice(CATEGORIES),
+                    "title": f"Record {i}",
+                    "content": content,
+                    "extra_metadata": '{"pages": 1}',
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(offset, min(offset + SEED_CHUNK, records))
+            ])
+
+
+def legacy(session, patient_id):
+    # what RecordManager.get_records_by_patient used to do
+    return [RecordParser.to_json(r) for r in RecordDatabase(session).list_all() if r.user_id == patient_id]
+
+
+def paged_full(session, patient_id, category=None):
+    page = RecordDatabase(session).list_page({"user_id": patient_id, "category": category}, limit=50)
+    return [RecordParser.to_json(r) for r in page.items]
+
+
+def paged_summary(session, patient_id, category=None):
+    page = RecordDatabase(session).list_page({"user_id": patient_id, "category": category}, limit=50, summary=True)
+    return [RecordParser.to_summary(r) for r in page.items]
+
+
+def measure(Session, fn, patients, queries, **kwargs):
+    latencies = []
+    for _ in range(queries):
+        session = Session()
+        patient_id = f"patient-{random.randrange(patients)}"
+        start = time.perf_counter()
+        fn(session, patient_id, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        session.close()
+    latencies.sort()
+    return statistics.median(latencies), latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--content-bytes", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--legacy-queries", type=int, default=3, help="the legacy path reads the whole table; 0 skips it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(EngineSettings(database_url=f"sqlite:///{os.path.join(tmp, 'bench.db')}"))
+        upgrade_database(engine)
+        start = time.perf_counter()
+        seed(engine, args.records, args.patients, args.content_bytes)
+        print(f"seeded {args.records} records / {args.patients} patients in {time.perf_counter() - start:.1f}s")
+        Session = sessionmaker(bind=engine)
+
+        cases = [
+            ("page (full rows)", paged_full, args.queries, {}),
+            ("page (summary)", paged_summary, args.queries, {}),
+            ("page (summary, category)", paged_summary, args.queries, {"category": "lab"}),
+        ]
+        if args.legacy_queries:
+            cases.insert(0, ("legacy list_all + filter", legacy, args.legacy_queries, {}))
+
+        print(f"{'path':<28}{'p50 ms':>12}{'p95 ms':>12}")
+        for name, fn, queries, kwargs in cases:
+            p50, p95 = measure(Session, fn, args.patients, queries, **kwargs)
+            print(f"{name:<28}{p50:>12.3f}{p95:>12.3f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Pages per second of PDF text extraction by worker count: page ranges
+extracted concurrently in a process pool (services.pdf_extraction) vs a
+single in-process pass, on a synthetic text-heavy PDF.
+
+Run from the application root:
+    python -m benchmarks.pdf_extraction_bench --pages 500 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from services import pdf_extraction
+from services.pdf_extraction import extract_pages, extract_pages_parallel
+
+LINE = "Discharge summary: patient stable, vitals within normal limits, continue current medication. "
+
+
+def build_pdf(path, pages, lines_per_page):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(f"{number:04d}.{i:02d} {LINE}" for i in range(lines_per_page))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 756), text, fontsize=6)
+    doc.save(path)
+    doc.close()
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=80, help="text lines per page")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.pdf")
+        build_pdf(path, args.pages, args.lines)
+        print(f"{args.pages} pages, {os.path.getsize(path) / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+
+        serial, expected = measure(lambda: extract_pages(path), args.repeat)
+        print(f"{'in-process':>12}: {args.pages / serial:9.0f} pages/s ({serial * 1000:.0f} ms)")
+
+        for workers in args.workers:
+            pdf_extraction.shutdown_pool()
+            run = lambda: extract_pages_parallel(path, args.pages, workers=workers, min_pages_per_worker=1)
+            run()  # start the pool outside the timing; it is long-lived in the server
+            elapsed, pages = measure(run, args.repeat)
+            assert pages == expected, "parallel extraction changed the output"
+            print(f"{workers:>4} workers: {args.pages / elapsed:9.0f} pages/s ({elapsed * 1000:.0f} ms,"
+                  f" {serial / elapsed:.2f}x)")
+        pdf_extraction.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Concurrent read/write throughput: legacy engine vs tuned engine profile.
+
+Run from the application root:
+    python -m benchmarks.sqlite_engine_bench --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from database.engine_config import EngineSettings, build_engine
+
+DDL = (
+    "CREATE TABLE notifications (id VARCHAR PRIMARY KEY, user_id VARCHAR NOT NULL, "
+    "title VARCHAR NOT NULL, message VARCHAR NOT NULL, read BOOLEAN, created_at DATETIME)"
+)
+INSERT = text(
+    "INSERT INTO notifications (id, user_id, title, message, read, created_at) "
+    "VALUES (:id, :user_id, :title, :message, 0, :created_at)"
+)
+SELECT = text("SELECT id, title, read FROM notifications WHERE user_id = :user_id LIMIT 20")
+
+
+def legacy_engine(url: str):
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+
+def tuned_engine(url: str):
+    return build_engine(EngineSettings(database_url=url))
+
+
+def run(engine, writers: int, readers: int, seconds: float, users: int = 500):
+    with engine.begin() as conn:
+        conn.execute(text(DDL))
+
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer(worker: int):
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(INSERT, {
+                        "id": uuid.uuid4().hex,
+                        "user_id": f"user-{(done + worker) % users}",
+                        "title": "Lab result ready",
+                        "message": "Your latest report has been uploaded.",
+                        "created_at": datetime.utcnow(),
+                    })
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    def reader(worker: int):
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(SELECT, {"user_id": f"user-{(done + worker) % users}"}).fetchall()
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return {k: v / seconds if k != "errors" else v for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'writes/s':>12}{'reads/s':>12}{'errors':>10}")
+    for name, factory in (("legacy", legacy_engine), ("tuned", tuned_engine)):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            result = run(factory(url), args.writers, args.readers, args.seconds)
+        print(f"{name:<10}{result['writes']:>12.1f}{result['reads']:>12.1f}{result['errors']:>10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Statement count and latency of NotificationManager.mark_as_read:
+legacy read-modify-write (SELECT, UPDATE, refresh SELECT) vs the
+single-statement UPDATE ... RETURNING fast path.
+
+Run from the application root:
+    python -m benchmarks.update_fast_path_bench --rows 5000 --ops 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from database.base import Base
+from database.bulk import insert_many
+from database.concrete.notification_db import NotificationDatabase
+from database.engine_config import EngineSettings, build_engine
+from models.notification_model import NotificationModel
+
+
+def legacy_update(db, id, updates):
+    n = db.query(NotificationModel).filter(NotificationModel.id == id).first()
+    if not n: return None
+    for k, v in updates.items(): setattr(n, k, v)
+    db.commit(); db.refresh(n); return n
+
+
+def fast_update(db, id, updates):
+    return NotificationDatabase(db).update(id, updates)
+
+
+def measure(engine, Session, ids, ops, update):
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    latencies = []
+    try:
+        for id in random.sample(ids, ops):
+            session = Session()
+            start = time.perf_counter()
+            n = update(session, id, {"read": True})
+            _ = (n.id, n.read, n.title)  # what NotificationParser.to_json reads
+            latencies.append((time.perf_counter() - start) * 1000)
+            session.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    latencies.sort()
+    return {
+        "statements_per_op": statements[0] / ops,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(EngineSettings(database_url=f"sqlite:///{os.path.join(tmp, 'bench.db')}"))
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        session = Session()
+        results = insert_many(session, [
+            NotificationModel(user_id=f"user-{i % 100}", title="Reminder", message="Appointment tomorrow")
+            for i in range(args.rows)
+        ])
+        session.close()
+        ids = [r.id for r in results]
+        ops = min(args.ops, len(ids))
+
+        print(f"{'path':<10}{'stmts/op':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, update in (("legacy", legacy_update), ("fast", fast_update)):
+            r = measure(engine, Session, ids, ops, update)
+            print(f"{name:<10}{r['statements_per_op']:>10.1f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from .base import settings
+from .engine_config import build_async_engine
+from .instrumentation import install_query_instrumentation
+
+async_engine = build_async_engine(settings)
+install_query_instrumentation(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
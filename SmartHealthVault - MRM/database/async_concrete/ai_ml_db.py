@@ -0,0 +1,40 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.returning import async_delete_by_id, async_update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.ai_ml_model import AIResultModel
+
+class AsyncAIMLDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def execute_query(self, query: str, params: Any = None):
+        return (await self.db.execute(text(query), params)).fetchall()
+
+    async def insert(self, model: AIResultModel) -> AIResultModel:
+        self.db.add(model); await self.db.commit(); await self.db.refresh(model); return model
+
+    async def get_by_id(self, id: str) -> Optional[AIResultModel]:
+        return (await self.db.execute(select(AIResultModel).where(AIResultModel.id == id))).scalars().first()
+
+    def _select(self, filters: Dict = None):
+        return select(AIResultModel)
+
+    async def list_all(self, filters: Dict = None) -> List[AIResultModel]:
+        return list((await self.db.execute(self._select(filters))).scalars().all())
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = keyset(self._select(filters), AIResultModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> AsyncIterator[AIResultModel]:
+        q = self._select(filters).execution_options(yield_per=batch_size)
+        async for row in await self.db.stream_scalars(q):
+            yield row
+
+    async def update(self, id: str, updates: Dict) -> Optional[AIResultModel]:
+        return await async_update_by_id(self.db, AIResultModel, id, updates)
+
+    async def delete(self, id: str) -> bool:
+        return await async_delete_by_id(self.db, AIResultModel, id)
@@ -0,0 +1,41 @@
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.blob_model import BlobModel
+
+class AsyncBlobDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, sha256: str) -> Optional[BlobModel]:
+        return await self.db.get(BlobModel, sha256)
+
+    async def add_ref(self, sha256: str, path: str, size: int, mime_type: Optional[str] = None) -> int:
+        bump = update(BlobModel).where(BlobModel.sha256 == sha256).values(ref_count=BlobModel.ref_count + 1)
+        if (await self.db.execute(bump)).rowcount == 0:
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(BlobModel(sha256=sha256, path=path, size=size, mime_type=mime_type, ref_count=1))
+                return 1
+            except IntegrityError:
+                await self.db.execute(bump)
+        return (await self.db.execute(select(BlobModel.ref_count).where(BlobModel.sha256 == sha256))).scalar_one()
+
+    async def drop_ref(self, sha256: str) -> Optional[str]:
+        await self.db.execute(
+            update(BlobModel).where(BlobModel.sha256 == sha256, BlobModel.ref_count > 0)
+            .values(ref_count=BlobModel.ref_count - 1)
+        )
+        path = (await self.db.execute(
+            select(BlobModel.path).where(BlobModel.sha256 == sha256, BlobModel.ref_count <= 0)
+        )).scalar_one_or_none()
+        if path is not None:
+            await self.db.execute(delete(BlobModel).where(BlobModel.sha256 == sha256, BlobModel.ref_count <= 0))
+        return path
+
+    async def commit(self):
+        await self.db.commit()
+
+    async def rollback(self):
+        await self.db.rollback()
@@ -0,0 +1,42 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.returning import async_delete_by_id, async_update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.notification_model import NotificationModel
+
+class AsyncNotificationDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def execute_query(self, query: str, params: Any = None):
+        return (await self.db.execute(text(query), params)).fetchall()
+
+    async def insert(self, model: NotificationModel) -> NotificationModel:
+        self.db.add(model); await self.db.commit(); await self.db.refresh(model); return model
+
+    async def get_by_id(self, id: str) -> Optional[NotificationModel]:
+        return (await self.db.execute(select(NotificationModel).where(NotificationModel.id == id))).scalars().first()
+
+    def _select(self, filters: Dict = None):
+        q = select(NotificationModel)
+        if filters and "user_id" in filters: q = q.where(NotificationModel.user_id == filters["user_id"])
+        return q
+
+    async def list_all(self, filters: Dict = None) -> List[NotificationModel]:
+        return list((await self.db.execute(self._select(filters))).scalars().all())
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = keyset(self._select(filters), NotificationModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> AsyncIterator[NotificationModel]:
+        q = self._select(filters).execution_options(yield_per=batch_size)
+        async for row in await self.db.stream_scalars(q):
+            yield row
+
+    async def update(self, id: str, updates: Dict) -> Optional[NotificationModel]:
+        return await async_update_by_id(self.db, NotificationModel, id, updates)
+
+    async def delete(self, id: str) -> bool:
+        return await async_delete_by_id(self.db, NotificationModel, id)
@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.pdf_catalog_model import PdfCatalogModel
+
+class AsyncPdfCatalogDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def insert(self, model: PdfCatalogModel) -> PdfCatalogModel:
+        try:
+            self.db.add(model); await self.db.commit(); await self.db.refresh(model); return model
+        except IntegrityError:
+            await self.db.rollback()
+            return await self.get_by_id(model.id) or await self.get_by_sha256(model.sha256)
+
+    async def get_by_id(self, id: str) -> Optional[PdfCatalogModel]:
+        return await self.db.get(PdfCatalogModel, id)
+
+    async def get_by_sha256(self, sha256: str) -> Optional[PdfCatalogModel]:
+        q = select(PdfCatalogModel).where(PdfCatalogModel.sha256 == sha256)
+        return (await self.db.execute(q)).scalars().first()
+
+    def _select(self, filters: Dict = None):
+        q = select(PdfCatalogModel)
+        if filters:
+            if filters.get("filename"): q = q.where(PdfCatalogModel.filename.ilike(f"%{filters['filename']}%"))
+            if filters.get("min_pages") is not None: q = q.where(PdfCatalogModel.page_count >= filters["min_pages"])
+            if filters.get("max_pages") is not None: q = q.where(PdfCatalogModel.page_count <= filters["max_pages"])
+            if filters.get("created_from"): q = q.where(PdfCatalogModel.created_at >= filters["created_from"])
+            if filters.get("created_to"): q = q.where(PdfCatalogModel.created_at < filters["created_to"])
+        return q
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = keyset(self._select(filters), PdfCatalogModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def delete_by_id(self, id: str, commit: bool = True) -> bool:
+        result = await self.db.execute(delete(PdfCatalogModel).where(PdfCatalogModel.id == id))
+        if commit:
+            await self.db.commit()
+        return result.rowcount > 0
+
+    async def delete_by_sha256(self, sha256: str) -> bool:
+        result = await self.db.execute(delete(PdfCatalogModel).where(PdfCatalogModel.sha256 == sha256))
+        await self.db.commit()
+        return result.rowcount > 0
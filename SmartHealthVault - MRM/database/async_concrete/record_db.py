@@ -0,0 +1,52 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from database.returning import async_delete_by_id, async_update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.record_model import RecordModel
+
+class AsyncRecordDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def execute_query(self, query: str, params: Any = None):
+        return (await self.db.execute(text(query), params)).fetchall()
+
+    async def insert(self, model: RecordModel) -> RecordModel:
+        self.db.add(model); await self.db.commit(); await self.db.refresh(model); return model
+
+    async def get_by_id(self, id: str) -> Optional[RecordModel]:
+        return (await self.db.execute(select(RecordModel).where(RecordModel.id == id))).scalars().first()
+
+    def _select(self, filters: Dict = None, summary: bool = False):
+        q = select(RecordModel)
+        if filters:
+            if "user_id" in filters: q = q.where(RecordModel.user_id == filters["user_id"])
+            if filters.get("category"): q = q.where(RecordModel.category == filters["category"])
+            if filters.get("created_from"): q = q.where(RecordModel.created_at >= filters["created_from"])
+            if filters.get("created_to"): q = q.where(RecordModel.created_at < filters["created_to"])
+        if summary:
+            # list views never need the (potentially large) content column;
+            # raiseload turns an accidental access into an error, not a query per row
+            q = q.options(defer(RecordModel.content, raiseload=True))
+        return q
+
+    async def list_all(self, filters: Dict = None) -> List[RecordModel]:
+        return list((await self.db.execute(self._select(filters))).scalars().all())
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                        summary: bool = False) -> Page:
+        q = keyset(self._select(filters, summary), RecordModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> AsyncIterator[RecordModel]:
+        q = self._select(filters).execution_options(yield_per=batch_size)
+        async for row in await self.db.stream_scalars(q):
+            yield row
+
+    async def update(self, id: str, updates: Dict) -> Optional[RecordModel]:
+        return await async_update_by_id(self.db, RecordModel, id, updates)
+
+    async def delete(self, id: str, commit: bool = True) -> bool:
+        return await async_delete_by_id(self.db, RecordModel, id, commit)
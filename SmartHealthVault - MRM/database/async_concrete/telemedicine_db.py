@@ -0,0 +1,44 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.returning import async_delete_by_id, async_update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.telemedicine_model import AppointmentModel
+
+class AsyncTelemedicineDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def execute_query(self, query: str, params: Any = None):
+        return (await self.db.execute(text(query), params)).fetchall()
+
+    async def insert(self, model: AppointmentModel) -> AppointmentModel:
+        self.db.add(model); await self.db.commit(); await self.db.refresh(model); return model
+
+    async def get_by_id(self, id: str) -> Optional[AppointmentModel]:
+        return (await self.db.execute(select(AppointmentModel).where(AppointmentModel.id == id))).scalars().first()
+
+    def _select(self, filters: Dict = None):
+        q = select(AppointmentModel)
+        if filters:
+            if "doctor_id" in filters: q = q.where(AppointmentModel.doctor_id == filters["doctor_id"])
+            if "user_id" in filters: q = q.where(AppointmentModel.user_id == filters["user_id"])
+        return q
+
+    async def list_all(self, filters: Dict = None) -> List[AppointmentModel]:
+        return list((await self.db.execute(self._select(filters))).scalars().all())
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = keyset(self._select(filters), AppointmentModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> AsyncIterator[AppointmentModel]:
+        q = self._select(filters).execution_options(yield_per=batch_size)
+        async for row in await self.db.stream_scalars(q):
+            yield row
+
+    async def update(self, id: str, updates: Dict) -> Optional[AppointmentModel]:
+        return await async_update_by_id(self.db, AppointmentModel, id, updates)
+
+    async def delete(self, id: str) -> bool:
+        return await async_delete_by_id(self.db, AppointmentModel, id)
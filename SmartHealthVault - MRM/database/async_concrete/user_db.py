@@ -0,0 +1,47 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.returning import async_delete_by_id, async_update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.user_model import UserModel
+
+class AsyncUserDatabase:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def execute_query(self, query: str, params: Any = None):
+        return (await self.db.execute(text(query), params)).fetchall()
+
+    async def insert(self, user: UserModel) -> UserModel:
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def get_by_id(self, id: str) -> Optional[UserModel]:
+        return (await self.db.execute(select(UserModel).where(UserModel.id == id))).scalars().first()
+
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        return (await self.db.execute(select(UserModel).where(UserModel.email == email))).scalars().first()
+
+    def _select(self, filters: Dict = None):
+        q = select(UserModel)
+        return q
+
+    async def list_all(self, filters: Dict = None) -> List[UserModel]:
+        return list((await self.db.execute(self._select(filters))).scalars().all())
+
+    async def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = keyset(self._select(filters), UserModel, limit, cursor)
+        return to_page(list((await self.db.execute(q)).scalars().all()), limit)
+
+    async def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> AsyncIterator[UserModel]:
+        q = self._select(filters).execution_options(yield_per=batch_size)
+        async for row in await self.db.stream_scalars(q):
+            yield row
+
+    async def update(self, id: str, updates: Dict) -> Optional[UserModel]:
+        return await async_update_by_id(self.db, UserModel, id, updates)
+
+    async def delete(self, id: str) -> bool:
+        return await async_delete_by_id(self.db, UserModel, id)
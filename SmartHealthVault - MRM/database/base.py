@@ -1,8 +1,11 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from .engine_config import EngineSettings, build_engine
+from .instrumentation import install_query_instrumentation
 
-DATABASE_URL = "sqlite:///./svh.db"
+settings = EngineSettings.from_env()
+DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = build_engine(settings)
+install_query_instrumentation(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -0,0 +1,123 @@
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from sqlalchemy import delete, insert, inspect, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class BulkItemResult(NamedTuple):
+    index: int
+    id: Optional[str]
+    status: str  # created, updated, deleted, not_found, invalid, error
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("created", "updated", "deleted")
+
+
+def chunked(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def as_mapping(item: Any) -> Dict[str, Any]:
+    """
+    Column values of a model instance (or a plain dict), minus unset ones,
+    so column defaults still apply on insert. Primary keys are assigned
+    up front so callers can report the id of every row.
+    """
+    if isinstance(item, dict):
+        mapping = {k: v for k, v in item.items() if v is not None}
+    else:
+        mapper = inspect(type(item))
+        mapping = {}
+        for attr in mapper.column_attrs:
+            value = getattr(item, attr.key)
+            if value is not None:
+                mapping[attr.key] = value
+    mapping.setdefault("id", str(uuid.uuid4()))
+    return mapping
+
+
+def _error(e: Exception) -> str:
+    return str(getattr(e, "orig", None) or e)
+
+
+def insert_many(session: Session, items: Iterable[Any], model_cls=None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+    """
+    Insert ``items`` with one executemany and one commit per chunk.
+
+    A chunk that fails (e.g. on a unique constraint) is rolled back and
+    retried row by row so only the offending rows are reported as errors.
+    """
+    rows = [(i, model_cls or type(item), as_mapping(item)) for i, item in enumerate(items)]
+    results: List[BulkItemResult] = []
+    for chunk in chunked(rows, chunk_size):
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for _, cls, mapping in chunk:
+            groups.setdefault(cls, []).append(mapping)
+        try:
+            for cls, mappings in groups.items():
+                session.execute(insert(cls), mappings)
+            session.commit()
+            results.extend(BulkItemResult(i, m["id"], "created") for i, _, m in chunk)
+        except SQLAlchemyError:
+            session.rollback()
+            for i, cls, mapping in chunk:
+                try:
+                    session.execute(insert(cls), [mapping])
+                    session.commit()
+                    results.append(BulkItemResult(i, mapping["id"], "created"))
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    results.append(BulkItemResult(i, None, "error", _error(e)))
+    return results
+
+
+def _existing_ids(session: Session, model_cls, ids: Sequence[str]) -> set:
+    return set(session.execute(select(model_cls.id).where(model_cls.id.in_(ids))).scalars())
+
+
+def update_many(session: Session, model_cls, updates: Sequence[Dict[str, Any]],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+    """Apply ``updates`` (dicts that include ``id``) as a bulk UPDATE by primary key, one commit per chunk."""
+    results: List[BulkItemResult] = []
+    indexed = list(enumerate(updates))
+    for chunk in chunked(indexed, chunk_size):
+        existing = _existing_ids(session, model_cls, [u.get("id") for _, u in chunk])
+        found = [(i, u) for i, u in chunk if u.get("id") in existing]
+        results.extend(BulkItemResult(i, u.get("id"), "not_found") for i, u in chunk if u.get("id") not in existing)
+        if not found:
+            continue
+        try:
+            session.execute(update(model_cls), [u for _, u in found])
+            session.commit()
+            results.extend(BulkItemResult(i, u["id"], "updated") for i, u in found)
+        except SQLAlchemyError as e:
+            session.rollback()
+            results.extend(BulkItemResult(i, u["id"], "error", _error(e)) for i, u in found)
+    return sorted(results, key=lambda r: r.index)
+
+
+def delete_many(session: Session, model_cls, ids: Sequence[str],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+    """Delete rows by primary key with one DELETE ... IN and one commit per chunk."""
+    results: List[BulkItemResult] = []
+    indexed = list(enumerate(ids))
+    for chunk in chunked(indexed, chunk_size):
+        existing = _existing_ids(session, model_cls, [id for _, id in chunk])
+        try:
+            if existing:
+                session.execute(delete(model_cls).where(model_cls.id.in_(existing)))
+                session.commit()
+            results.extend(
+                BulkItemResult(i, id, "deleted" if id in existing else "not_found") for i, id in chunk
+            )
+        except SQLAlchemyError as e:
+            session.rollback()
+            results.extend(BulkItemResult(i, id, "error", _error(e)) for i, id in chunk)
+    return results
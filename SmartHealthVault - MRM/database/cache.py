@@ -0,0 +1,389 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, inspect
+
+from .engine_config import _env_int
+from .enums import DBType
+
+
+class CacheBackend(ABC):
+    """Byte-oriented key/value store with per-entry TTL."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def size(self) -> Tuple[int, int]:
+        """(entries, bytes) currently held."""
+        return 0, 0
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU bounded by entry count and total bytes. Fastest option,
+    but each uvicorn worker keeps its own copy, so only use it with a single
+    worker or when a few seconds of cross-worker staleness (the TTL) is fine.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        cost = len(key) + len(value)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._bytes += cost
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def size(self) -> Tuple[int, int]:
+        return len(self._data), self._bytes
+
+    def _pop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(key) + len(entry[0])
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker on the host through one WAL-mode SQLite
+    file. An invalidation by any worker is seen by all of them, at the cost
+    of a local file read per lookup (still far cheaper than the ORM query).
+    Bounds are enforced by trimming least-recently-used rows every
+    ``trim_every`` writes.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, trim_every: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.trim_every = trim_every
+        self.evictions = 0
+        self._writes = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        # recency only needs to be approximate; skip the write when it is fresh
+        self._conn().execute(
+            "UPDATE cache SET accessed_at = ? WHERE key = ? AND accessed_at < ?", (now, key, now - 1)
+        )
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if len(key) + len(value) > self.max_bytes:
+            return
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now + ttl, now),
+        )
+        self._writes += 1
+        if self._writes % self.trim_every == 0:
+            self.trim()
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache")
+
+    def size(self) -> Tuple[int, int]:
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM cache"
+        ).fetchone()
+        return entries, size
+
+    def trim(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        entries, size = self.size()
+        excess = max(entries - self.max_entries, 0)
+        if size > self.max_bytes and entries:
+            # drop roughly enough of the oldest rows to get back under budget
+            excess = max(excess, int(entries * (size - self.max_bytes) / size) + 1)
+        if excess:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def dump_model(obj: Any) -> bytes:
+    """Serialize the column values of a model instance (not its relationships)."""
+    mapper = inspect(type(obj))
+    values = {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+    return json.dumps([mapper.class_.__tablename__, values], default=_encode, separators=(",", ":")).encode("utf-8")
+
+
+def load_model(data: bytes) -> Any:
+    """Rebuild a detached model instance from ``dump_model`` output."""
+    from .base import Base
+    table, values = json.loads(data)
+    cls = next(m.class_ for m in Base.registry.mappers if m.class_.__tablename__ == table)
+    for attr in inspect(cls).column_attrs:
+        value = values.get(attr.key)
+        if isinstance(value, str) and isinstance(attr.columns[0].type, DateTime):
+            values[attr.key] = datetime.fromisoformat(value)
+        elif isinstance(value, str) and isinstance(attr.columns[0].type, Date):
+            values[attr.key] = date.fromisoformat(value)
+    return cls(**values)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
+
+
+DEFAULT_CACHED_TYPES = frozenset({DBType.USER_DB, DBType.DOCTOR_DB, DBType.INSURANCE_DB})
+
+
+@dataclass
+class CacheSettings:
+    backend: str = "none"  # none | memory | sqlite
+    ttl: int = 300
+    max_entries: int = 10_000
+    max_bytes: int = 32 * 1024 * 1024
+    path: str = "./cache/entity_cache.db"
+    db_types: FrozenSet[DBType] = field(default_factory=lambda: DEFAULT_CACHED_TYPES)
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        types = os.getenv("ENTITY_CACHE_TYPES")
+        return cls(
+            backend=os.getenv("ENTITY_CACHE_BACKEND", cls.backend).strip().lower(),
+            ttl=_env_int("ENTITY_CACHE_TTL", cls.ttl),
+            max_entries=_env_int("ENTITY_CACHE_MAX_ENTRIES", cls.max_entries),
+            max_bytes=_env_int("ENTITY_CACHE_MAX_BYTES", cls.max_bytes),
+            path=os.getenv("ENTITY_CACHE_PATH", cls.path),
+            db_types=(
+                frozenset(DBType(t.strip().upper()) for t in types.split(",") if t.strip())
+                if types is not None else DEFAULT_CACHED_TYPES
+            ),
+        )
+
+    def build_backend(self) -> Optional[CacheBackend]:
+        if self.backend in ("", "none", "off"):
+            return None
+        if self.backend == "memory":
+            return MemoryCacheBackend(self.max_entries, self.max_bytes)
+        if self.backend == "sqlite":
+            return SQLiteCacheBackend(self.path, self.max_entries, self.max_bytes)
+        raise ValueError(f"Unknown ENTITY_CACHE_BACKEND: {self.backend}")
+
+
+class EntityCache:
+    """
+    Read-through cache of ``get_by_id`` results keyed by (DBType, id).
+
+    Entries hold column values only, so cached reads return detached
+    instances: fine for the managers, which only serialize them.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, db_types: Iterable[DBType]):
+        self.backend = backend
+        self.ttl = ttl
+        self.db_types = frozenset(db_types)
+        self._stats: Dict[DBType, CacheStats] = {t: CacheStats() for t in self.db_types}
+
+    @staticmethod
+    def key(db_type: DBType, id: str) -> str:
+        return f"{db_type.value}:{id}"
+
+    def get(self, db_type: DBType, id: str) -> Optional[Any]:
+        data = self.backend.get(self.key(db_type, id))
+        stats = self._stats[db_type]
+        if data is None:
+            stats.misses += 1
+            return None
+        stats.hits += 1
+        return load_model(data)
+
+    def put(self, db_type: DBType, id: str, obj: Any) -> None:
+        self.backend.set(self.key(db_type, id), dump_model(obj), self.ttl)
+
+    def invalidate(self, db_type: DBType, *ids: str) -> None:
+        for id in ids:
+            self.backend.delete(self.key(db_type, id))
+        self._stats[db_type].invalidations += len(ids)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.backend.size()
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": entries,
+            "bytes": size,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "by_type": {t.value: s.as_dict() for t, s in self._stats.items()},
+        }
+
+
+class CachedDatabase:
+    """
+    Wraps a concrete database: ``get_by_id`` reads through the cache and
+    every write path that can change an existing row invalidates it.
+    Everything else is passed straight to the wrapped object.
+    """
+
+    def __init__(self, db, db_type: DBType, cache: EntityCache):
+        self._db = db
+        self._db_type = db_type
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def get_by_id(self, id: str):
+        obj = self._cache.get(self._db_type, id)
+        if obj is None:
+            obj = self._db.get_by_id(id)
+            if obj is not None:
+                self._cache.put(self._db_type, id, obj)
+        return obj
+
+    def update(self, id: str, updates: Dict):
+        try:
+            return self._db.update(id, updates)
+        finally:
+            self._cache.invalidate(self._db_type, id)
+
+    def delete(self, id: str, *args, **kwargs) -> bool:
+        try:
+            return self._db.delete(id, *args, **kwargs)
+        finally:
+            self._cache.invalidate(self._db_type, id)
+
+    def update_many(self, updates, *args, **kwargs):
+        try:
+            return self._db.update_many(updates, *args, **kwargs)
+        finally:
+            self._cache.invalidate(self._db_type, *[u.get("id") for u in updates if u.get("id")])
+
+    def delete_many(self, ids, *args, **kwargs):
+        try:
+            return self._db.delete_many(ids, *args, **kwargs)
+        finally:
+            self._cache.invalidate(self._db_type, *ids)
+
+
+class AsyncCachedDatabase(CachedDatabase):
+    """``CachedDatabase`` for the ``Async*Database`` classes."""
+
+    async def get_by_id(self, id: str):
+        obj = self._cache.get(self._db_type, id)
+        if obj is None:
+            obj = await self._db.get_by_id(id)
+            if obj is not None:
+                self._cache.put(self._db_type, id, obj)
+        return obj
+
+    async def update(self, id: str, updates: Dict):
+        try:
+            return await self._db.update(id, updates)
+        finally:
+            self._cache.invalidate(self._db_type, id)
+
+    async def delete(self, id: str, *args, **kwargs) -> bool:
+        try:
+            return await self._db.delete(id, *args, **kwargs)
+        finally:
+            self._cache.invalidate(self._db_type, id)
+
+
+def build_entity_cache(settings: CacheSettings) -> Optional[EntityCache]:
+    backend = settings.build_backend()
+    return EntityCache(backend, settings.ttl, settings.db_types) if backend else None
+
+
+entity_cache = build_entity_cache(CacheSettings.from_env())
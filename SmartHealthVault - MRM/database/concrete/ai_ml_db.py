@@ -1,5 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.ai_ml_model import AIResultModel
 
 class AIMLDatabase:
@@ -15,16 +19,29 @@ class AIMLDatabase:
     def get_by_id(self, id: str) -> Optional[AIResultModel]:
         return self.db.query(AIResultModel).filter(AIResultModel.id == id).first()
 
+    def _query(self, filters: Dict = None):
+        return self.db.query(AIResultModel)
+
     def list_all(self, filters: Dict = None) -> List[AIResultModel]:
-        return self.db.query(AIResultModel).all()
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), AIResultModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[AIResultModel]:
+        yield from self._query(filters).yield_per(batch_size)
 
     def update(self, id: str, updates: Dict) -> Optional[AIResultModel]:
-        m = self.get_by_id(id)
-        if not m: return None
-        for k, v in updates.items(): setattr(m, k, v)
-        self.db.commit(); self.db.refresh(m); return m
+        return update_by_id(self.db, AIResultModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        m = self.get_by_id(id)
-        if not m: return False
-        self.db.delete(m); self.db.commit(); return True
+        return delete_by_id(self.db, AIResultModel, id)
+
+    def insert_many(self, models: List[AIResultModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, AIResultModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, AIResultModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, AIResultModel, ids, chunk_size)
@@ -0,0 +1,51 @@
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models.blob_model import BlobModel
+
+class BlobDatabase:
+    """
+    Reference counts for content-addressed blobs. ``add_ref``/``drop_ref``
+    leave the transaction open so the caller can move or unlink the file
+    before committing; the row lock held until then keeps a concurrent
+    upload and delete of the same content from interleaving.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, sha256: str) -> Optional[BlobModel]:
+        return self.db.get(BlobModel, sha256)
+
+    def add_ref(self, sha256: str, path: str, size: int, mime_type: Optional[str] = None) -> int:
+        """Increment the blob's ref count, creating the row on first use; returns the new count"""
+        bump = update(BlobModel).where(BlobModel.sha256 == sha256).values(ref_count=BlobModel.ref_count + 1)
+        if self.db.execute(bump).rowcount == 0:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(BlobModel(sha256=sha256, path=path, size=size, mime_type=mime_type, ref_count=1))
+                return 1
+            except IntegrityError:
+                # another writer created it first
+                self.db.execute(bump)
+        return self.db.execute(select(BlobModel.ref_count).where(BlobModel.sha256 == sha256)).scalar_one()
+
+    def drop_ref(self, sha256: str) -> Optional[str]:
+        """Decrement the ref count; returns the blob path when that was the last reference"""
+        self.db.execute(
+            update(BlobModel).where(BlobModel.sha256 == sha256, BlobModel.ref_count > 0)
+            .values(ref_count=BlobModel.ref_count - 1)
+        )
+        path = self.db.execute(
+            select(BlobModel.path).where(BlobModel.sha256 == sha256, BlobModel.ref_count <= 0)
+        ).scalar_one_or_none()
+        if path is not None:
+            self.db.execute(delete(BlobModel).where(BlobModel.sha256 == sha256, BlobModel.ref_count <= 0))
+        return path
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
@@ -1,5 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.doctor_model import DoctorModel
 
 class DoctorDatabase:
@@ -15,19 +19,32 @@ class DoctorDatabase:
     def get_by_id(self, id: str) -> Optional[DoctorModel]:
         return self.db.query(DoctorModel).filter(DoctorModel.id == id).first()
 
-    def list_all(self, filters: Dict = None) -> List[DoctorModel]:
+    def _query(self, filters: Dict = None):
         q = self.db.query(DoctorModel)
         if filters and "specialization" in filters:
             q = q.filter(DoctorModel.specialization == filters["specialization"])
-        return q.all()
+        return q
+
+    def list_all(self, filters: Dict = None) -> List[DoctorModel]:
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), DoctorModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[DoctorModel]:
+        yield from self._query(filters).yield_per(batch_size)
 
     def update(self, id: str, updates: Dict) -> Optional[DoctorModel]:
-        d = self.get_by_id(id)
-        if not d: return None
-        for k, v in updates.items(): setattr(d, k, v)
-        self.db.commit(); self.db.refresh(d); return d
+        return update_by_id(self.db, DoctorModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        d = self.get_by_id(id)
-        if not d: return False
-        self.db.delete(d); self.db.commit(); return True
+        return delete_by_id(self.db, DoctorModel, id)
+
+    def insert_many(self, models: List[DoctorModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, DoctorModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, DoctorModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, DoctorModel, ids, chunk_size)
@@ -1,5 +1,9 @@
 from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.insurance_model import PolicyModel, ClaimModel
 
 class InsuranceDatabase:
@@ -17,18 +21,32 @@ class InsuranceDatabase:
         if p: return p
         return self.db.query(ClaimModel).filter(ClaimModel.id == id).first()
 
-    def list_all(self, filters: Dict = None):
+    def _query(self, filters: Dict = None):
+        q = self.db.query(PolicyModel)
         if filters and "patient_id" in filters:
-            return self.db.query(PolicyModel).filter(PolicyModel.patient_id == filters["patient_id"]).all()
-        return self.db.query(PolicyModel).all()
+            q = q.filter(PolicyModel.patient_id == filters["patient_id"])
+        return q
+
+    def list_all(self, filters: Dict = None):
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), PolicyModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000):
+        yield from self._query(filters).yield_per(batch_size)
 
     def update(self, id: str, updates: Dict):
-        p = self.db.query(PolicyModel).filter(PolicyModel.id == id).first()
-        if not p: return None
-        for k, v in updates.items(): setattr(p, k, v)
-        self.db.commit(); self.db.refresh(p); return p
+        return update_by_id(self.db, PolicyModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        p = self.db.query(PolicyModel).filter(PolicyModel.id == id).first()
-        if not p: return False
-        self.db.delete(p); self.db.commit(); return True
+        return delete_by_id(self.db, PolicyModel, id)
+
+    def insert_many(self, models: List, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, None, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, PolicyModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, PolicyModel, ids, chunk_size)
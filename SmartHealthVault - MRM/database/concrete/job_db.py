@@ -0,0 +1,147 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from database.enums import JobStatus
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.job_model import JobModel
+
+class JobDatabase:
+    """
+    Job rows change state only through conditional UPDATEs (on status and,
+    while running, on the owning worker), so concurrent workers, a cancel
+    request and stale-job recovery never overwrite each other's outcome.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert(self, model: JobModel) -> JobModel:
+        self.db.add(model); self.db.commit(); self.db.refresh(model); return model
+
+    def get_by_id(self, id: str) -> Optional[JobModel]:
+        return self.db.get(JobModel, id)
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        q = self.db.query(JobModel)
+        if filters:
+            if filters.get("kind"): q = q.filter(JobModel.kind == filters["kind"])
+            if filters.get("status"): q = q.filter(JobModel.status == filters["status"])
+            if filters.get("user_id"): q = q.filter(JobModel.user_id == filters["user_id"])
+        return to_page(keyset(q, JobModel, limit, cursor).all(), limit)
+
+    def claim_next(self, kinds: Iterable[str], worker: str) -> Optional[JobModel]:
+        """Atomically move the oldest queued job of one of ``kinds`` to running, owned by ``worker``"""
+        kinds = list(kinds)
+        while kinds:
+            job_id = self.db.execute(
+                select(JobModel.id)
+                .where(JobModel.status == JobStatus.QUEUED.value, JobModel.kind.in_(kinds))
+                .order_by(JobModel.created_at, JobModel.id)
+                .limit(1)
+            ).scalar()
+            if job_id is None:
+                return None
+            now = datetime.utcnow()
+            claimed = self.db.execute(
+                update(JobModel)
+                .where(JobModel.id == job_id, JobModel.status == JobStatus.QUEUED.value)
+                .values(status=JobStatus.RUNNING.value, worker=worker, started_at=now, heartbeat_at=now,
+                        attempts=JobModel.attempts + 1)
+            ).rowcount
+            self.db.commit()
+            if claimed:
+                return self.get_by_id(job_id)
+            # another worker took it first; try the next one
+        return None
+
+    def _owned(self, id: str, worker: str):
+        return update(JobModel).where(
+            JobModel.id == id, JobModel.status == JobStatus.RUNNING.value, JobModel.worker == worker
+        )
+
+    def update_progress(self, id: str, worker: str, progress: Optional[float], message: Optional[str]) -> bool:
+        """Record progress; False if the job is no longer this worker's (cancelled, requeued)"""
+        values = {"heartbeat_at": datetime.utcnow()}
+        if progress is not None: values["progress"] = progress
+        if message is not None: values["message"] = message
+        updated = self.db.execute(self._owned(id, worker).values(**values)).rowcount
+        self.db.commit()
+        return updated > 0
+
+    def cancel_requested(self, id: str) -> bool:
+        return bool(self.db.execute(select(JobModel.cancel_requested).where(JobModel.id == id)).scalar())
+
+    def heartbeat(self, ids: List[str], worker: str) -> None:
+        if not ids:
+            return
+        self.db.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(ids), JobModel.status == JobStatus.RUNNING.value, JobModel.worker == worker)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+
+    def finish(self, id: str, worker: str, status: JobStatus, result: Optional[str] = None,
+               error: Optional[str] = None) -> bool:
+        values = {"status": status.value, "result": result, "error": error, "finished_at": datetime.utcnow()}
+        if status == JobStatus.SUCCEEDED:
+            values["progress"] = 1.0
+        updated = self.db.execute(self._owned(id, worker).values(**values)).rowcount
+        self.db.commit()
+        return updated > 0
+
+    def request_cancel(self, id: str) -> Optional[JobModel]:
+        """Cancel a queued job outright; flag a running one for its handler to stop"""
+        now = datetime.utcnow()
+        self.db.execute(
+            update(JobModel).where(JobModel.id == id, JobModel.status == JobStatus.QUEUED.value)
+            .values(status=JobStatus.CANCELLED.value, cancel_requested=True, finished_at=now)
+        )
+        self.db.execute(
+            update(JobModel).where(JobModel.id == id, JobModel.status == JobStatus.RUNNING.value)
+            .values(cancel_requested=True)
+        )
+        self.db.commit()
+        job = self.get_by_id(id)
+        if job is not None:
+            self.db.refresh(job)
+        return job
+
+    def recover_stale(self, stale_before: datetime, max_attempts: int) -> Tuple[int, int]:
+        """
+        Requeue running jobs whose worker stopped heartbeating (crash,
+        restart), or fail them once they have used up ``max_attempts``;
+        ones already asked to cancel end as cancelled. Returns (requeued, failed).
+        """
+        stale = (JobModel.status == JobStatus.RUNNING.value) & (JobModel.heartbeat_at < stale_before)
+        now = datetime.utcnow()
+        self.db.execute(
+            update(JobModel).where(stale, JobModel.cancel_requested.is_(True))
+            .values(status=JobStatus.CANCELLED.value, worker=None, finished_at=now)
+        )
+        failed = self.db.execute(
+            update(JobModel).where(stale, JobModel.attempts >= max_attempts)
+            .values(status=JobStatus.FAILED.value, worker=None, finished_at=now,
+                    error="Worker stopped while running the job")
+        ).rowcount
+        requeued = self.db.execute(update(JobModel).where(stale).values(**self._requeued())).rowcount
+        self.db.commit()
+        return requeued, failed
+
+    def release(self, worker: str) -> int:
+        """Requeue the running jobs of a worker that is shutting down"""
+        released = self.db.execute(
+            update(JobModel)
+            .where(JobModel.status == JobStatus.RUNNING.value, JobModel.worker == worker)
+            .values(**self._requeued())
+        ).rowcount
+        self.db.commit()
+        return released
+
+    @staticmethod
+    def _requeued() -> Dict:
+        return {
+            "status": JobStatus.QUEUED.value, "worker": None, "started_at": None, "heartbeat_at": None,
+            "progress": 0.0, "message": "Requeued after the worker stopped",
+        }
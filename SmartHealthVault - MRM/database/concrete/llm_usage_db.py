@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database.bulk import BulkItemResult, insert_many
+from models.llm_usage_model import LLMUsageModel
+
+class LLMUsageDatabase:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert_many(self, rows: Sequence[Dict[str, Any]]) -> List[BulkItemResult]:
+        return insert_many(self.db, rows, LLMUsageModel)
+
+    def daily_totals(self, user_id: Optional[str] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> List[Any]:
+        """Calls, tokens and cost per (user_id, day), newest day first"""
+        day = func.date(LLMUsageModel.created_at)
+        q = self.db.query(
+            LLMUsageModel.user_id,
+            day.label("day"),
+            func.count().label("calls"),
+            func.sum(LLMUsageModel.prompt_tokens).label("prompt_tokens"),
+            func.sum(LLMUsageModel.completion_tokens).label("completion_tokens"),
+            func.sum(LLMUsageModel.total_tokens).label("total_tokens"),
+            func.sum(LLMUsageModel.cost_usd).label("cost_usd"),
+        )
+        if user_id is not None: q = q.filter(LLMUsageModel.user_id == user_id)
+        if start is not None: q = q.filter(LLMUsageModel.created_at >= start)
+        if end is not None: q = q.filter(LLMUsageModel.created_at < end)
+        return q.group_by(LLMUsageModel.user_id, day).order_by(day.desc(), LLMUsageModel.user_id).all()
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from models.model_registry_model import ModelVersionModel
+
+class ModelRegistryDatabase:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert(self, model: ModelVersionModel) -> ModelVersionModel:
+        self.db.add(model); self.db.commit(); self.db.refresh(model); return model
+
+    def get_by_id(self, id: str) -> Optional[ModelVersionModel]:
+        return self.db.get(ModelVersionModel, id)
+
+    def get_version(self, name: str, version: str) -> Optional[ModelVersionModel]:
+        return self.db.query(ModelVersionModel).filter(
+            ModelVersionModel.name == name, ModelVersionModel.version == version
+        ).first()
+
+    def get_active(self, name: str) -> Optional[ModelVersionModel]:
+        return self.db.query(ModelVersionModel).filter(
+            ModelVersionModel.name == name, ModelVersionModel.active.is_(True)
+        ).first()
+
+    def list_versions(self, name: str) -> List[ModelVersionModel]:
+        return (self.db.query(ModelVersionModel).filter(ModelVersionModel.name == name)
+                .order_by(ModelVersionModel.created_at.desc(), ModelVersionModel.version.desc()).all())
+
+    def list_active(self) -> List[ModelVersionModel]:
+        return self.db.query(ModelVersionModel).filter(ModelVersionModel.active.is_(True)).all()
+
+    def version_counts(self) -> List[Tuple[str, int]]:
+        """(name, number of versions) per registered model"""
+        return (self.db.query(ModelVersionModel.name, func.count(ModelVersionModel.id))
+                .group_by(ModelVersionModel.name).order_by(ModelVersionModel.name).all())
+
+    def activate(self, name: str, version: str) -> Optional[ModelVersionModel]:
+        """Make ``version`` the active one of ``name`` in one transaction; None if it does not exist"""
+        if self.get_version(name, version) is None:
+            return None
+        self.db.execute(
+            update(ModelVersionModel)
+            .where(ModelVersionModel.name == name, ModelVersionModel.active.is_(True), ModelVersionModel.version != version)
+            .values(active=False)
+        )
+        self.db.execute(
+            update(ModelVersionModel)
+            .where(ModelVersionModel.name == name, ModelVersionModel.version == version, ModelVersionModel.active.is_(False))
+            .values(active=True, activated_at=datetime.utcnow())
+        )
+        self.db.commit()
+        model = self.get_version(name, version)
+        self.db.refresh(model)
+        return model
@@ -1,5 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.notification_model import NotificationModel
 
 class NotificationDatabase:
@@ -15,18 +19,31 @@ class NotificationDatabase:
     def get_by_id(self, id: str) -> Optional[NotificationModel]:
         return self.db.query(NotificationModel).filter(NotificationModel.id == id).first()
 
-    def list_all(self, filters: Dict = None) -> List[NotificationModel]:
+    def _query(self, filters: Dict = None):
         q = self.db.query(NotificationModel)
         if filters and "user_id" in filters: q = q.filter(NotificationModel.user_id == filters["user_id"])
-        return q.all()
+        return q
+
+    def list_all(self, filters: Dict = None) -> List[NotificationModel]:
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), NotificationModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[NotificationModel]:
+        yield from self._query(filters).yield_per(batch_size)
 
     def update(self, id: str, updates: Dict) -> Optional[NotificationModel]:
-        n = self.get_by_id(id)
-        if not n: return None
-        for k, v in updates.items(): setattr(n, k, v)
-        self.db.commit(); self.db.refresh(n); return n
+        return update_by_id(self.db, NotificationModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        n = self.get_by_id(id)
-        if not n: return False
-        self.db.delete(n); self.db.commit(); return True
+        return delete_by_id(self.db, NotificationModel, id)
+
+    def insert_many(self, models: List[NotificationModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, NotificationModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, NotificationModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, NotificationModel, ids, chunk_size)
@@ -0,0 +1,51 @@
+from typing import Dict, Optional
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
+from models.pdf_catalog_model import PdfCatalogModel
+
+class PdfCatalogDatabase:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert(self, model: PdfCatalogModel) -> PdfCatalogModel:
+        """Insert, or return the existing entry when this id or content is already catalogued"""
+        try:
+            self.db.add(model); self.db.commit(); self.db.refresh(model); return model
+        except IntegrityError:
+            self.db.rollback()
+            return self.get_by_id(model.id) or self.get_by_sha256(model.sha256)
+
+    def get_by_id(self, id: str) -> Optional[PdfCatalogModel]:
+        return self.db.get(PdfCatalogModel, id)
+
+    def get_by_sha256(self, sha256: str) -> Optional[PdfCatalogModel]:
+        return self.db.query(PdfCatalogModel).filter(PdfCatalogModel.sha256 == sha256).first()
+
+    def count(self) -> int:
+        return self.db.query(PdfCatalogModel).count()
+
+    def _query(self, filters: Dict = None):
+        q = self.db.query(PdfCatalogModel)
+        if filters:
+            if filters.get("filename"): q = q.filter(PdfCatalogModel.filename.ilike(f"%{filters['filename']}%"))
+            if filters.get("min_pages") is not None: q = q.filter(PdfCatalogModel.page_count >= filters["min_pages"])
+            if filters.get("max_pages") is not None: q = q.filter(PdfCatalogModel.page_count <= filters["max_pages"])
+            if filters.get("created_from"): q = q.filter(PdfCatalogModel.created_at >= filters["created_from"])
+            if filters.get("created_to"): q = q.filter(PdfCatalogModel.created_at < filters["created_to"])
+        return q
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), PdfCatalogModel, limit, cursor).all(), limit)
+
+    def delete_by_id(self, id: str, commit: bool = True) -> bool:
+        result = self.db.execute(delete(PdfCatalogModel).where(PdfCatalogModel.id == id))
+        if commit:
+            self.db.commit()
+        return result.rowcount > 0
+
+    def delete_by_sha256(self, sha256: str) -> bool:
+        result = self.db.execute(delete(PdfCatalogModel).where(PdfCatalogModel.sha256 == sha256))
+        self.db.commit()
+        return result.rowcount > 0
@@ -1,5 +1,10 @@
-from typing import Any, Dict, List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session, defer
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.record_model import RecordModel
 
 class RecordDatabase:
@@ -15,19 +20,54 @@ class RecordDatabase:
     def get_by_id(self, id: str) -> Optional[RecordModel]:
         return self.db.query(RecordModel).filter(RecordModel.id == id).first()
 
-    def list_all(self, filters: Dict = None) -> List[RecordModel]:
+    def _query(self, filters: Dict = None, summary: bool = False):
         q = self.db.query(RecordModel)
         if filters:
             if "user_id" in filters: q = q.filter(RecordModel.user_id == filters["user_id"])
-        return q.all()
+            if filters.get("category"): q = q.filter(RecordModel.category == filters["category"])
+            if filters.get("created_from"): q = q.filter(RecordModel.created_at >= filters["created_from"])
+            if filters.get("created_to"): q = q.filter(RecordModel.created_at < filters["created_to"])
+        if summary:
+            # list views never need the (potentially large) content column;
+            # raiseload turns an accidental access into an error, not a query per row
+            q = q.options(defer(RecordModel.content, raiseload=True))
+        return q
+
+    def list_all(self, filters: Dict = None) -> List[RecordModel]:
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                  summary: bool = False) -> Page:
+        return to_page(keyset(self._query(filters, summary), RecordModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[RecordModel]:
+        yield from self._query(filters).yield_per(batch_size)
+
+    def category_totals(self) -> List[Tuple[Optional[str], int]]:
+        """(category, record count) over all records, most common first"""
+        return (self.db.query(RecordModel.category, func.count(RecordModel.id))
+                .group_by(RecordModel.category).order_by(func.count(RecordModel.id).desc()).all())
+
+    def category_counts(self, user_ids: List[str]) -> List[Tuple[str, Optional[str], int]]:
+        """(user_id, category, record count) for the given users"""
+        rows = []
+        for chunk in bulk.chunked(list(user_ids), 900):
+            rows.extend(self.db.query(RecordModel.user_id, RecordModel.category, func.count(RecordModel.id))
+                        .filter(RecordModel.user_id.in_(chunk))
+                        .group_by(RecordModel.user_id, RecordModel.category).all())
+        return rows
 
     def update(self, id: str, updates: Dict) -> Optional[RecordModel]:
-        r = self.get_by_id(id)
-        if not r: return None
-        for k, v in updates.items(): setattr(r, k, v)
-        self.db.commit(); self.db.refresh(r); return r
-
-    def delete(self, id: str) -> bool:
-        r = self.get_by_id(id)
-        if not r: return False
-        self.db.delete(r); self.db.commit(); return True
+        return update_by_id(self.db, RecordModel, id, updates)
+
+    def delete(self, id: str, commit: bool = True) -> bool:
+        return delete_by_id(self.db, RecordModel, id, commit)
+
+    def insert_many(self, models: List[RecordModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, RecordModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, RecordModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, RecordModel, ids, chunk_size)
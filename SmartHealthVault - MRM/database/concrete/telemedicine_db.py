@@ -1,5 +1,9 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.telemedicine_model import AppointmentModel
 
 class TelemedicineDatabase:
@@ -15,20 +19,33 @@ class TelemedicineDatabase:
     def get_by_id(self, id: str) -> Optional[AppointmentModel]:
         return self.db.query(AppointmentModel).filter(AppointmentModel.id == id).first()
 
-    def list_all(self, filters: Dict = None) -> List[AppointmentModel]:
+    def _query(self, filters: Dict = None):
         q = self.db.query(AppointmentModel)
         if filters:
             if "doctor_id" in filters: q = q.filter(AppointmentModel.doctor_id == filters["doctor_id"])
             if "user_id" in filters: q = q.filter(AppointmentModel.user_id == filters["user_id"])
-        return q.all()
+        return q
+
+    def list_all(self, filters: Dict = None) -> List[AppointmentModel]:
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), AppointmentModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[AppointmentModel]:
+        yield from self._query(filters).yield_per(batch_size)
 
     def update(self, id: str, updates: Dict) -> Optional[AppointmentModel]:
-        a = self.get_by_id(id)
-        if not a: return None
-        for k, v in updates.items(): setattr(a, k, v)
-        self.db.commit(); self.db.refresh(a); return a
+        return update_by_id(self.db, AppointmentModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        a = self.get_by_id(id)
-        if not a: return False
-        self.db.delete(a); self.db.commit(); return True
+        return delete_by_id(self.db, AppointmentModel, id)
+
+    def insert_many(self, models: List[AppointmentModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, AppointmentModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, AppointmentModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, AppointmentModel, ids, chunk_size)
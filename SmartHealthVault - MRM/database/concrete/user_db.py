@@ -1,5 +1,10 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from database import bulk
+from database.bulk import DEFAULT_CHUNK_SIZE, BulkItemResult
+from database.returning import delete_by_id, update_by_id
+from database.pagination import DEFAULT_PAGE_SIZE, Page, keyset, to_page
 from models.user_model import UserModel
 
 class UserDatabase:
@@ -21,24 +26,57 @@ class UserDatabase:
     def get_by_email(self, email: str) -> Optional[UserModel]:
         return self.db.query(UserModel).filter(UserModel.email == email).first()
 
-    def list_all(self, filters: Dict = None) -> List[UserModel]:
+    def existing_emails(self, emails: List[str]) -> set:
+        found = set()
+        for chunk in bulk.chunked(list(set(emails)), 900):
+            found.update(e for (e,) in self.db.query(UserModel.email).filter(UserModel.email.in_(chunk)))
+        return found
+
+    def _query(self, filters: Dict = None):
         q = self.db.query(UserModel)
-        return q.all()
+        return q
+
+    def list_all(self, filters: Dict = None) -> List[UserModel]:
+        return self._query(filters).all()
+
+    def list_page(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        return to_page(keyset(self._query(filters), UserModel, limit, cursor).all(), limit)
+
+    def iter_all(self, filters: Dict = None, batch_size: int = 1000) -> Iterator[UserModel]:
+        yield from self._query(filters).yield_per(batch_size)
+
+    def iter_profiles(self, batch_size: int = 5000) -> Iterator[List[Tuple]]:
+        """(id, age, gender, blood_group) of every user in id order, one keyset batch at a time"""
+        last_id = None
+        while True:
+            q = self.db.query(UserModel.id, UserModel.age, UserModel.gender, UserModel.blood_group)
+            if last_id is not None:
+                q = q.filter(UserModel.id > last_id)
+            rows = q.order_by(UserModel.id).limit(batch_size).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def count(self) -> int:
+        return self.db.query(func.count(UserModel.id)).scalar()
+
+    def age_moments(self) -> Tuple[Optional[float], Optional[float]]:
+        """Mean age and mean squared age over users with a known age"""
+        mean, mean_sq = self.db.query(func.avg(UserModel.age), func.avg(UserModel.age * UserModel.age)).one()
+        return mean, mean_sq
 
     def update(self, id: str, updates: Dict) -> Optional[UserModel]:
-        u = self.get_by_id(id)
-        if not u:
-            return None
-        for k, v in updates.items():
-            setattr(u, k, v)
-        self.db.commit()
-        self.db.refresh(u)
-        return u
+        return update_by_id(self.db, UserModel, id, updates)
 
     def delete(self, id: str) -> bool:
-        u = self.get_by_id(id)
-        if not u:
-            return False
-        self.db.delete(u)
-        self.db.commit()
-        return True
+        return delete_by_id(self.db, UserModel, id)
+
+    def insert_many(self, models: List[UserModel], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.insert_many(self.db, models, UserModel, chunk_size)
+
+    def update_many(self, updates: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.update_many(self.db, UserModel, updates, chunk_size)
+
+    def delete_many(self, ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[BulkItemResult]:
+        return bulk.delete_many(self.db, UserModel, ids, chunk_size)
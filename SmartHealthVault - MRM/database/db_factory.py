@@ -6,6 +6,20 @@ from .concrete.insurance_db import InsuranceDatabase
 from .concrete.notification_db import NotificationDatabase
 from .concrete.telemedicine_db import TelemedicineDatabase
 from .concrete.ai_ml_db import AIMLDatabase
+from .concrete.blob_db import BlobDatabase
+from .concrete.pdf_catalog_db import PdfCatalogDatabase
+from .concrete.llm_usage_db import LLMUsageDatabase
+from .concrete.job_db import JobDatabase
+from .concrete.model_registry_db import ModelRegistryDatabase
+from .async_concrete.user_db import AsyncUserDatabase
+from .async_concrete.doctor_db import AsyncDoctorDatabase
+from .async_concrete.record_db import AsyncRecordDatabase
+from .async_concrete.insurance_db import AsyncInsuranceDatabase
+from .async_concrete.notification_db import AsyncNotificationDatabase
+from .async_concrete.telemedicine_db import AsyncTelemedicineDatabase
+from .async_concrete.ai_ml_db import AsyncAIMLDatabase
+from .async_concrete.blob_db import AsyncBlobDatabase
+from .async_concrete.pdf_catalog_db import AsyncPdfCatalogDatabase
 
 def create_database(db_type: DBType, db_session):
     if db_type == DBType.USER_DB:
@@ -22,4 +36,36 @@ def create_database(db_type: DBType, db_session):
         return TelemedicineDatabase(db_session)
     if db_type == DBType.AI_ML_DB:
         return AIMLDatabase(db_session)
+    if db_type == DBType.BLOB_DB:
+        return BlobDatabase(db_session)
+    if db_type == DBType.PDF_CATALOG_DB:
+        return PdfCatalogDatabase(db_session)
+    if db_type == DBType.LLM_USAGE_DB:
+        return LLMUsageDatabase(db_session)
+    if db_type == DBType.JOB_DB:
+        return JobDatabase(db_session)
+    if db_type == DBType.MODEL_REGISTRY_DB:
+        return ModelRegistryDatabase(db_session)
+    raise ValueError(f"Unknown DBType: {db_type}")
+
+
+def create_async_database(db_type: DBType, db_session):
+    if db_type == DBType.USER_DB:
+        return AsyncUserDatabase(db_session)
+    if db_type == DBType.DOCTOR_DB:
+        return AsyncDoctorDatabase(db_session)
+    if db_type == DBType.RECORD_DB:
+        return AsyncRecordDatabase(db_session)
+    if db_type == DBType.INSURANCE_DB:
+        return AsyncInsuranceDatabase(db_session)
+    if db_type == DBType.NOTIFICATION_DB:
+        return AsyncNotificationDatabase(db_session)
+    if db_type == DBType.TELEMEDICINE_DB:
+        return AsyncTelemedicineDatabase(db_session)
+    if db_type == DBType.AI_ML_DB:
+        return AsyncAIMLDatabase(db_session)
+    if db_type == DBType.BLOB_DB:
+        return AsyncBlobDatabase(db_session)
+    if db_type == DBType.PDF_CATALOG_DB:
+        return AsyncPdfCatalogDatabase(db_session)
     raise ValueError(f"Unknown DBType: {db_type}")
@@ -1,7 +1,9 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from .base import SessionLocal
-from .db_factory import create_database
+from .async_base import AsyncSessionLocal
+from .db_factory import create_database, create_async_database
 from .enums import DBType
+from .cache import AsyncCachedDatabase, CachedDatabase, entity_cache
 
 def get_db_session() -> Generator:
     db = SessionLocal()
@@ -10,9 +12,26 @@ def get_db_session() -> Generator:
     finally:
         db.close()
 
+async def get_async_db_session() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 class DatabaseManager:
     def __init__(self, db_session):
         self.db_session = db_session
 
     def get_database(self, db_type: DBType):
-        return create_database(db_type, self.db_session)
+        db = create_database(db_type, self.db_session)
+        if entity_cache and db_type in entity_cache.db_types:
+            return CachedDatabase(db, db_type, entity_cache)
+        return db
+
+class AsyncDatabaseManager:
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def get_database(self, db_type: DBType):
+        db = create_async_database(db_type, self.db_session)
+        if entity_cache and db_type in entity_cache.db_types:
+            return AsyncCachedDatabase(db, db_type, entity_cache)
+        return db
@@ -0,0 +1,171 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+DEFAULT_DATABASE_URL = "sqlite:///./svh.db"
+
+# Async DBAPI drivers used when deriving ASYNC_DATABASE_URL from DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class SQLitePragmas:
+    """Per-connection PRAGMAs applied to every new SQLite DBAPI connection."""
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 64 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: str = "MEMORY"
+
+    @classmethod
+    def from_env(cls) -> "SQLitePragmas":
+        return cls(
+            journal_mode=os.getenv("SQLITE_JOURNAL_MODE", cls.journal_mode),
+            synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.synchronous),
+            busy_timeout_ms=_env_int("SQLITE_BUSY_TIMEOUT_MS", cls.busy_timeout_ms),
+            cache_size_kib=_env_int("SQLITE_CACHE_SIZE_KIB", cls.cache_size_kib),
+            mmap_size=_env_int("SQLITE_MMAP_SIZE", cls.mmap_size),
+            temp_store=os.getenv("SQLITE_TEMP_STORE", cls.temp_store),
+        )
+
+    def statements(self, in_memory: bool = False):
+        # WAL and mmap are meaningless for in-memory databases
+        if not in_memory:
+            yield f"PRAGMA journal_mode={self.journal_mode}"
+            yield f"PRAGMA mmap_size={int(self.mmap_size)}"
+        yield f"PRAGMA synchronous={self.synchronous}"
+        yield f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}"
+        # A negative cache_size is interpreted by SQLite as KiB rather than pages
+        yield f"PRAGMA cache_size={-abs(int(self.cache_size_kib))}"
+        yield f"PRAGMA temp_store={self.temp_store}"
+
+
+@dataclass
+class EngineSettings:
+    """
+    Engine and pool configuration, read from the environment.
+
+    Pool sizes default differently for SQLite (a single writer, so a small
+    pool of mostly-reader connections) and for server databases.
+    """
+    database_url: str = DEFAULT_DATABASE_URL
+    async_database_url: Optional[str] = None
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    echo: bool = False
+    sqlite_pragmas: SQLitePragmas = field(default_factory=SQLitePragmas)
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        pool_size = os.getenv("DB_POOL_SIZE")
+        max_overflow = os.getenv("DB_MAX_OVERFLOW")
+        return cls(
+            database_url=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL),
+            async_database_url=os.getenv("ASYNC_DATABASE_URL") or None,
+            pool_size=int(pool_size) if pool_size else None,
+            max_overflow=int(max_overflow) if max_overflow else None,
+            pool_timeout=_env_float("DB_POOL_TIMEOUT", 30.0),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+            echo=_env_bool("DB_ECHO", False),
+            sqlite_pragmas=SQLitePragmas.from_env(),
+        )
+
+    @property
+    def is_sqlite(self) -> bool:
+        return make_url(self.database_url).get_backend_name() == "sqlite"
+
+    @property
+    def is_memory(self) -> bool:
+        database = make_url(self.database_url).database
+        return self.is_sqlite and database in (None, "", ":memory:")
+
+    def resolved_async_url(self) -> str:
+        if self.async_database_url:
+            return self.async_database_url
+        url = make_url(self.database_url)
+        driver = ASYNC_DRIVERS.get(url.get_backend_name())
+        if driver is None:
+            raise ValueError(f"No async driver known for {url.get_backend_name()}; set ASYNC_DATABASE_URL")
+        return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"echo": self.echo}
+        if self.is_sqlite:
+            kwargs["connect_args"] = {
+                "check_same_thread": False,
+                "timeout": self.sqlite_pragmas.busy_timeout_ms / 1000.0,
+            }
+            if self.is_memory:
+                # Every connection to :memory: is a separate database
+                kwargs["poolclass"] = StaticPool
+                return kwargs
+            default_size, default_overflow = 8, 8
+        else:
+            default_size, default_overflow = 10, 20
+            kwargs["pool_recycle"] = self.pool_recycle
+        kwargs["pool_size"] = self.pool_size if self.pool_size is not None else default_size
+        kwargs["max_overflow"] = self.max_overflow if self.max_overflow is not None else default_overflow
+        kwargs["pool_timeout"] = self.pool_timeout
+        kwargs["pool_pre_ping"] = self.pool_pre_ping
+        return kwargs
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: SQLitePragmas, in_memory: bool = False) -> None:
+    """Register a connect hook that applies ``pragmas`` to each new DBAPI connection."""
+    statements = list(pragmas.statements(in_memory=in_memory))
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def build_engine(settings: Optional[EngineSettings] = None) -> Engine:
+    settings = settings or EngineSettings.from_env()
+    engine = create_engine(settings.database_url, **settings.engine_kwargs())
+    if settings.is_sqlite:
+        install_sqlite_pragmas(engine, settings.sqlite_pragmas, in_memory=settings.is_memory)
+    return engine
+
+
+def build_async_engine(settings: Optional[EngineSettings] = None) -> AsyncEngine:
+    settings = settings or EngineSettings.from_env()
+    engine = create_async_engine(settings.resolved_async_url(), **settings.engine_kwargs())
+    if settings.is_sqlite:
+        # Connect events are emitted by the underlying sync engine
+        install_sqlite_pragmas(engine.sync_engine, settings.sqlite_pragmas, in_memory=settings.is_memory)
+    return engine
@@ -8,3 +8,15 @@ class DBType(str, Enum):
     NOTIFICATION_DB = "NOTIFICATION_DB"
     TELEMEDICINE_DB = "TELEMEDICINE_DB"
     AI_ML_DB = "AI_ML_DB"
+    BLOB_DB = "BLOB_DB"
+    PDF_CATALOG_DB = "PDF_CATALOG_DB"
+    LLM_USAGE_DB = "LLM_USAGE_DB"
+    JOB_DB = "JOB_DB"
+    MODEL_REGISTRY_DB = "MODEL_REGISTRY_DB"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -0,0 +1,216 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .engine_config import _env_bool, _env_float, _env_int
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+SLOWEST_QUERY_HEADER = "X-DB-Slowest-Ms"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Query shape: literals replaced by ``?``, IN lists collapsed, whitespace squeezed."""
+    s = _STRING.sub("?", statement)
+    s = _NUMBER.sub("?", s)
+    s = _IN_LIST.sub("(?...)", s)
+    return _SPACE.sub(" ", s).strip()
+
+
+@dataclass
+class InstrumentationSettings:
+    enabled: bool = True
+    repeat_threshold: int = 10  # same fingerprint more than N times in one request -> warn
+    slow_query_ms: float = 200.0
+    recent_warnings: int = 100
+
+    @classmethod
+    def from_env(cls) -> "InstrumentationSettings":
+        return cls(
+            enabled=_env_bool("DB_INSTRUMENTATION", cls.enabled),
+            repeat_threshold=_env_int("DB_NPLUSONE_THRESHOLD", cls.repeat_threshold),
+            slow_query_ms=_env_float("DB_SLOW_QUERY_MS", cls.slow_query_ms),
+            recent_warnings=_env_int("DB_METRICS_RECENT_WARNINGS", cls.recent_warnings),
+        )
+
+
+settings = InstrumentationSettings.from_env()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request."""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        return {fp: n for fp, n in self.fingerprints.items() if n > threshold}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    stats.record(statement, elapsed_ms)
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """Time every cursor execute on ``engine`` into the current request's ``QueryStats``."""
+    if not settings.enabled or event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@dataclass
+class RouteMetrics:
+    requests: int = 0
+    statements: int = 0
+    db_ms: float = 0.0
+    max_statements: int = 0
+    max_db_ms: float = 0.0
+    repeated_query_warnings: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "statements": self.statements,
+            "avg_statements": round(self.statements / self.requests, 2) if self.requests else 0,
+            "max_statements": self.max_statements,
+            "db_ms": round(self.db_ms, 3),
+            "avg_db_ms": round(self.db_ms / self.requests, 3) if self.requests else 0,
+            "max_db_ms": round(self.max_db_ms, 3),
+            "repeated_query_warnings": self.repeated_query_warnings,
+        }
+
+
+class QueryMetrics:
+    """Per-route aggregates since process start, served by ``GET /metrics/db``."""
+
+    def __init__(self, recent: int):
+        self._lock = threading.Lock()
+        self.routes: Dict[str, RouteMetrics] = {}
+        self.warnings = deque(maxlen=recent)
+        self.slow_queries = deque(maxlen=recent)
+
+    def observe(self, route: str, stats: QueryStats) -> None:
+        repeated = stats.repeated(settings.repeat_threshold)
+        with self._lock:
+            m = self.routes.setdefault(route, RouteMetrics())
+            m.requests += 1
+            m.statements += stats.count
+            m.db_ms += stats.total_ms
+            m.max_statements = max(m.max_statements, stats.count)
+            m.max_db_ms = max(m.max_db_ms, stats.total_ms)
+            if repeated:
+                m.repeated_query_warnings += 1
+                self.warnings.append({"route": route, "at": time.time(), "repeated": repeated})
+            if stats.slowest_ms >= settings.slow_query_ms:
+                self.slow_queries.append({
+                    "route": route, "at": time.time(),
+                    "ms": round(stats.slowest_ms, 3), "statement": stats.slowest_statement,
+                })
+        if repeated:
+            logger.warning(
+                "%s issued %d statements; repeated query shapes (threshold %d): %s",
+                route, stats.count, settings.repeat_threshold,
+                "; ".join(f"{n}x {fp}" for fp, n in repeated.items()),
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "repeat_threshold": settings.repeat_threshold,
+                "slow_query_ms": settings.slow_query_ms,
+                "routes": {r: m.as_dict() for r, m in sorted(self.routes.items())},
+                "repeated_query_warnings": list(self.warnings),
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+            self.warnings.clear()
+            self.slow_queries.clear()
+
+
+query_metrics = QueryMetrics(settings.recent_warnings)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that opens a ``QueryStats`` per HTTP request, adds the
+    X-DB-* headers to the response and feeds ``query_metrics``.
+
+    Sync endpoints run in a worker thread with a copy of the request
+    context, so they see (and mutate) the same ``QueryStats`` object.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.enabled:
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{stats.total_ms:.3f}".encode()))
+                headers.append((SLOWEST_QUERY_HEADER.lower().encode(), f"{stats.slowest_ms:.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            query_metrics.observe(f"{scope['method']} {path}", stats)
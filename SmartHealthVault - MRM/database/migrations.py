@@ -0,0 +1,35 @@
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from .base import engine as default_engine
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(APP_ROOT, "alembic.ini")
+BASELINE_REVISION = "0001_baseline"
+
+
+def alembic_config() -> Config:
+    cfg = Config(ALEMBIC_INI)
+    cfg.set_main_option("script_location", os.path.join(APP_ROOT, "migrations"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+def upgrade_database(engine: Engine = None, revision: str = "head") -> None:
+    """
+    Bring the schema up to ``revision``.
+
+    Databases created by the old ``Base.metadata.create_all`` startup hook
+    have tables but no ``alembic_version``; those are stamped at the
+    baseline first so only the later migrations run against them.
+    """
+    engine = engine or default_engine
+    cfg = alembic_config()
+    with engine.begin() as connection:
+        cfg.attributes["connection"] = connection
+        inspector = inspect(connection)
+        if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, revision)
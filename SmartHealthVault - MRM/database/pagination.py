@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(created_at) if created_at else None), str(id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset(q, model, limit: int, cursor: Optional[str] = None):
+    """
+    Restrict ``q`` (a legacy ``Query`` or a 2.0 ``Select``) to one page,
+    newest first, ordered on (created_at, id).
+
+    One extra row is fetched so ``to_page`` can tell whether another page
+    follows without a COUNT query.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        q = q.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < id),
+        ))
+    return q.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def to_page(rows: List[Any], limit: int) -> Page:
+    if len(rows) <= limit:
+        return Page(list(rows))
+    items = list(rows[:limit])
+    last = items[-1]
+    return Page(items, encode_cursor(last.created_at, last.id))
+
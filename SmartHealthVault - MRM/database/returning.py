@@ -0,0 +1,93 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, inspect, select, update
+from sqlalchemy.orm import Session
+
+
+def column_updates(model_cls, updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep only keys that are mapped columns. The read-modify-write path
+    silently ignored unknown keys via setattr; a SQL UPDATE would reject them.
+    """
+    columns = {attr.key for attr in inspect(model_cls).column_attrs}
+    return {k: v for k, v in updates.items() if k in columns}
+
+
+def supports_update_returning(session: Session) -> bool:
+    return bool(getattr(session.get_bind().dialect, "update_returning", False))
+
+
+def update_by_id(session: Session, model_cls, id: str, updates: Dict[str, Any]) -> Optional[Any]:
+    """
+    Update one row by primary key and return the updated instance.
+
+    Where the backend supports it this is a single ``UPDATE ... RETURNING``;
+    otherwise an UPDATE followed by a primary-key SELECT. The returned
+    instance is detached before commit so reading it does not trigger the
+    post-commit refresh query.
+    """
+    values = column_updates(model_cls, updates)
+    if not values:
+        return session.execute(select(model_cls).where(model_cls.id == id)).scalars().first()
+    stmt = update(model_cls).where(model_cls.id == id).values(**values)
+    if supports_update_returning(session):
+        obj = session.execute(
+            stmt.returning(model_cls),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).scalars().first()
+    else:
+        if session.execute(stmt, execution_options={"synchronize_session": False}).rowcount == 0:
+            session.rollback()
+            return None
+        obj = session.execute(
+            select(model_cls).where(model_cls.id == id), execution_options={"populate_existing": True}
+        ).scalars().first()
+    if obj is None:
+        session.rollback()
+        return None
+    session.expunge(obj)
+    session.commit()
+    return obj
+
+
+def delete_by_id(session: Session, model_cls, id: str, commit: bool = True) -> bool:
+    """
+    Delete one row by primary key with a single DELETE; rowcount tells whether it existed.
+    With ``commit=False`` the transaction is left open for the caller to finish.
+    """
+    result = session.execute(delete(model_cls).where(model_cls.id == id))
+    if commit:
+        session.commit()
+    return result.rowcount > 0
+
+
+async def async_update_by_id(session, model_cls, id: str, updates: Dict[str, Any]) -> Optional[Any]:
+    """AsyncSession counterpart of ``update_by_id``."""
+    values = column_updates(model_cls, updates)
+    if not values:
+        return (await session.execute(select(model_cls).where(model_cls.id == id))).scalars().first()
+    stmt = update(model_cls).where(model_cls.id == id).values(**values)
+    if supports_update_returning(session):
+        obj = (await session.execute(
+            stmt.returning(model_cls),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )).scalars().first()
+    else:
+        if (await session.execute(stmt, execution_options={"synchronize_session": False})).rowcount == 0:
+            await session.rollback()
+            return None
+        obj = (await session.execute(
+            select(model_cls).where(model_cls.id == id), execution_options={"populate_existing": True}
+        )).scalars().first()
+    if obj is None:
+        await session.rollback()
+        return None
+    session.expunge(obj)
+    await session.commit()
+    return obj
+
+
+async def async_delete_by_id(session, model_cls, id: str, commit: bool = True) -> bool:
+    result = await session.execute(delete(model_cls).where(model_cls.id == id))
+    if commit:
+        await session.commit()
+    return result.rowcount > 0
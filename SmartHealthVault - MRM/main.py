@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from database.base import Base, engine
+from database.migrations import upgrade_database
+from database.instrumentation import QueryStatsMiddleware
+from database.base import SessionLocal
 import os
 from dotenv import load_dotenv
 
@@ -20,9 +22,22 @@ from routers.insurance_router import router as insurance_router
 from routers.notification_router import router as notification_router
 from routers.telemedicine_router import router as telemedicine_router
 from routers.pdf_router import router as pdf_router  # PDF analysis router
+from routers.metrics_router import router as metrics_router
+from routers.job_router import router as job_router
+from services.pdf_catalog_manager import index_legacy_pdfs_once
+from services.pdf_extraction import shutdown_pool
+from services.llm_gateway import llm_gateway
+from services.job_engine import job_engine
+from services.llm_resilience import LLMError, llm_error_handler
 
 app = FastAPI(title="SmartHealthVault - Backend (FastAPI)")
 
+# Per-request SQL statement count / time headers and /metrics/db aggregates
+app.add_middleware(QueryStatsMiddleware)
+
+# Provider outages / timeouts surface as 503 (with Retry-After) / 504
+app.add_exception_handler(LLMError, llm_error_handler)
+
 # Include all routers
 app.include_router(user_router)
 app.include_router(doctor_router)
@@ -32,19 +47,37 @@ app.include_router(insurance_router)
 app.include_router(notification_router)
 app.include_router(telemedicine_router)
 app.include_router(pdf_router)  # Add PDF router
+app.include_router(metrics_router)
+app.include_router(job_router)
 
 # Serve static files for uploads
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 def on_startup():
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Apply pending schema migrations (alembic upgrade head)
+    upgrade_database()
     
     # Create necessary directories if they don't exist
     os.makedirs("uploads/raw", exist_ok=True)
     os.makedirs("uploads/processed", exist_ok=True)
 
+    # Catalog PDFs uploaded before the catalog existed (no-op once populated)
+    with SessionLocal() as session:
+        index_legacy_pdfs_once(session)
+
+    # Run queued background jobs (and recover those of a previous, crashed run)
+    job_engine.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Stop taking background jobs; unfinished ones are requeued for the next start
+    job_engine.shutdown()
+    # Stop the PDF extraction worker processes, if any were started
+    shutdown_pool()
+    # Close pooled LLM connections and stop the gateway's loop thread
+    llm_gateway.close()
+
 @app.get("/")
 def root():
     return {"message": "SmartHealthVault API running"}
@@ -0,0 +1,39 @@
+"""Secondary indexes for hot lookup columns
+
+Per-owner lookups are composite with created_at so timeline queries
+(filter by owner, order by newest) are served from the index without a
+separate sort step.
+
+Revision ID: 0002_hot_lookup_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+
+revision = "0002_hot_lookup_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_records_user_id_created_at", "records", ["user_id", "created_at"]),
+    ("ix_appointments_doctor_id_created_at", "appointments", ["doctor_id", "created_at"]),
+    ("ix_appointments_user_id_created_at", "appointments", ["user_id", "created_at"]),
+    ("ix_notifications_user_id_created_at", "notifications", ["user_id", "created_at"]),
+    ("ix_policies_patient_id_created_at", "policies", ["patient_id", "created_at"]),
+    ("ix_claims_policy_id_created_at", "claims", ["policy_id", "created_at"]),
+    ("ix_claims_patient_id_created_at", "claims", ["patient_id", "created_at"]),
+    ("ix_doctors_specialization", "doctors", ["specialization"]),
+    ("ix_ai_results_user_id_created_at", "ai_results", ["user_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
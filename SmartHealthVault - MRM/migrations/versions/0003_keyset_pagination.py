@@ -0,0 +1,33 @@
+"""created_at on users and doctors for keyset pagination
+
+Every list endpoint pages on (created_at, id). users and doctors had no
+created_at; existing rows are backfilled with the migration time so they
+sort as one block and stay reachable through the id tiebreaker.
+
+Revision ID: 0003_keyset_pagination
+Revises: 0002_hot_lookup_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_keyset_pagination"
+down_revision = "0002_hot_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("users", "doctors"):
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(sa.Column("created_at", sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        op.create_index(f"ix_{table}_created_at", table, ["created_at"])
+
+
+def downgrade() -> None:
+    for table in ("doctors", "users"):
+        op.drop_index(f"ix_{table}_created_at", table_name=table)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("created_at")
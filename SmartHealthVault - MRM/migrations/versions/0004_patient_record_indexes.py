@@ -0,0 +1,33 @@
+"""Patient record list indexes covering the keyset order
+
+The per-patient record list pages on (created_at DESC, id DESC) and may
+filter by category. Adding id to the index lets SQLite walk it in page
+order without a sort step for ties, and the category variant serves the
+filtered list the same way.
+
+Revision ID: 0004_patient_record_indexes
+Revises: 0003_keyset_pagination
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+
+revision = "0004_patient_record_indexes"
+down_revision = "0003_keyset_pagination"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_records_user_id_created_at_id", "records", ["user_id", "created_at", "id"])
+    op.create_index(
+        "ix_records_user_id_category_created_at_id", "records", ["user_id", "category", "created_at", "id"]
+    )
+    # superseded by ix_records_user_id_created_at_id (same leading columns)
+    op.drop_index("ix_records_user_id_created_at", table_name="records")
+
+
+def downgrade() -> None:
+    op.create_index("ix_records_user_id_created_at", "records", ["user_id", "created_at"])
+    op.drop_index("ix_records_user_id_category_created_at_id", table_name="records")
+    op.drop_index("ix_records_user_id_created_at_id", table_name="records")
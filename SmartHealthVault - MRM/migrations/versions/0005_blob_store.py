@@ -0,0 +1,34 @@
+"""Content-addressed blob table for deduplicated uploads
+
+Uploaded files are stored once per SHA-256 under uploads/blobs/; records
+point at the blob path and ref_count tracks how many records share it.
+
+Revision ID: 0005_blob_store
+Revises: 0004_patient_record_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_blob_store"
+down_revision = "0004_patient_record_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("mime_type", sa.String(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("blobs")
@@ -0,0 +1,40 @@
+"""PDF catalog table
+
+Replaces scanning the upload directory to list available PDFs. Rows are
+added when a PDF is uploaded; files from before the catalog are indexed
+once at startup (see services.pdf_catalog_manager.index_legacy_pdfs).
+
+Revision ID: 0006_pdf_catalog
+Revises: 0005_blob_store
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_pdf_catalog"
+down_revision = "0005_blob_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pdf_catalog",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_pdf_catalog_created_at_id", "pdf_catalog", ["created_at", "id"])
+    op.create_index("ix_pdf_catalog_sha256", "pdf_catalog", ["sha256"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pdf_catalog_sha256", table_name="pdf_catalog")
+    op.drop_index("ix_pdf_catalog_created_at_id", table_name="pdf_catalog")
+    op.drop_table("pdf_catalog")
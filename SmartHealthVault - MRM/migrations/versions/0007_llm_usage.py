@@ -0,0 +1,45 @@
+"""LLM usage ledger
+
+Prompt and completion tokens (and estimated cost) of every billed LLM
+call, attributed to the calling user and endpoint, for per-user / per-day
+accounting (see services.llm_usage).
+
+Revision ID: 0007_llm_usage
+Revises: 0006_pdf_catalog
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_llm_usage"
+down_revision = "0006_pdf_catalog"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_usage",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("endpoint", sa.String(), nullable=True),
+        sa.Column("route", sa.String(), nullable=True),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=True),
+        sa.Column("latency_ms", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_llm_usage_user_id_created_at", "llm_usage", ["user_id", "created_at"])
+    op.create_index("ix_llm_usage_created_at", "llm_usage", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_usage_created_at", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_user_id_created_at", table_name="llm_usage")
+    op.drop_table("llm_usage")
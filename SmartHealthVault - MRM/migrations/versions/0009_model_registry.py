@@ -0,0 +1,42 @@
+"""Model registry
+
+Trained model versions with their metrics, feature schema and the active
+version per model name; see services.model_registry.
+
+Revision ID: 0009_model_registry
+Revises: 0008_jobs
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_model_registry"
+down_revision = "0008_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "model_versions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.String(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("artifact_path", sa.String(), nullable=False),
+        sa.Column("metrics", sa.Text(), nullable=True),
+        sa.Column("feature_schema", sa.Text(), nullable=True),
+        sa.Column("training_job_id", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("activated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name", "version", name="uq_model_versions_name_version"),
+    )
+    op.create_index("ix_model_versions_name_active", "model_versions", ["name", "active"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_model_versions_name_active", table_name="model_versions")
+    op.drop_table("model_versions")
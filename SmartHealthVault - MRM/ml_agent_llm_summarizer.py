@@ -1,9 +1,10 @@
 import os
-from ddgs import DDGS
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from langchain_openai import ChatOpenAI
+from services.llm_gateway import llm_gateway
+from services.search_backend import get_search_backend
 from langchain.agents import initialize_agent, Tool
 
 # -----------------------------
@@ -11,16 +12,14 @@ from langchain.agents import initialize_agent, Tool
 # -----------------------------
 def search_tool(query: str):
     results = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(query, max_results=5):
-            results.append(f"{r['title']} - {r['href']}\n{r['body']}")
+    for r in get_search_backend().text(query, max_results=5):
+        results.append(f"{r['title']} - {r['href']}\n{r['body']}")
     return "\n\n".join(results)
 
 # -----------------------------
 # Tool 2: Summarizer
 # -----------------------------
 def summarize_tool(text: str):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
     prompt = f"""
     Summarize the following into a clean professional report.
 
@@ -32,7 +31,9 @@ def summarize_tool(text: str):
     Text:
     {text}
     """
-    return llm.invoke(prompt).content
+    return llm_gateway.chat_sync(
+        [{"role": "user", "content": prompt}], model="gpt-4o-mini", temperature=0, route="report"
+    ).text
 
 # -----------------------------
 # Tool 3: Template Filler
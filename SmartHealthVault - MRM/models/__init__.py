@@ -5,3 +5,8 @@ from .ai_ml_model import *
 from .insurance_model import *
 from .notification_model import *
 from .telemedicine_model import *
+from .blob_model import *
+from .pdf_catalog_model import *
+from .llm_usage_model import *
+from .job_model import *
+from .model_registry_model import *
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from database.base import Base
 import uuid
 from datetime import datetime
 
 class AIResultModel(Base):
     __tablename__ = "ai_results"
+    __table_args__ = (
+        Index("ix_ai_results_user_id_created_at", "user_id", "created_at"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, nullable=False)
     result = Column(String, nullable=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger
+from database.base import Base
+from datetime import datetime
+
+class BlobModel(Base):
+    """One stored file, shared by every record whose upload had the same SHA-256"""
+    __tablename__ = "blobs"
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    mime_type = Column(String, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,12 +1,18 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, DateTime, Index
 from database.base import Base
 import uuid
+from datetime import datetime
 
 class DoctorModel(Base):
     __tablename__ = "doctors"
+    __table_args__ = (
+        Index("ix_doctors_specialization", "specialization"),
+        Index("ix_doctors_created_at", "created_at"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
     specialization = Column(String, nullable=True)
     qualifications = Column(String, nullable=True)
     languages = Column(String, nullable=True)
     clinic_address = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
 from database.base import Base
 import uuid
 from datetime import datetime
 
 class PolicyModel(Base):
     __tablename__ = "policies"
+    __table_args__ = (
+        Index("ix_policies_patient_id_created_at", "patient_id", "created_at"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     patient_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
@@ -15,6 +18,10 @@ class PolicyModel(Base):
 
 class ClaimModel(Base):
     __tablename__ = "claims"
+    __table_args__ = (
+        Index("ix_claims_policy_id_created_at", "policy_id", "created_at"),
+        Index("ix_claims_patient_id_created_at", "patient_id", "created_at"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     policy_id = Column(String, nullable=False)
     patient_id = Column(String, nullable=False)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, Text, Index
+from database.base import Base
+import uuid
+from datetime import datetime
+
+class JobModel(Base):
+    """A unit of background work run by services.job_engine; payload and result are JSON"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_kind_created_at", "status", "kind", "created_at"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)      # handler name, e.g. "training"
+    status = Column(String, nullable=False, default="queued")
+    user_id = Column(String, nullable=True)
+    endpoint = Column(String, nullable=True)   # rate-limited endpoint that submitted it (usage accounting)
+    payload = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)  # 0..1
+    message = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String, nullable=True)     # engine that holds the job while it runs
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
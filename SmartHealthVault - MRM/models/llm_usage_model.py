@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime, Integer, Float, Index
+from database.base import Base
+import uuid
+from datetime import datetime
+
+class LLMUsageModel(Base):
+    """One row per billed LLM call (response-cache hits are not billed and not recorded)"""
+    __tablename__ = "llm_usage"
+    __table_args__ = (
+        Index("ix_llm_usage_user_id_created_at", "user_id", "created_at"),
+        Index("ix_llm_usage_created_at", "created_at"),
+    )
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, nullable=True)    # caller, as identified by the rate limiter; NULL outside a request
+    endpoint = Column(String, nullable=True)   # rate-limited endpoint name, e.g. "ai.search"
+    route = Column(String, nullable=True)      # gateway route of the call site
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=True)    # NULL when the model has no known price
+    latency_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Index, UniqueConstraint
+from database.base import Base
+import uuid
+from datetime import datetime
+
+class ModelVersionModel(Base):
+    """One trained version of a model; its artifacts live under services.model_registry.MODEL_STORE_DIR"""
+    __tablename__ = "model_versions"
+    __table_args__ = (
+        UniqueConstraint("name", "version", name="uq_model_versions_name_version"),
+        Index("ix_model_versions_name_active", "name", "active"),
+    )
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, nullable=False)          # e.g. "diagnosis-risk-model"
+    version = Column(String, nullable=False)
+    active = Column(Boolean, nullable=False, default=False)  # the version predictions use; one per name
+    artifact_path = Column(String, nullable=False)
+    metrics = Column(Text, nullable=True)          # JSON
+    feature_schema = Column(Text, nullable=True)   # JSON
+    training_job_id = Column(String, nullable=True)
+    description = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    activated_at = Column(DateTime, nullable=True)
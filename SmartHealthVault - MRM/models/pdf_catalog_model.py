@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Index
+from database.base import Base
+from datetime import datetime
+
+class PdfCatalogModel(Base):
+    """One row per stored PDF, so listing never has to walk the upload tree"""
+    __tablename__ = "pdf_catalog"
+    __table_args__ = (
+        Index("ix_pdf_catalog_created_at_id", "created_at", "id"),
+        Index("ix_pdf_catalog_sha256", "sha256", unique=True),
+    )
+    id = Column(String, primary_key=True)  # the pdf_id: content hash for blobs, file stem for legacy uploads
+    sha256 = Column(String(64), nullable=True)
+    path = Column(String, nullable=False)
+    filename = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=True)
+    page_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
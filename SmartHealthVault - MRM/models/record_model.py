@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from database.base import Base
 import uuid
 from datetime import datetime
 
 class RecordModel(Base):
     __tablename__ = "records"
+    __table_args__ = (
+        Index("ix_records_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_records_user_id_category_created_at_id", "user_id", "category", "created_at", "id"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, nullable=False)
     doctor_id = Column(String, nullable=True)
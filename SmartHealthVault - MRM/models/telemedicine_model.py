@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from database.base import Base
 import uuid
 from datetime import datetime
 
 class AppointmentModel(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_doctor_id_created_at", "doctor_id", "created_at"),
+        Index("ix_appointments_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, nullable=False)
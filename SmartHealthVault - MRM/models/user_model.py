@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, Integer, Date
+from sqlalchemy import Column, String, Integer, Date, DateTime, Index
 from database.base import Base
 import uuid
+from datetime import datetime
 
 class UserModel(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),
+    )
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
@@ -14,3 +18,4 @@ class UserModel(Base):
     blood_group = Column(String, nullable=True)
     address = Column(String, nullable=True)
     role = Column(String, nullable=False, default="patient")
+    created_at = Column(DateTime, default=datetime.utcnow)
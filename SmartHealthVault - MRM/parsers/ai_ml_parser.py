@@ -35,7 +35,8 @@ class TrainingRequest(BaseModel):
 class TrainingResponse(BaseModel):
     training_id: str
     model_name: str
-    status: str  # e.g., 'pending', 'training', 'completed', 'failed'
+    status: str  # e.g., 'pending', 'training', 'completed', 'failed', 'cancelled'
+    progress: float = 0.0
     metrics: Optional[TrainingMetrics] = None
     created_at: datetime = None
     completed_at: Optional[datetime] = None
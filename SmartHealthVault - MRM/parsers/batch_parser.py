@@ -0,0 +1,54 @@
+from pydantic import BaseModel, ValidationError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from database.bulk import BulkItemResult
+
+MAX_BATCH_SIZE = 10000
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # created, updated, deleted, not_found, invalid, error
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    items: List[BatchItemResult]
+
+class BatchIds(BaseModel):
+    ids: List[str]
+
+def validate_batch(items: List[Dict[str, Any]], schema: Type[BaseModel],
+                   parse: Callable[[Any], Any]) -> Tuple[List[Any], List[int], List[BulkItemResult]]:
+    """
+    Validate and parse each raw item independently so one bad item does not
+    reject the whole batch.
+
+    Returns the parsed models, the original index of each, and an
+    ``invalid`` result for every item that failed validation.
+    """
+    parsed, positions, invalid = [], [], []
+    for i, raw in enumerate(items):
+        try:
+            parsed.append(parse(schema.model_validate(raw)))
+            positions.append(i)
+        except (ValidationError, ValueError) as e:
+            invalid.append(BulkItemResult(i, None, "invalid", str(e)))
+    return parsed, positions, invalid
+
+def to_batch_response(results: List[BulkItemResult]) -> BatchResponse:
+    items = sorted(
+        (BatchItemResult(index=r.index, id=r.id, status=r.status, error=r.error) for r in results),
+        key=lambda item: item.index,
+    )
+    succeeded = sum(1 for r in results if r.ok)
+    return BatchResponse(total=len(items), succeeded=succeeded, failed=len(items) - succeeded, items=items)
+
+def run_batch(items: List[Dict[str, Any]], schema: Type[BaseModel], parse: Callable[[Any], Any],
+              write: Callable[[List[Any]], List[BulkItemResult]]) -> BatchResponse:
+    """Validate ``items``, write the valid ones in bulk and report a result per request item."""
+    parsed, positions, results = validate_batch(items, schema, parse)
+    if parsed:
+        results += [r._replace(index=positions[r.index]) for r in write(parsed)]
+    return to_batch_response(results)
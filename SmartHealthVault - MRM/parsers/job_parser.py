@@ -0,0 +1,35 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
+import datetime
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed, cancelled
+    progress: float = 0.0
+    message: Optional[str] = None
+    payload: Optional[Any] = None  # only when asked for
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    attempts: int = 0
+    created_at: Optional[datetime.datetime] = None
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+    status_url: Optional[str] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": "3f2b8c1e-9a4d-4e57-b1f0-6c2d9e8a7b51",
+                "kind": "pdf_analysis",
+                "status": "running",
+                "progress": 0.4,
+                "message": "Summarizing",
+                "attempts": 1,
+                "created_at": "2023-01-01T12:00:00",
+                "started_at": "2023-01-01T12:00:01",
+                "status_url": "/jobs/3f2b8c1e-9a4d-4e57-b1f0-6c2d9e8a7b51"
+            }
+        }
+    )
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+import datetime
+
+class LLMUsageDay(BaseModel):
+    user_id: Optional[str] = None
+    day: datetime.date
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_usd: Optional[float] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "user_id": "user-123",
+                "day": "2023-01-01",
+                "calls": 42,
+                "prompt_tokens": 61200,
+                "completion_tokens": 9800,
+                "total_tokens": 71000,
+                "cost_usd": 0.0453
+            }
+        }
+    )
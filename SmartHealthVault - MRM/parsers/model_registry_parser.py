@@ -0,0 +1,37 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+import datetime
+
+class ModelVersionResponse(BaseModel):
+    name: str
+    version: str
+    active: bool = False
+    metrics: Optional[Dict[str, Any]] = None
+    feature_schema: Optional[Dict[str, Any]] = None
+    training_job_id: Optional[str] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime.datetime] = None
+    activated_at: Optional[datetime.datetime] = None
+
+class ModelInfo(BaseModel):
+    """A model name in the registry with its active version, if any"""
+    name: str
+    versions: int = 0
+    active_version: Optional[ModelVersionResponse] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "name": "diagnosis-risk-model",
+                "versions": 3,
+                "active_version": {
+                    "name": "diagnosis-risk-model",
+                    "version": "20231001T120000-3f2b8c",
+                    "active": True,
+                    "metrics": {"accuracy": 0.81, "f1_score": 0.77},
+                    "created_at": "2023-10-01T12:00:00",
+                    "activated_at": "2023-10-01T12:00:00"
+                }
+            }
+        }
+    )
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+import datetime
+
+class PdfCatalogEntry(BaseModel):
+    id: str
+    sha256: Optional[str] = None
+    filename: Optional[str] = None
+    size: Optional[int] = None
+    page_count: Optional[int] = None
+    created_at: Optional[datetime.datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                "sha256": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                "filename": "lab_report.pdf",
+                "size": 482133,
+                "page_count": 4,
+                "created_at": "2023-01-01T12:00:00"
+            }
+        }
+    )
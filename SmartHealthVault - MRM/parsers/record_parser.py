@@ -52,3 +52,14 @@ class RecordResponse(BaseModel):
             }
         }
     )
+
+class RecordSummary(BaseModel):
+    """List-view shape of a record: everything except ``content``"""
+    id: str
+    user_id: str
+    doctor_id: Optional[str] = None
+    category: Optional[str] = None
+    title: Optional[str] = None
+    file_path: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    created_at: datetime.datetime
@@ -1,27 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
 from services.ai_ml_manager import AIManager
+from services.llm_resilience import LLMError
+from services.rate_limiter import rate_limit
+from services.single_flight import SingleFlight
 from parsers.ai_ml_parser import (
     AIRequest, AIResponse, TrainingRequest, TrainingResponse, 
-    WebSearchRequest, WebSearchResponse, PDFAnalysisRequest, PDFAnalysisResponse
+    WebSearchRequest, WebSearchResponse, PDFAnalysisRequest
 )
+from parsers.job_parser import JobResponse
+from parsers.model_registry_parser import ModelInfo, ModelVersionResponse
 
 router = APIRouter(prefix="/ai", tags=["AI/ML"])
 
+search_flight = SingleFlight("ai.search_and_summarize")
+
 @router.post("/analyze/", response_model=AIResponse)
 def analyze(req: AIRequest, db: Session = Depends(get_db_session)):
-    return AIManager(db).analyze(req)
+    try:
+        return AIManager(db).analyze(req)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 @router.post("/predict/", response_model=AIResponse)
 def predict(req: AIRequest, db: Session = Depends(get_db_session)):
-    return AIManager(db).predict(req)
+    try:
+        return AIManager(db).predict(req)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-@router.get("/models/", response_model=List[str])
+@router.get("/models/", response_model=List[ModelInfo])
 def models(db: Session = Depends(get_db_session)):
+    """Models in the registry with their active version and its training metrics"""
     return AIManager(db).list_models()
 
+@router.get("/models/{name}", response_model=ModelVersionResponse)
+def active_model(name: str, db: Session = Depends(get_db_session)):
+    """The active version of a model, with its feature schema"""
+    model = AIManager(db).get_model_version(name)
+    if not model:
+        raise HTTPException(status_code=404, detail=f"Model {name} has no active version")
+    return model
+
+@router.get("/models/{name}/versions", response_model=List[ModelVersionResponse])
+def model_versions(name: str, db: Session = Depends(get_db_session)):
+    return AIManager(db).list_model_versions(name)
+
+@router.get("/models/{name}/versions/{version}", response_model=ModelVersionResponse)
+def model_version(name: str, version: str, db: Session = Depends(get_db_session)):
+    model = AIManager(db).get_model_version(name, version)
+    if not model:
+        raise HTTPException(status_code=404, detail=f"No version {version} of model {name}")
+    return model
+
+@router.post("/models/{name}/versions/{version}/activate", response_model=ModelVersionResponse)
+def activate_model_version(name: str, version: str, db: Session = Depends(get_db_session)):
+    """Serve predictions from another trained version, e.g. to roll back"""
+    try:
+        return AIManager(db).activate_model_version(name, version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.post("/train/", response_model=TrainingResponse, status_code=202)
 def train_model(request: TrainingRequest, db: Session = Depends(get_db_session)):
     """
@@ -31,10 +72,13 @@ def train_model(request: TrainingRequest, db: Session = Depends(get_db_session))
     - **parameters**: Hyperparameters for training
     - **description**: Optional description of the training run
     Returns:
-        TrainingResponse with training status and metrics (once completed)
+        TrainingResponse for the queued job, returned immediately; poll
+        GET /ai/train/{training_id} for progress and, once completed, metrics
     """
     try:
         return AIManager(db).train_model(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -53,7 +97,7 @@ def get_training_status(training_id: str, db: Session = Depends(get_db_session))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/search-and-summarize/", response_model=WebSearchResponse)
+@router.post("/search-and-summarize/", response_model=WebSearchResponse, dependencies=[Depends(rate_limit("ai.search"))])
 def search_and_summarize(
     request: WebSearchRequest,
     db: Session = Depends(get_db_session)
@@ -72,7 +116,10 @@ def search_and_summarize(
         max_results = max(1, min(10, request.max_results or 3))
         
         # Call the AIManager with the query and max_results
-        result = AIManager(db).search_and_summarize(
+        # Concurrent identical searches share one search + LLM round trip
+        result = search_flight.do(
+            (request.query.strip().lower(), max_results),
+            AIManager(db).search_and_summarize,
             query=request.query,
             max_results=max_results
         )
@@ -85,34 +132,37 @@ def search_and_summarize(
             timestamp=result['timestamp']
         )
         
+    except LLMError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error performing search and summarize: {str(e)}"
         )
 
-@router.post("/analyze/pdf", response_model=PDFAnalysisResponse, status_code=200)
-async def analyze_pdf(
+@router.post("/analyze/pdf", response_model=JobResponse, status_code=202,
+             dependencies=[Depends(rate_limit("ai.analyze_pdf"))])
+def analyze_pdf(
     request: PDFAnalysisRequest,
+    response: Response,
     db: Session = Depends(get_db_session)
 ):
     """
-    Analyze and summarize a PDF document
+    Queue analysis and summarization of a PDF document
     
-    This endpoint takes a PDF ID (from the uploads folder) and returns a summary
-    with optional key points. The summary length can be customized.
+    This endpoint takes a PDF ID (from the uploads folder) and returns a job
+    immediately; poll ``status_url`` until the job has succeeded, when its
+    ``result`` holds the PDFAnalysisResponse (summary, optional key points,
+    metadata).
     
     - **pdf_id**: ID of the PDF file to analyze (must exist in uploads/raw/pdfs/)
     - **summary_length**: Desired length of the summary (short/medium/detailed)
-    - **include_key_points**: Whether to include key points in the response
+    - **include_key_points**: Whether to include key points in the result
     
     Returns:
-        PDFAnalysisResponse with the document summary and metadata
+        JobResponse for the queued analysis
     """
-    try:
-        return AIManager(db).analyze_pdf(request)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing PDF: {str(e)}"
-        )
+    job = AIManager(db).submit_pdf_analysis(request)
+    job.status_url = f"/jobs/{job.id}"
+    response.headers["Location"] = job.status_url
+    return job
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from services.doctor_manager import DoctorManager
 from parsers.doctor_parser import DoctorCreate, DoctorResponse
 
@@ -12,8 +13,19 @@ def create_doctor(payload: DoctorCreate, db: Session = Depends(get_db_session)):
     return DoctorManager(db).create_doctor(payload)
 
 @router.get("/", response_model=List[DoctorResponse])
-def list_doctors(db: Session = Depends(get_db_session)):
-    return DoctorManager(db).list_doctors()
+def list_doctors(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = DoctorManager(db).list_doctors(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/{doctor_id}", response_model=DoctorResponse)
 def get_doctor(doctor_id: str, db: Session = Depends(get_db_session)):
@@ -22,5 +34,17 @@ def get_doctor(doctor_id: str, db: Session = Depends(get_db_session)):
     return d
 
 @router.get("/specialty/{specialty}", response_model=List[DoctorResponse])
-def find_by_specialty(specialty: str, db: Session = Depends(get_db_session)):
-    return DoctorManager(db).list_doctors(specialization=specialty)
+def find_by_specialty(
+    specialty: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = DoctorManager(db).list_doctors(specialization=specialty, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from services.insurance_manager import InsuranceManager
 from parsers.insurance_parser import PolicyCreate, PolicyResponse, ClaimCreate, ClaimResponse
 
@@ -18,15 +19,29 @@ def get_policy(policy_id: str, db: Session = Depends(get_db_session)):
     return p
 
 @router.get("/policies/patient/{patient_id}", response_model=List[PolicyResponse])
-def get_patient_policies(patient_id: str, db: Session = Depends(get_db_session)):
+def get_patient_policies(
+    patient_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
     """
-    Get all insurance policies for a specific patient
+    Get insurance policies for a specific patient, newest first
     
     - **patient_id**: The ID of the patient whose policies to retrieve
+    - **limit**: Maximum number of policies to return
+    - **cursor**: Value of the previous page's X-Next-Cursor header
     - Returns: List of insurance policies for the specified patient
     """
-    policies = InsuranceManager(db).list_policies_for_patient(patient_id)
-    if not policies:
+    try:
+        page = InsuranceManager(db).list_policies_for_patient(patient_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    policies = page.items
+    if not policies and not cursor:
         raise HTTPException(
             status_code=404,
             detail=f"No policies found for patient with ID: {patient_id}"
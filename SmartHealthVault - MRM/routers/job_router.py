@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Literal, Optional
+from sqlalchemy.orm import Session
+from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from services.job_engine import JobManager
+from parsers.job_parser import JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/", response_model=List[JobResponse])
+def list_jobs(
+    response: Response,
+    kind: Optional[str] = None,
+    status: Optional[Literal["queued", "running", "succeeded", "failed", "cancelled"]] = None,
+    user_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    """
+    List background jobs, newest first
+    
+    - **kind**, **status**, **user_id**: Optional filters
+    - **limit** / **cursor**: Page size and the previous page's X-Next-Cursor header
+    """
+    try:
+        page = JobManager(db).list_jobs({"kind": kind, "status": status, "user_id": user_id}, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db_session)):
+    """Status, progress and, once finished, the result or error of a job"""
+    job = JobManager(db).get_job(job_id, status_url=f"/jobs/{job_id}")
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(job_id: str, db: Session = Depends(get_db_session)):
+    """
+    Cancel a job. A queued job is cancelled at once; a running one stops at
+    its next progress update. Finished jobs are left as they are.
+    """
+    job = JobManager(db).cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
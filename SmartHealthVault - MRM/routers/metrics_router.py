@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from database.db_manager import get_db_session
+from database.cache import entity_cache
+from database.instrumentation import query_metrics
+from services.job_engine import job_engine
+from services.llm_gateway import llm_gateway
+from services.llm_usage import LLMUsageManager, usage_recorder
+from services.model_registry import model_cache
+from services.rate_limiter import rate_limiter
+from parsers.llm_usage_parser import LLMUsageDay
+from services.single_flight import single_flight_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/db")
+def db_metrics():
+    metrics = query_metrics.snapshot()
+    metrics["entity_cache"] = entity_cache.stats() if entity_cache else None
+    return metrics
+
+@router.delete("/db")
+def reset_db_metrics():
+    query_metrics.reset()
+    return {"message": "DB metrics reset"}
+
+@router.get("/llm")
+def llm_metrics():
+    return llm_gateway.snapshot()
+
+@router.get("/coalescing")
+def coalescing_metrics():
+    return single_flight_stats()
+
+@router.get("/llm/usage", response_model=List[LLMUsageDay])
+def llm_usage(
+    user_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db_session)
+):
+    """Billed LLM calls, tokens and estimated cost per user and day"""
+    if usage_recorder:
+        usage_recorder.flush()  # include calls still waiting in the write buffer
+    return LLMUsageManager(db).daily_usage(user_id, start, end)
+
+@router.get("/rate-limits")
+def rate_limit_metrics():
+    return rate_limiter.snapshot()
+
+@router.get("/jobs")
+def job_metrics():
+    return job_engine.snapshot()
+
+@router.get("/models")
+def model_metrics():
+    return model_cache.stats()
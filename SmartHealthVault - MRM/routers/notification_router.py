@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from services.notification_manager import NotificationManager
 from parsers.notification_parser import NotificationCreate, NotificationResponse
+from parsers.batch_parser import BatchIds, BatchResponse, MAX_BATCH_SIZE
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -11,9 +13,39 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 def create_notification(payload: NotificationCreate, db: Session = Depends(get_db_session)):
     return NotificationManager(db).create_notification(payload)
 
+@router.post("/batch", response_model=BatchResponse)
+def create_notifications_batch(items: List[Dict[str, Any]], db: Session = Depends(get_db_session)):
+    """
+    Create many notifications at once (e.g. a broadcast), reporting a
+    status for every item in request order
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large; at most {MAX_BATCH_SIZE} items per request")
+    return NotificationManager(db).create_notifications(items)
+
+@router.post("/batch/read", response_model=BatchResponse)
+def mark_read_batch(payload: BatchIds, db: Session = Depends(get_db_session)):
+    """Mark many notifications as read with a single bulk UPDATE"""
+    items = payload.ids
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large; at most {MAX_BATCH_SIZE} items per request")
+    return NotificationManager(db).mark_many_as_read(items)
+
 @router.get("/user/{user_id}", response_model=List[NotificationResponse])
-def user_notifications(user_id: str, db: Session = Depends(get_db_session)):
-    return NotificationManager(db).list_notifications()
+def user_notifications(
+    user_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = NotificationManager(db).list_notifications(user_id=user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
 def get_notification(notification_id: str, db: Session = Depends(get_db_session)):
@@ -1,33 +1,39 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Response
 from fastapi.responses import JSONResponse
 from typing import Optional, Literal, Dict, Any, List
-import fitz  # PyMuPDF
 import os
 import tempfile
-from openai import OpenAI
+import asyncio
+import hashlib
+import anyio
 from dotenv import load_dotenv
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.db_manager import get_db_session
+from database.db_manager import get_async_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from services.llm_gateway import llm_gateway
+from services.llm_resilience import LLMError
 from services.pdf_analyzer import PDFAnalyzer
+from services.pdf_extraction import PdfTextExtractor
+from services.pdf_catalog_manager import AsyncPdfCatalogManager
+from services.rate_limiter import rate_limit
+from services.single_flight import AsyncSingleFlight
+from parsers.pdf_catalog_parser import PdfCatalogEntry
 
 # Load environment variables
 load_dotenv()
 
 router = APIRouter(prefix="/analyze", tags=["PDF Analysis"])
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+upload_analysis_flight = AsyncSingleFlight("pdf.analyze_upload")
+pdf_analysis_flight = AsyncSingleFlight("pdf.analyze")
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF file"""
+def extract_text_from_pdf(pdf_path: str) -> tuple[str, int]:
+    """Extract text and page count from PDF file (cached by content hash)"""
     try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text.strip()
+        with PdfTextExtractor().extract(pdf_path) as doc:
+            return doc.text().strip(), doc.page_count
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
 
@@ -51,8 +57,8 @@ def chunk_text(text: str, chunk_size: int = 4000) -> list[str]:
     
     return chunks
 
-def generate_summary(text: str, length: str = "medium") -> Dict[str, Any]:
-    """Generate summary using OpenAI"""
+async def generate_summary(text: str, length: str = "medium") -> Dict[str, Any]:
+    """Generate summary and key points concurrently through the shared LLM gateway"""
     try:
         # Define tokens based on length
         length_tokens = {
@@ -63,42 +69,68 @@ def generate_summary(text: str, length: str = "medium") -> Dict[str, Any]:
         
         max_tokens = length_tokens.get(length.lower(), 300)
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes documents."},
-                {"role": "user", "content": f"Please provide a {length} summary of the following text:\n\n{text}"}
-            ],
-            max_tokens=max_tokens,
-            temperature=0.3
+        response, key_points_response = await asyncio.gather(
+            llm_gateway.chat(
+                [
+                    {"role": "system", "content": "You are a helpful assistant that summarizes documents."},
+                    {"role": "user", "content": f"Please provide a {length} summary of the following text:\n\n{text}"}
+                ],
+                max_tokens=max_tokens,
+                route="pdf.analyze",
+            ),
+            llm_gateway.chat(
+                [
+                    {"role": "system", "content": "Extract 3-5 key points from the following text:"},
+                    {"role": "user", "content": text}
+                ],
+                max_tokens=200,
+                route="pdf.analyze",
+            ),
         )
         
-        summary = response.choices[0].message.content.strip()
-        
-        # Generate key points
-        key_points_response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Extract 3-5 key points from the following text:"},
-                {"role": "user", "content": text}
-            ],
-            max_tokens=200,
-            temperature=0.3
-        )
-        
-        key_points = [point.strip() for point in key_points_response.choices[0].message.content.split("\n") if point.strip()]
+        key_points = [point.strip() for point in key_points_response.text.split("\n") if point.strip()]
         
         return {
-            "summary": summary,
+            "summary": response.text,
             "key_points": key_points,
             "summary_length": length,
-            "tokens_used": response.usage.total_tokens if hasattr(response, 'usage') else None
+            "tokens_used": response.total_tokens
         }
         
+    except LLMError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
 
-@router.post("/pdf", response_model=Dict[str, Any])
+async def _analyze_pdf_file(pdf_path: str, summary_length: str) -> Dict[str, Any]:
+    # PyMuPDF is blocking; keep it off the event loop
+    text, page_count = await anyio.to_thread.run_sync(extract_text_from_pdf, pdf_path)
+    
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="No text could be extracted from the PDF")
+    
+    return {
+        "summary": await generate_summary(text, summary_length),
+        "pages": page_count,
+        "text_length": len(text)
+    }
+
+async def _analyze_pdf_upload(content: bytes, summary_length: str) -> Dict[str, Any]:
+    # Runs once per coalesced group: only this shared computation writes the
+    # temporary file, and it outlives any caller that goes away
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        temp_file.write(content)
+        temp_path = temp_file.name
+    try:
+        return await _analyze_pdf_file(temp_path, summary_length)
+    finally:
+        # Clean up temporary file
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+@router.post("/pdf", response_model=Dict[str, Any], dependencies=[Depends(rate_limit("pdf.analyze_upload"))])
 async def analyze_pdf(
     file: UploadFile = File(...),
     summary_length: str = "medium"
@@ -115,43 +147,30 @@ async def analyze_pdf(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    # Save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-        content = await file.read()
-        temp_file.write(content)
-        temp_path = temp_file.name
+    content = await file.read()
     
     try:
-        # Extract text from PDF
-        text = extract_text_from_pdf(temp_path)
-        
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="No text could be extracted from the PDF")
-        
-        # Generate summary
-        result = generate_summary(text, summary_length)
+        # Identical uploads analyzed concurrently share one extraction and LLM round trip
+        key = (hashlib.sha256(content).hexdigest(), summary_length)
+        analysis = await upload_analysis_flight.do(key, _analyze_pdf_upload, content, summary_length)
         
-        # Add metadata
+        # Add metadata (copy: the analysis may be shared with concurrent callers)
+        result = dict(analysis["summary"])
         result.update({
             "filename": file.filename,
-            "pages": len(fitz.open(temp_path)),
+            "pages": analysis["pages"],
             "processed_at": datetime.utcnow().isoformat(),
-            "text_length": len(text)
+            "text_length": analysis["text_length"]
         })
         
         return result
         
+    except LLMError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
 
-@router.get("/pdf/{pdf_id}", response_model=Dict[str, Any])
+@router.get("/pdf/{pdf_id}", response_model=Dict[str, Any], dependencies=[Depends(rate_limit("pdf.analyze"))])
 async def analyze_pdf_id(
     pdf_id: str,
     length: str = Query(
@@ -160,7 +179,7 @@ async def analyze_pdf_id(
         regex="^(short|medium|long)$",
         example="medium"
     ),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """
     Analyze and summarize a PDF file
@@ -171,12 +190,17 @@ async def analyze_pdf_id(
     Returns:
     - Analysis results including summary and metrics
     """
+    # Look the file up in the catalog rather than guessing its location
+    pdf_path = await AsyncPdfCatalogManager(db).resolve_path(pdf_id)
+    if not pdf_path:
+        raise HTTPException(status_code=404, detail=f"PDF with ID {pdf_id} not found")
+    
     try:
-        # Initialize PDF analyzer
-        analyzer = PDFAnalyzer()
-        
-        # Analyze the PDF
-        result = analyzer.analyze_pdf(pdf_id, length)
+        # Analyze the PDF (extraction and summarization block, so run them in a worker thread);
+        # concurrent requests for the same file and length share one analysis
+        result = await pdf_analysis_flight.do(
+            (pdf_path, length), anyio.to_thread.run_sync, PDFAnalyzer().analyze_pdf, pdf_id, length, pdf_path
+        )
         
         # Check for errors
         if "error" in result:
@@ -186,29 +210,43 @@ async def analyze_pdf_id(
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
 
-@router.get("/pdfs/available", response_model=List[str])
-async def list_available_pdfs():
+@router.get("/pdfs/available", response_model=List[PdfCatalogEntry])
+async def list_available_pdfs(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filename: Optional[str] = Query(None, description="Case-insensitive substring of the original file name"),
+    min_pages: Optional[int] = Query(None, ge=0),
+    max_pages: Optional[int] = Query(None, ge=0),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db_session)
+):
     """
-    List all available PDFs in the uploads directory
+    List available PDFs from the catalog, newest first
+    
+    - **limit** / **cursor**: Page size and the previous page's X-Next-Cursor header
+    - **filename**, **min_pages**, **max_pages**, **created_from**, **created_to**: Optional filters
     
     Returns:
-    - List of available PDF IDs (without .pdf extension)
+    - Catalog entries; ``id`` is the pdf_id accepted by ``/analyze/pdf/{pdf_id}``
     """
+    filters = {
+        "filename": filename,
+        "min_pages": min_pages,
+        "max_pages": max_pages,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
     try:
-        uploads_dir = "uploads/raw"
-        if not os.path.exists(uploads_dir):
-            return []
-            
-        pdfs = [
-            f[:-4]  # Remove .pdf extension
-            for f in os.listdir(uploads_dir)
-            if f.lower().endswith('.pdf')
-        ]
-        
-        return pdfs
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error listing PDFs: {str(e)}")
+        page = await AsyncPdfCatalogManager(db).list_pdfs(filters, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
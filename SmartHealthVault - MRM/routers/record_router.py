@@ -1,38 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import FileResponse
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from database.db_manager import get_db_session
-from services.record_manager import RecordManager
-import shutil, os
-from uuid import uuid4
-from parsers.record_parser import RecordCreate, RecordResponse
-import mimetypes
-
-# Define upload directories
-UPLOAD_BASE_DIR = "./uploads/raw"
-UPLOAD_IMAGE_DIR = os.path.join(UPLOAD_BASE_DIR, "images")
-UPLOAD_PDF_DIR = os.path.join(UPLOAD_BASE_DIR, "pdfs")
-
-# Create upload directories if they don't exist
-os.makedirs(UPLOAD_IMAGE_DIR, exist_ok=True)
-os.makedirs(UPLOAD_PDF_DIR, exist_ok=True)
-
-# Allowed file types
-ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif"}
-ALLOWED_PDF_TYPES = {"application/pdf"}
-ALLOWED_TYPES = ALLOWED_IMAGE_TYPES.union(ALLOWED_PDF_TYPES)
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.db_manager import get_db_session, get_async_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from services.record_manager import RecordManager, AsyncRecordManager
+from services.upload_pipeline import UploadPipeline, UploadRejected
+from services.blob_store import AsyncBlobStore
+from services.pdf_catalog_manager import AsyncPdfCatalogManager
+from services.file_download import file_download_response, resolve_download_path
+import os
+from parsers.record_parser import RecordCreate, RecordResponse, RecordSummary
+from parsers.batch_parser import BatchResponse, MAX_BATCH_SIZE
+from datetime import datetime
 
 router = APIRouter(prefix="/records", tags=["Records"])
 
-def get_upload_dir(content_type: str) -> str:
-    """Determine the upload directory based on file type"""
-    if content_type in ALLOWED_IMAGE_TYPES:
-        return UPLOAD_IMAGE_DIR
-    elif content_type in ALLOWED_PDF_TYPES:
-        return UPLOAD_PDF_DIR
-    else:
-        raise ValueError(f"Unsupported file type: {content_type}")
-
 @router.post("/", response_model=RecordResponse)
 async def upload_record(
     user_id: str = Form(...),
@@ -40,94 +24,140 @@ async def upload_record(
     category: Optional[str] = Form(None),
     title: Optional[str] = Form(None),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     # Check if file is provided
     if not file:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Get file content type
-    content_type = file.content_type
-    
-    # Validate file type
-    if content_type not in ALLOWED_TYPES:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_TYPES)}"
-        )
+    # Stream to disk, sniffing the type and hashing in the same pass,
+    # then file it in the content-addressed store (deduplicating repeats)
+    try:
+        stored = await UploadPipeline().ingest(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    stored = await AsyncBlobStore(db).put(stored)
+    try:
+        await AsyncPdfCatalogManager(db).register(stored)
+    except Exception as e:
+        # the upload itself succeeded; it just won't be listed until reindexed
+        print(f"Warning: Could not catalog {stored.path}: {str(e)}")
     
     try:
-        # Determine upload directory based on file type
-        upload_dir = get_upload_dir(content_type)
-        
-        # Generate unique filename
-        file_ext = os.path.splitext(file.filename)[1]  # Get original extension
-        filename = f"{uuid4().hex}{file_ext}"
-        file_path = os.path.join(upload_dir, filename)
-        
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
         # Create record in database
         payload = RecordCreate(
             user_id=user_id, 
             doctor_id=doctor_id, 
             category=category, 
             title=title or file.filename,
-            file_path=file_path
+            file_path=stored.path,
+            metadata=stored.metadata()
         )
-        return RecordManager(db).create_record(payload)
+        return await AsyncRecordManager(db).create_record(payload)
         
     except Exception as e:
-        # Clean up file if there was an error
-        if 'file_path' in locals() and os.path.exists(file_path):
-            os.remove(file_path)
+        # Give back the blob reference taken for this record
+        await AsyncBlobStore(db).release(stored.path)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@router.post("/batch", response_model=BatchResponse)
+def create_records_batch(items: List[Dict[str, Any]], db: Session = Depends(get_db_session)):
+    """
+    Create many records in one request, e.g. when importing historical data.
+
+    Rows are written with one multi-row INSERT and one commit per chunk.
+    Each item is validated on its own, so the response reports a status
+    (created/invalid/error) for every item in request order.
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large; at most {MAX_BATCH_SIZE} items per request")
+    return RecordManager(db).create_records(items)
+
 @router.get("/{record_id}", response_model=dict)
-def get_record(record_id: str, db: Session = Depends(get_db_session)):
+def get_record(record_id: str, request: Request, db: Session = Depends(get_db_session)):
     """
-    Get a specific record by ID, including its file content if available.
+    Get a specific record by ID
     
     - **record_id**: The ID of the record to retrieve
-    - Returns: Record details and file content if available
+    - Returns: Record details and, when the record has a stored file, a
+      ``download_url`` to fetch it from (ranged, cacheable); the file bytes
+      are never inlined in this response
     """
     record = RecordManager(db).get_record(record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
     
-    # If the record has a file path, read the file content
-    file_content = None
-    if record.get('file_path') and os.path.exists(record['file_path']):
-        try:
-            with open(record['file_path'], 'rb') as file:
-                file_content = file.read().decode('utf-8', errors='replace')
-        except Exception as e:
-            file_content = f"[Error reading file: {str(e)}]"
+    download_url = None
+    if resolve_download_path(record.file_path):
+        download_url = str(request.url_for("download_record_file", record_id=record_id))
     
     return {
         "record": record,
-        "file_content": file_content
+        "download_url": download_url
     }
 
-@router.get("/patient/{patient_id}", response_model=List[dict])
-def get_patient_records(patient_id: str, db: Session = Depends(get_db_session)):
+@router.api_route("/{record_id}/file", methods=["GET", "HEAD"], response_class=FileResponse)
+async def download_record_file(record_id: str, request: Request, db: AsyncSession = Depends(get_async_db_session)):
+    """
+    Download the file attached to a record
+    
+    - **record_id**: The ID of the record whose file to download
+    - Supports ``Range`` (206 Partial Content) and ``If-Range`` for resumable
+      and partial downloads
+    - Sends ``ETag`` (the content SHA-256 for blob-stored files) and
+      ``Last-Modified``; ``If-None-Match`` / ``If-Modified-Since`` get 304
+    """
+    record = await AsyncRecordManager(db).get_record(record_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    path = resolve_download_path(record.file_path)
+    if not path:
+        raise HTTPException(status_code=404, detail="Record has no file")
+    metadata = record.metadata or {}
+    return file_download_response(
+        request,
+        path,
+        media_type=metadata.get("mime_type"),
+        filename=metadata.get("original_filename") or os.path.basename(path),
+        sha256=metadata.get("sha256"),
+    )
+
+@router.get("/patient/{patient_id}", response_model=List[RecordSummary])
+def get_patient_records(
+    patient_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_db_session)
+):
     """
-    Get all records for a specific patient
+    Get record summaries for a specific patient, newest first
     
     - **patient_id**: ID of the patient whose records to retrieve
-    - Returns: List of record dictionaries for the specified patient
+    - **limit**: Maximum number of records to return
+    - **cursor**: Value of the previous page's X-Next-Cursor header
+    - **category**: Only return records in this category
+    - **created_from** / **created_to**: Creation time range (from inclusive, to exclusive)
+    - Returns: List of record summaries; fetch ``/records/{record_id}`` for the content
     """
-    records = RecordManager(db).get_records_by_patient(patient_id)
-    if not records:
+    try:
+        page = RecordManager(db).get_records_by_patient(
+            patient_id, limit=limit, cursor=cursor,
+            category=category, created_from=created_from, created_to=created_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if not page.items and not cursor:
         raise HTTPException(
             status_code=404,
             detail=f"No records found for patient with ID: {patient_id}"
         )
-    # Convert Pydantic models to dictionaries
-    return [record.model_dump() if hasattr(record, 'model_dump') else record 
-            for record in records]
+    return page.items
 
 @router.delete("/{record_id}", response_model=dict)
 def delete_record(record_id: str, db: Session = Depends(get_db_session)):
@@ -137,22 +167,9 @@ def delete_record(record_id: str, db: Session = Depends(get_db_session)):
     - **record_id**: The ID of the record to delete
     - Returns: Success message if deletion was successful
     """
-    # First check if the record exists
-    record = RecordManager(db).get_record(record_id)
-    if not record:
+    # Removes the row and releases its file (shared blobs are only unlinked
+    # once no other record references them)
+    if not RecordManager(db).delete_record(record_id):
         raise HTTPException(status_code=404, detail="Record not found")
     
-    # If the record has an associated file, delete it
-    if record.get('file_path') and os.path.exists(record['file_path']):
-        try:
-            os.remove(record['file_path'])
-        except Exception as e:
-            # Log the error but don't fail the request
-            print(f"Warning: Could not delete file {record['file_path']}: {str(e)}")
-    
-    # Delete the record from the database
-    success = RecordManager(db).delete_record(record_id)
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete record")
-    
     return {"message": "Record deleted successfully"}
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from services.telemedicine_manager import TelemedicineManager
 from parsers.telemedicine_parser import AppointmentCreate, AppointmentResponse
 
@@ -12,12 +13,36 @@ def schedule(payload: AppointmentCreate, db: Session = Depends(get_db_session)):
     return TelemedicineManager(db).schedule(payload)
 
 @router.get("/doctor/{doctor_id}", response_model=List[AppointmentResponse])
-def doctor_appointments(doctor_id: str, db: Session = Depends(get_db_session)):
-    return TelemedicineManager(db).list_appointments()
+def doctor_appointments(
+    doctor_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = TelemedicineManager(db).list_appointments(doctor_id=doctor_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/patient/{patient_id}", response_model=List[AppointmentResponse])
-def patient_appointments(patient_id: str, db: Session = Depends(get_db_session)):
-    return TelemedicineManager(db).list_appointments()
+def patient_appointments(
+    patient_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = TelemedicineManager(db).list_appointments(user_id=patient_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
 def get_appointment(appointment_id: str, db: Session = Depends(get_db_session)):
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from database.db_manager import get_db_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from services.user_manager import UserManager
 from parsers.user_parser import UserCreate, UserResponse
+from parsers.batch_parser import BatchResponse, MAX_BATCH_SIZE
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -14,9 +16,30 @@ def create_user(user: UserCreate, db: Session = Depends(get_db_session)):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/import", response_model=BatchResponse)
+def import_users(items: List[Dict[str, Any]], db: Session = Depends(get_db_session)):
+    """
+    Import many users in one request, reporting a status for every item.
+    Already-registered or repeated emails are reported as errors.
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large; at most {MAX_BATCH_SIZE} items per request")
+    return UserManager(db).import_users(items)
+
 @router.get("/", response_model=List[UserResponse])
-def list_users(db: Session = Depends(get_db_session)):
-    return UserManager(db).list_users()
+def list_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    try:
+        page = UserManager(db).list_users(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(user_id: str, db: Session = Depends(get_db_session)):
@@ -0,0 +1,41 @@
+from models.job_model import JobModel
+from parsers.job_parser import JobResponse
+from database.enums import JobStatus
+from datetime import datetime
+from typing import Any, Dict, Optional
+import json
+
+class JobParser:
+    @staticmethod
+    def parse_job(kind: str, payload: Dict[str, Any], user_id: Optional[str] = None,
+                  endpoint: Optional[str] = None) -> JobModel:
+        return JobModel(
+            kind=kind,
+            status=JobStatus.QUEUED.value,
+            user_id=user_id,
+            endpoint=endpoint,
+            payload=json.dumps(payload, default=str),
+            progress=0.0,
+            cancel_requested=False,
+            attempts=0,
+            created_at=datetime.utcnow()
+        )
+
+    @staticmethod
+    def to_json(job: JobModel, status_url: Optional[str] = None, include_payload: bool = False) -> JobResponse:
+        return JobResponse(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            progress=job.progress or 0.0,
+            message=job.message,
+            payload=json.loads(job.payload) if include_payload and job.payload else None,
+            result=json.loads(job.result) if job.result else None,
+            error=job.error,
+            cancel_requested=bool(job.cancel_requested),
+            attempts=job.attempts or 0,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            status_url=status_url
+        )
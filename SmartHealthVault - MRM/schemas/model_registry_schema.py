@@ -0,0 +1,36 @@
+from models.model_registry_model import ModelVersionModel
+from parsers.model_registry_parser import ModelVersionResponse
+from datetime import datetime
+from typing import Any, Dict, Optional
+import json
+
+class ModelRegistryParser:
+    @staticmethod
+    def parse_version(name: str, version: str, artifact_path: str, metrics: Optional[Dict[str, Any]] = None,
+                      feature_schema: Optional[Dict[str, Any]] = None, training_job_id: Optional[str] = None,
+                      description: Optional[str] = None) -> ModelVersionModel:
+        return ModelVersionModel(
+            name=name,
+            version=version,
+            active=False,
+            artifact_path=artifact_path,
+            metrics=json.dumps(metrics, default=str) if metrics is not None else None,
+            feature_schema=json.dumps(feature_schema, default=str) if feature_schema is not None else None,
+            training_job_id=training_job_id,
+            description=description,
+            created_at=datetime.utcnow()
+        )
+
+    @staticmethod
+    def to_json(model: ModelVersionModel, include_schema: bool = False) -> ModelVersionResponse:
+        return ModelVersionResponse(
+            name=model.name,
+            version=model.version,
+            active=bool(model.active),
+            metrics=json.loads(model.metrics) if model.metrics else None,
+            feature_schema=json.loads(model.feature_schema) if include_schema and model.feature_schema else None,
+            training_job_id=model.training_job_id,
+            description=model.description,
+            created_at=model.created_at,
+            activated_at=model.activated_at
+        )
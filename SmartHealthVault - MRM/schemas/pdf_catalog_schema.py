@@ -0,0 +1,24 @@
+from models.pdf_catalog_model import PdfCatalogModel
+from parsers.pdf_catalog_parser import PdfCatalogEntry
+from datetime import datetime
+from typing import Optional
+import os
+
+class PdfCatalogParser:
+    @staticmethod
+    def parse_file(path: str, size: int, page_count: Optional[int], sha256: Optional[str] = None,
+                   filename: Optional[str] = None, created_at: Optional[datetime] = None) -> PdfCatalogModel:
+        # the pdf_id is the file stem: the content hash for blobs, the upload uuid for legacy files
+        return PdfCatalogModel(
+            id=os.path.splitext(os.path.basename(path))[0],
+            sha256=sha256,
+            path=path,
+            filename=filename or os.path.basename(path),
+            size=size,
+            page_count=page_count,
+            created_at=created_at or datetime.utcnow()
+        )
+
+    @staticmethod
+    def to_json(entry: PdfCatalogModel) -> PdfCatalogEntry:
+        return PdfCatalogEntry.model_validate(entry)
@@ -1,5 +1,5 @@
 from models.record_model import RecordModel
-from parsers.record_parser import RecordCreate, RecordResponse
+from parsers.record_parser import RecordCreate, RecordResponse, RecordSummary
 from datetime import datetime
 import json
 
@@ -18,14 +18,31 @@ class RecordParser:
         )
 
     @staticmethod
-    def to_json(record: RecordModel) -> RecordResponse:
+    def parse_metadata(record: RecordModel) -> dict:
         # Parse the extra_metadata from JSON string to dict if it exists
-        metadata = {}
         if record.extra_metadata:
             try:
-                metadata = json.loads(record.extra_metadata)
+                return json.loads(record.extra_metadata)
             except (json.JSONDecodeError, TypeError):
-                metadata = {}
+                pass
+        return {}
+
+    @staticmethod
+    def to_summary(record: RecordModel) -> RecordSummary:
+        return RecordSummary(
+            id=str(record.id),
+            user_id=record.user_id,
+            doctor_id=record.doctor_id,
+            category=record.category,
+            title=record.title,
+            file_path=record.file_path,
+            metadata=RecordParser.parse_metadata(record),
+            created_at=record.created_at
+        )
+
+    @staticmethod
+    def to_json(record: RecordModel) -> RecordResponse:
+        metadata = RecordParser.parse_metadata(record)
 
         return RecordResponse.model_validate({
             'id': str(record.id),
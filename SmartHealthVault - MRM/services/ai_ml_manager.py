@@ -1,32 +1,71 @@
+from database.base import SessionLocal
 from database.db_manager import DatabaseManager
-from database.enums import DBType
+from database.enums import DBType, JobStatus
 from schemas.ai_ml_schema import AIParser
 from parsers.ai_ml_parser import AIRequest, TrainingRequest, TrainingResponse, TrainingMetrics, WebSearchResponse, PDFAnalysisRequest, PDFAnalysisResponse
+from parsers.job_parser import JobResponse
+from parsers.model_registry_parser import ModelInfo, ModelVersionResponse
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
-from openai import OpenAI
-from ddgs import DDGS
 import os
 import json
-import fitz  # PyMuPDF
+from services.pdf_catalog_manager import PdfCatalogManager
+from services.pdf_extraction import PdfTextExtractor
+from services.model_registry import ModelRegistry
+from services.risk_model import RISK_MODEL_NAME, score_user, train_risk_model
+from services.job_engine import JobContext, JobManager, job_engine
+from services.llm_gateway import llm_gateway
+from services.llm_resilience import LLMError
+from services.search_backend import get_search_backend
+from services.single_flight import SingleFlight
+from services.summarizer import MapReduceSummarizer
 from pathlib import Path
 
+TRAINING_JOB = "training"
+PDF_ANALYSIS_JOB = "pdf_analysis"
+
+# Job statuses as reported by the training API
+TRAINING_STATUSES = {
+    JobStatus.QUEUED.value: "pending",
+    JobStatus.RUNNING.value: "training",
+    JobStatus.SUCCEEDED.value: "completed",
+    JobStatus.FAILED.value: "failed",
+    JobStatus.CANCELLED.value: "cancelled",
+}
+
+# Concurrent analysis jobs for the same PDF and options share one run
+pdf_analysis_flight = SingleFlight("ai.analyze_pdf")
+
 class AIManager:
     def __init__(self, db_session: Session):
+        self.db_session = db_session
         self.db = DatabaseManager(db_session).get_database(DBType.AI_ML_DB)
-        self.training_jobs: Dict[str, Dict[str, Any]] = {}
-        
-        # Initialize OpenAI client with API key from environment variable
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", "your-openai-api-key-here"))
+        self.pdf_catalog = PdfCatalogManager(db_session)
+        self.jobs = JobManager(db_session)
+        self.registry = ModelRegistry(db_session)
         
-        # Verify OpenAI API key is set
-        if not self.openai_client.api_key or self.openai_client.api_key == "your-openai-api-key-here":
-            print("WARNING: OpenAI API key not set. Please set the OPENAI_API_KEY environment variable.")
+        self.summarizer = MapReduceSummarizer(route="ai.analyze_pdf")
 
     def analyze(self, payload: AIRequest):
-        result = {"summary": "placeholder summary", "risk_scores": {"diabetes": 0.1}}
-        model = AIParser.parse_result(payload.user_id, result, explanation="placeholder")
+        risk_model = self.registry.load(RISK_MODEL_NAME)
+        scored = score_user(self.db_session, risk_model, payload.user_id) if risk_model else None
+        if risk_model is None:
+            result = {"summary": f"No {RISK_MODEL_NAME} has been trained yet", "risk_scores": {}}
+            explanation = f"Train one with POST /ai/train/ (model_name '{RISK_MODEL_NAME}')"
+        elif scored is None:
+            raise ValueError(f"User {payload.user_id} not found")
+        else:
+            probability, factors = scored
+            outcome = risk_model.spec.label_category or "diagnosis"
+            result = {
+                "summary": f"Estimated {outcome} risk {probability:.1%}",
+                "risk_scores": {outcome: round(probability, 4)},
+                "model": {"name": risk_model.name, "version": risk_model.version},
+            }
+            explanation = "Main factors: " + ", ".join(f"{name} ({weight:+.2f})" for name, weight in factors) \
+                if factors else "No single feature stands out"
+        model = AIParser.parse_result(payload.user_id, result, explanation=explanation)
         created = self.db.insert(model)
         return AIParser.to_response(created)
 
@@ -37,103 +76,61 @@ class AIManager:
         m = self.db.get_by_id(result_id)
         return AIParser.to_response(m) if m else None
 
-    def list_models(self) -> List[str]:
-        return ["diagnosis-risk-model", "treatment-suggestion-model"]
+    def list_models(self) -> List[ModelInfo]:
+        return self.registry.list_models()
+
+    def list_model_versions(self, name: str) -> List[ModelVersionResponse]:
+        return self.registry.list_versions(name)
+
+    def get_model_version(self, name: str, version: Optional[str] = None) -> Optional[ModelVersionResponse]:
+        return self.registry.get_version(name, version)
+
+    def activate_model_version(self, name: str, version: str) -> ModelVersionResponse:
+        """
+        Switch predictions of ``name`` to an already trained ``version``
+
+        Args:
+            name: Model name
+            version: Registered version to activate
+
+        Returns:
+            ModelVersionResponse of the now active version
+        """
+        return self.registry.activate(name, version)
 
     def train_model(self, request: TrainingRequest) -> TrainingResponse:
         """
-        Train a new model with the provided data and parameters
+        Queue training of a new model with the provided data and parameters
         
         Args:
             request: TrainingRequest containing model details, data, and parameters
             
         Returns:
-            TrainingResponse with training status and metrics
+            TrainingResponse for the queued job; poll get_training_status for progress and metrics
         """
-        import uuid
-        
-        # Generate a unique training ID
-        training_id = str(uuid.uuid4())
-        
-        # Create initial training job
-        training_job = {
-            'id': training_id,
-            'model_name': request.model_name,
-            'status': 'pending',
-            'created_at': datetime.utcnow(),
-            'request': request.dict()
-        }
-        
-        # Store the training job
-        self.training_jobs[training_id] = training_job
-        
-        # In a real implementation, you would start an async training process here
-        # For now, we'll simulate a simple training process
-        self._start_training(training_id)
-        
-        return TrainingResponse(
-            training_id=training_id,
-            model_name=request.model_name,
-            status='pending',
-            created_at=training_job['created_at']
-        )
-    
-    def _start_training(self, training_id: str):
-        import time
-        from random import random
-        
-        # Simulate training delay
-        time.sleep(2)
-        
-        job = self.training_jobs.get(training_id)
-        if not job:
-            return
-            
-        try:
-            job['status'] = 'training'
-            
-            # Simulate training time
-            time.sleep(5)
-            
-            # Generate some mock metrics
-            metrics = TrainingMetrics(
-                accuracy=0.85 + (random() * 0.1),  # 85-95%
-                precision=0.82 + (random() * 0.1),
-                recall=0.83 + (random() * 0.1),
-                f1_score=0.84 + (random() * 0.1),
-                loss=0.2 + (random() * 0.1),
-                training_time_seconds=5.0 + (random() * 2.0)
-            )
-            
-            # Update job status
-            job.update({
-                'status': 'completed',
-                'completed_at': datetime.utcnow(),
-                'metrics': metrics.dict()
-            })
-            
-        except Exception as e:
-            job.update({
-                'status': 'failed',
-                'completed_at': datetime.utcnow(),
-                'error': str(e)
-            })
+        if request.model_name != RISK_MODEL_NAME:
+            raise ValueError(f"No training engine for {request.model_name}; trainable: {RISK_MODEL_NAME}")
+        job = self.jobs.submit(TRAINING_JOB, request.model_dump())
+        return _training_response(job)
     
     def get_training_status(self, training_id: str) -> TrainingResponse:
-
-        job = self.training_jobs.get(training_id)
-        if not job:
+        job = self.jobs.get_job(training_id, include_payload=True)
+        if not job or job.kind != TRAINING_JOB:
             raise ValueError(f"No training job found with ID: {training_id}")
-            
-        return TrainingResponse(
-            training_id=job['id'],
-            model_name=job['model_name'],
-            status=job['status'],
-            metrics=job.get('metrics'),
-            created_at=job['created_at'],
-            completed_at=job.get('completed_at'),
-            error=job.get('error')
-        )
+        return _training_response(job)
+
+    def submit_pdf_analysis(self, request: PDFAnalysisRequest, status_url: Optional[str] = None) -> JobResponse:
+        """
+        Queue analyze_pdf as a background job
+
+        Args:
+            request: PDFAnalysisRequest with the PDF ID and summary options
+            status_url: Where the client can poll the job
+
+        Returns:
+            JobResponse of the queued job; its result is a PDFAnalysisResponse
+        """
+        return self.jobs.submit(PDF_ANALYSIS_JOB, request.model_dump(), status_url=status_url)
 
     def search_and_summarize(self, query: str, max_results: int = 3) -> Dict[str, Any]:
         """
@@ -152,15 +149,14 @@ class AIManager:
         # Step 1: Perform web search
         search_results = []
         try:
-            with DDGS() as ddgs:
-                search_results = [
-                    {
-                        'title': result.get('title', 'No title'),
-                        'url': result.get('href', ''),
-                        'snippet': result.get('body', '')
-                    }
-                    for result in ddgs.text(query, max_results=max_results)
-                ]
+            search_results = [
+                {
+                    'title': result.get('title', 'No title'),
+                    'url': result.get('href', ''),
+                    'snippet': result.get('body', '')
+                }
+                for result in get_search_backend().text(query, max_results=max_results)
+            ]
         except Exception as e:
             raise Exception(f"Error performing web search: {str(e)}")
         
@@ -180,25 +176,14 @@ class AIManager:
                 for i, res in enumerate(search_results)
             )
             
-            # Call OpenAI API
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes search results. Provide a concise and informative summary based on the following sources:"
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Query: {query}\n\nSources:\n{context}"
-                    }
-                ],
+            # Shared gateway: pooled connections, bounded in-flight calls
+            summary = llm_gateway.complete_sync(
+                "You are a helpful assistant that summarizes search results. Provide a concise and informative summary based on the following sources:",
+                f"Query: {query}\n\nSources:\n{context}",
                 max_tokens=500,
-                temperature=0.3
+                route="ai.search",
             )
             
-            summary = response.choices[0].message.content.strip()
-            
             # Prepare response
             return {
                 'query': query,
@@ -241,8 +226,9 @@ class AIManager:
             PDFAnalysisResponse with the analysis results
         """
         try:
-            # Construct the path to the PDF file
-            pdf_path = Path("uploads") / "raw" / "pdfs" / f"{request.pdf_id}.pdf"
+            # Resolve through the catalog, falling back to the legacy upload location
+            catalog_path = self.pdf_catalog.resolve_path(request.pdf_id)
+            pdf_path = Path(catalog_path) if catalog_path else Path("uploads") / "raw" / "pdfs" / f"{request.pdf_id}.pdf"
             
             if not pdf_path.exists():
                 # Try with different extensions if needed
@@ -276,6 +262,9 @@ class AIManager:
                 created_at=datetime.utcnow()
             )
             
+        except LLMError:
+            # provider trouble is not a property of the document: 503/504, or a failed job
+            raise
         except Exception as e:
             return PDFAnalysisResponse(
                 pdf_id=request.pdf_id,
@@ -296,23 +285,10 @@ class AIManager:
         Returns:
             tuple of (extracted_text, page_count, title)
         """
-        text = ""
-        title = ""
-        
         try:
-            with fitz.open(pdf_path) as doc:
-                page_count = len(doc)
-                
-                # Try to get document title from metadata
-                meta = doc.metadata
-                title = meta.get('title', '').strip()
-                
-                # Extract text from each page
-                for page_num in range(page_count):
-                    page = doc.load_page(page_num)
-                    text += page.get_text() + "\n\n"
-                
-                return text.strip(), page_count, title
+            # Shared extraction engine; repeat analyses are served from uploads/processed
+            with PdfTextExtractor().extract(str(pdf_path)) as doc:
+                return doc.text("\n\n").strip(), doc.page_count, doc.title
                 
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
@@ -347,20 +323,10 @@ class AIManager:
             if include_key_points:
                 system_prompt += " Also extract 3-5 key points from the text."
             
-            user_prompt = f"Text to summarize:\n\n{text[:12000]}"  # Limit context window
-            
-            # Call OpenAI API
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.3
-            )
-            
-            result = response.choices[0].message.content
+            # Long documents are condensed chunk by chunk first instead of being truncated
+            result = self.summarizer.summarize(
+                text, system_prompt, max_tokens, instruction="Text to summarize:\n\n"
+            ).summary
             
             # Parse the response to separate summary and key points if needed
             summary = result
@@ -375,5 +341,48 @@ class AIManager:
             
             return summary, key_points
             
+        except LLMError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
+
+
+def _training_response(job: JobResponse) -> TrainingResponse:
+    result = job.result or {}
+    return TrainingResponse(
+        training_id=job.id,
+        model_name=(job.payload or {}).get("model_name", ""),
+        status=TRAINING_STATUSES.get(job.status, job.status),
+        progress=job.progress,
+        metrics=result.get("metrics"),
+        created_at=job.created_at,
+        completed_at=job.finished_at,
+        error=job.error
+    )
+
+
+def run_training_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Job handler: train a new version of the requested model, reporting progress as it goes"""
+    request = TrainingRequest(**payload)
+    if request.model_name != RISK_MODEL_NAME:
+        raise ValueError(f"No training engine for {request.model_name}; trainable: {RISK_MODEL_NAME}")
+    result = train_risk_model(request.training_data, request.parameters, progress=ctx.progress,
+                              training_job_id=ctx.job_id, description=request.description)
+    result["metrics"] = TrainingMetrics(**result["metrics"]).model_dump()
+    return result
+
+
+def run_pdf_analysis_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """Job handler: AIManager.analyze_pdf; an analysis error fails the job"""
+    request = PDFAnalysisRequest(**payload)
+    ctx.progress(0.1, "Extracting and summarizing")
+    with SessionLocal() as session:
+        key = (request.pdf_id, request.summary_length, request.include_key_points)
+        response = pdf_analysis_flight.do(key, AIManager(session).analyze_pdf, request)
+    if response.error:
+        raise RuntimeError(response.error)
+    return response.model_dump(mode="json")
+
+
+job_engine.register(TRAINING_JOB, run_training_job)
+job_engine.register(PDF_ANALYSIS_JOB, run_pdf_analysis_job)
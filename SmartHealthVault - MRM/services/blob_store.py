@@ -0,0 +1,164 @@
+import os
+import re
+from dataclasses import replace
+from typing import List, Optional
+
+import anyio
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_manager import AsyncDatabaseManager, DatabaseManager
+from database.enums import DBType
+
+BLOB_ROOT = os.getenv("BLOB_STORE_DIR", "./uploads/blobs")
+STAGING_DIR = os.path.join(BLOB_ROOT, "tmp")
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+# suffix of a blob whose last reference was dropped in a not yet committed transaction
+TOMBSTONE_SUFFIX = ".deleting"
+
+
+def blob_path(sha256: str, extension: str = "", root: str = BLOB_ROOT) -> str:
+    """``<root>/ab/cd/abcd...<ext>``: two fan-out levels keep directories small"""
+    return os.path.join(root, sha256[:2], sha256[2:4], f"{sha256}{extension}")
+
+
+def sha256_from_path(path: Optional[str], root: str = BLOB_ROOT) -> Optional[str]:
+    """The content hash when ``path`` is a blob in this store, else None (e.g. legacy uploads)"""
+    if not path:
+        return None
+    name, _ = os.path.splitext(os.path.basename(path))
+    if not _SHA256.match(name):
+        return None
+    if os.path.normpath(os.path.abspath(path)) != os.path.normpath(
+        os.path.abspath(blob_path(name, os.path.splitext(path)[1], root))
+    ):
+        return None
+    return name
+
+
+class AsyncBlobStore:
+    """
+    Content-addressed file store for uploads.
+
+    Identical content is stored once; the ``blobs`` table counts how many
+    records reference it, and the file is unlinked only when the last
+    reference is released. Until the release commits, the file is only
+    renamed to a tombstone, so a rolled-back release puts it back.
+    """
+
+    def __init__(self, db_session: AsyncSession, root: str = BLOB_ROOT):
+        self.db = AsyncDatabaseManager(db_session).get_database(DBType.BLOB_DB)
+        self.root = root
+        self._tombstones: List[str] = []
+
+    async def put(self, stored):
+        """
+        Move a staged upload into the store and take a reference to it
+
+        Args:
+            stored: StoredUpload from the upload pipeline, pointing at a staged file
+
+        Returns:
+            The same StoredUpload with ``path`` set to the blob path
+        """
+        path = blob_path(stored.sha256, os.path.splitext(stored.path)[1], self.root)
+        staged = anyio.Path(stored.path)
+        try:
+            await self.db.add_ref(stored.sha256, path, stored.size, stored.mime_type)
+            if await anyio.Path(path).exists():
+                # already stored: the staged copy is redundant
+                await staged.unlink(missing_ok=True)
+            else:
+                await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+                await staged.rename(path)
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            await staged.unlink(missing_ok=True)
+            raise
+        return replace(stored, path=path)
+
+    async def release(self, path: Optional[str], commit: bool = True) -> bool:
+        """
+        Drop one reference to the blob at ``path``
+
+        Args:
+            path: Blob path the reference was taken for
+            commit: False to leave the transaction open, so the caller can
+                commit the release together with its own change (e.g. deleting
+                the record that held the reference) through ``commit`` /
+                ``rollback`` of this store
+
+        Returns:
+            True if that was the last reference and the file is (once committed) removed
+        """
+        sha256 = sha256_from_path(path, self.root)
+        if sha256 is None:
+            return False
+        try:
+            last_path = await self.db.drop_ref(sha256)
+            if last_path is not None and await anyio.Path(last_path).exists():
+                # renamed while the row lock is held; unlinked only once the release commits
+                await anyio.Path(last_path).rename(last_path + TOMBSTONE_SUFFIX)
+                self._tombstones.append(last_path)
+            if commit:
+                await self.commit()
+        except BaseException:
+            await self.rollback()
+            raise
+        return last_path is not None
+
+    async def commit(self) -> None:
+        """Commit the session's transaction, then delete the released files"""
+        await self.db.commit()
+        tombstones, self._tombstones = self._tombstones, []
+        for path in tombstones:
+            await anyio.Path(path + TOMBSTONE_SUFFIX).unlink(missing_ok=True)
+
+    async def rollback(self) -> None:
+        """Roll back the session's transaction and restore the files released in it"""
+        await self.db.rollback()
+        tombstones, self._tombstones = self._tombstones, []
+        for path in tombstones:
+            await anyio.Path(path + TOMBSTONE_SUFFIX).rename(path)
+
+
+class BlobStore:
+    """Synchronous counterpart of AsyncBlobStore for ``def`` routes"""
+
+    def __init__(self, db_session: Session, root: str = BLOB_ROOT):
+        self.db = DatabaseManager(db_session).get_database(DBType.BLOB_DB)
+        self.root = root
+        self._tombstones: List[str] = []
+
+    def release(self, path: Optional[str], commit: bool = True) -> bool:
+        sha256 = sha256_from_path(path, self.root)
+        if sha256 is None:
+            return False
+        try:
+            last_path = self.db.drop_ref(sha256)
+            if last_path is not None and os.path.exists(last_path):
+                os.replace(last_path, last_path + TOMBSTONE_SUFFIX)
+                self._tombstones.append(last_path)
+            if commit:
+                self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+        return last_path is not None
+
+    def commit(self) -> None:
+        self.db.commit()
+        tombstones, self._tombstones = self._tombstones, []
+        for path in tombstones:
+            try:
+                os.remove(path + TOMBSTONE_SUFFIX)
+            except FileNotFoundError:
+                pass
+
+    def rollback(self) -> None:
+        self.db.rollback()
+        tombstones, self._tombstones = self._tombstones, []
+        for path in tombstones:
+            os.replace(path + TOMBSTONE_SUFFIX, path)
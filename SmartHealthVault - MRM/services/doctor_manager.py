@@ -1,8 +1,9 @@
 from database.db_manager import DatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.doctor_schema import DoctorParser
 from parsers.doctor_parser import DoctorCreate
-from typing import List
+from typing import Optional
 from sqlalchemy.orm import Session
 
 class DoctorManager:
@@ -18,7 +19,7 @@ class DoctorManager:
         m = self.db.get_by_id(doctor_id)
         return DoctorParser.to_json(m) if m else None
 
-    def list_doctors(self, specialization: str = None):
+    def list_doctors(self, specialization: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
         filters = {"specialization": specialization} if specialization else None
-        rows = self.db.list_all(filters)
-        return [DoctorParser.to_json(r) for r in rows]
+        page = self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([DoctorParser.to_json(r) for r in page.items], page.next_cursor)
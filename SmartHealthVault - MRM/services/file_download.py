@@ -0,0 +1,87 @@
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+# Only files under the upload tree are ever served, whatever a record's file_path says
+DOWNLOAD_ROOT = os.path.abspath("./uploads")
+# Records are private; clients may keep a copy but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def resolve_download_path(file_path: Optional[str]) -> Optional[str]:
+    """The absolute path of a servable upload, or None if it is missing or outside the upload tree"""
+    if not file_path:
+        return None
+    path = os.path.abspath(file_path)
+    if not path.startswith(DOWNLOAD_ROOT + os.sep) or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+def not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def file_download_response(
+    request: Request,
+    path: str,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    sha256: Optional[str] = None,
+) -> Response:
+    """
+    Serve a stored file with conditional GET and byte-range support
+
+    Args:
+        request: The incoming request (for If-None-Match / If-Modified-Since)
+        path: Absolute path of the file to serve
+        media_type: Content type; guessed from the file name if not given
+        filename: Name offered to the client in Content-Disposition
+        sha256: Content hash, used as a strong ETag when known
+
+    Returns:
+        304 when the client's copy is current, otherwise a FileResponse.
+        FileResponse streams the file in chunks, answers Range requests
+        with 206 (honouring If-Range), and uses the ASGI pathsend extension
+        for zero-copy sends on servers that support it.
+    """
+    stat = os.stat(path)
+    if sha256:
+        etag = f'"{sha256}"'
+    else:
+        etag = '"{}"'.format(hashlib.md5(f"{stat.st_mtime}-{stat.st_size}".encode(), usedforsecurity=False).hexdigest())
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat.st_mtime, usegmt=True),
+        "cache-control": CACHE_CONTROL,
+    }
+    if not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat,
+        content_disposition_type="inline",
+    )
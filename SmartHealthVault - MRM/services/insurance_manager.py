@@ -1,5 +1,6 @@
 from database.db_manager import DatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.insurance_schema import InsuranceParser
 from parsers.insurance_parser import PolicyCreate, ClaimCreate, ClaimResponse
 from typing import List, Optional, Dict, Any
@@ -18,9 +19,9 @@ class InsuranceManager:
         p = self.db.get_by_id(policy_id)
         return InsuranceParser.to_policy_response(p) if p else None
 
-    def list_policies_for_patient(self, patient_id: str):
-        rows = self.db.list_all({"patient_id": patient_id})
-        return [InsuranceParser.to_policy_response(r) for r in rows]
+    def list_policies_for_patient(self, patient_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = self.db.list_page({"patient_id": patient_id}, limit=limit, cursor=cursor)
+        return Page([InsuranceParser.to_policy_response(r) for r in page.items], page.next_cursor)
 
     def submit_claim(self, payload: ClaimCreate):
         claim = InsuranceParser.parse_claim(payload)
@@ -0,0 +1,325 @@
+import contextvars
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from database.base import SessionLocal
+from database.db_manager import DatabaseManager
+from database.enums import DBType, JobStatus
+from database.pagination import DEFAULT_PAGE_SIZE, Page
+from parsers.job_parser import JobResponse
+from schemas.job_schema import JobParser
+from services.llm_usage import UsageContext, current_usage, set_usage_context
+from services.rate_limiter import rate_limiter
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))                     # jobs run concurrently per process
+JOB_EXECUTOR = os.getenv("JOB_EXECUTOR", "thread").strip().lower()  # default for handlers: thread | process
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))     # idle workers look for new jobs this often
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", 5.0))
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", 60.0))        # no heartbeat for this long: the worker is gone
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_CANCEL_CHECK_INTERVAL = float(os.getenv("JOB_CANCEL_CHECK_INTERVAL", 1.0))
+
+JobHandlerFn = Callable[[Dict[str, Any], "JobContext"], Any]
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once its job was cancelled (or taken away from this worker)"""
+
+
+@dataclass
+class JobHandler:
+    fn: JobHandlerFn
+    executor: str  # thread | process
+
+
+@dataclass
+class ClaimedJob:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    user_id: Optional[str]
+    endpoint: Optional[str]
+
+
+class JobContext:
+    """
+    Handed to a job handler. ``progress`` records how far the job got and
+    doubles as a cancellation point; long loops without progress updates
+    should call ``check_cancelled``. Both raise JobCancelled when the job
+    was cancelled or is no longer owned by this worker.
+    """
+
+    def __init__(self, job_id: str, worker: str, session_factory: Callable[[], Session] = SessionLocal):
+        self.job_id = job_id
+        self.worker = worker
+        self.session_factory = session_factory
+        self._last_check = 0.0
+
+    def _db(self, session: Session):
+        return DatabaseManager(session).get_database(DBType.JOB_DB)
+
+    def progress(self, fraction: Optional[float] = None, message: Optional[str] = None) -> None:
+        with self.session_factory() as session:
+            db = self._db(session)
+            if fraction is not None:
+                fraction = min(max(float(fraction), 0.0), 1.0)
+            if not db.update_progress(self.job_id, self.worker, fraction, message) or db.cancel_requested(self.job_id):
+                raise JobCancelled(self.job_id)
+        self._last_check = time.monotonic()
+
+    def check_cancelled(self) -> None:
+        if time.monotonic() - self._last_check < JOB_CANCEL_CHECK_INTERVAL:
+            return
+        self._last_check = time.monotonic()
+        with self.session_factory() as session:
+            if self._db(session).cancel_requested(self.job_id):
+                raise JobCancelled(self.job_id)
+
+
+def _run_handler(fn: JobHandlerFn, job: ClaimedJob, worker: str,
+                 on_tokens: Optional[Callable[[int], None]] = None) -> Any:
+    """Run one handler in a fresh context whose LLM calls are billed to the submitting user"""
+    def run():
+        set_usage_context(UsageContext(job.user_id, job.endpoint, on_tokens=on_tokens))
+        return fn(job.payload, JobContext(job.id, worker))
+    return contextvars.Context().run(run)
+
+
+class JobEngine:
+    """
+    Runs queued jobs from the ``jobs`` table on worker threads in this
+    process. Jobs are claimed with a conditional UPDATE, so several
+    processes sharing the database can run engines side by side; each
+    only claims the kinds it has handlers for. A handler runs on the
+    worker thread, or in a spawned process for CPU-bound work.
+
+    Running jobs are heartbeated; a job whose worker stopped (crash,
+    restart) is requeued once its heartbeat is JOB_STALE_AFTER old, and
+    failed after JOB_MAX_ATTEMPTS. Jobs held at a clean shutdown are
+    requeued immediately.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, session_factory: Callable[[], Session] = SessionLocal):
+        self.workers = workers
+        self.session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, JobHandler] = {}
+        self._running: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.counts: Dict[str, int] = {s.value: 0 for s in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)}
+        self.recovered = 0
+
+    # --- registration / submission ------------------------------------------
+
+    def register(self, kind: str, fn: JobHandlerFn, executor: Optional[str] = None) -> None:
+        """
+        Make this engine run jobs of ``kind``
+
+        Args:
+            kind: Job kind, stored on each job row
+            fn: ``fn(payload, ctx) -> result``; the result must be JSON-serializable.
+                Must be a module-level function when run in a process
+            executor: "thread" or "process"; JOB_EXECUTOR if not given
+        """
+        executor = executor or JOB_EXECUTOR
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown job executor: {executor}")
+        self.handlers[kind] = JobHandler(fn, executor)
+
+    def notify(self) -> None:
+        """Wake an idle worker, e.g. right after a job was queued"""
+        self._wake.set()
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self._recover()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        monitor = threading.Thread(target=self._monitor, name="job-monitor", daemon=True)
+        monitor.start()
+        self._threads.append(monitor)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop taking jobs; jobs still running after ``timeout`` are requeued for the next start"""
+        if not self._threads:
+            return
+        self._stop.set()
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self._threads = []
+        with self.session_factory() as session:
+            released = DatabaseManager(session).get_database(DBType.JOB_DB).release(self.worker_id)
+        if released:
+            print(f"WARNING: requeued {released} unfinished job(s) at shutdown")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            running = len(self._running)
+            finished = dict(self.counts)
+        return {
+            "worker": self.worker_id,
+            "started": bool(self._threads),
+            "workers": self.workers,
+            "kinds": {kind: h.executor for kind, h in self.handlers.items()},
+            "running": running,
+            "finished": finished,
+            "recovered": self.recovered,
+        }
+
+    # --- internals ---------------------------------------------------------
+
+    def _db(self, session: Session):
+        return DatabaseManager(session).get_database(DBType.JOB_DB)
+
+    def _recover(self) -> None:
+        stale_before = datetime.utcnow() - timedelta(seconds=JOB_STALE_AFTER)
+        with self.session_factory() as session:
+            requeued, failed = self._db(session).recover_stale(stale_before, JOB_MAX_ATTEMPTS)
+        if requeued or failed:
+            self.recovered += requeued + failed
+            print(f"WARNING: recovered jobs of stopped workers: {requeued} requeued, {failed} failed")
+            self._wake.set()
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                with self._lock:
+                    running = list(self._running)
+                with self.session_factory() as session:
+                    self._db(session).heartbeat(running, self.worker_id)
+                self._recover()
+            except Exception as e:
+                print(f"WARNING: job monitor failed: {e}")
+
+    def _claim(self) -> Optional[ClaimedJob]:
+        with self.session_factory() as session:
+            job = self._db(session).claim_next(self.handlers, self.worker_id)
+            if job is None:
+                return None
+            return ClaimedJob(job.id, job.kind, json.loads(job.payload or "{}"), job.user_id, job.endpoint)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"WARNING: could not claim a job: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(JOB_POLL_INTERVAL)
+                self._wake.clear()
+                continue
+            try:
+                self._run(job)
+            except Exception as e:
+                # e.g. the database was locked when recording the outcome; stale recovery requeues the job
+                print(f"WARNING: could not finish job {job.id}: {e}")
+
+    def _run(self, job: ClaimedJob) -> None:
+        handler = self.handlers[job.kind]
+        with self._lock:
+            self._running.add(job.id)
+        result = error = None
+        try:
+            if handler.executor == "process":
+                result = self._process_pool().submit(_run_handler, handler.fn, job, self.worker_id).result()
+            else:
+                charge = partial(rate_limiter.charge, job.user_id, job.endpoint) if job.user_id else None
+                result = _run_handler(handler.fn, job, self.worker_id, on_tokens=charge)
+            status = JobStatus.SUCCEEDED
+        except JobCancelled:
+            status = JobStatus.CANCELLED
+        except BrokenProcessPool as e:
+            self._pool = None  # a worker process died; start a fresh pool for the next job
+            status, error = JobStatus.FAILED, f"Job process died: {e}"
+        except Exception as e:
+            status, error = JobStatus.FAILED, f"{type(e).__name__}: {e}"
+        finally:
+            with self._lock:
+                self._running.discard(job.id)
+        try:
+            encoded = json.dumps(result, default=str) if result is not None else None
+        except (TypeError, ValueError) as e:
+            status, encoded, error = JobStatus.FAILED, None, f"Job result is not JSON-serializable: {e}"
+        with self.session_factory() as session:
+            # a job requeued or reassigned meanwhile is no longer ours to finish
+            if self._db(session).finish(job.id, self.worker_id, status, encoded, error):
+                with self._lock:
+                    self.counts[status.value] += 1
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+
+class JobManager:
+    def __init__(self, db_session: Session, engine: Optional[JobEngine] = None):
+        self.db = DatabaseManager(db_session).get_database(DBType.JOB_DB)
+        self.engine = engine or job_engine
+
+    def submit(self, kind: str, payload: Dict[str, Any], status_url: Optional[str] = None) -> JobResponse:
+        """
+        Queue a job; it is attributed to the caller of the current request, if any
+
+        Args:
+            kind: Job kind; some running engine must have a handler for it
+            payload: JSON-serializable handler input
+            status_url: Where the client can poll the job, echoed in the response
+
+        Returns:
+            JobResponse of the queued job
+        """
+        usage = current_usage()
+        job = self.db.insert(JobParser.parse_job(
+            kind, payload, user_id=usage.user_id if usage else None, endpoint=usage.endpoint if usage else None,
+        ))
+        self.engine.notify()
+        return JobParser.to_json(job, status_url, include_payload=True)
+
+    def get_job(self, job_id: str, status_url: Optional[str] = None, include_payload: bool = False) -> Optional[JobResponse]:
+        job = self.db.get_by_id(job_id)
+        return JobParser.to_json(job, status_url, include_payload) if job else None
+
+    def list_jobs(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([JobParser.to_json(j) for j in page.items], page.next_cursor)
+
+    def cancel(self, job_id: str) -> Optional[JobResponse]:
+        job = self.db.request_cancel(job_id)
+        return JobParser.to_json(job) if job else None
+
+
+# Process-wide engine; services register their handlers on import, apps start it at startup
+job_engine = JobEngine()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from database.cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from database.engine_config import _env_int
+
+# Bump to invalidate every cached response (e.g. when the stored format changes)
+CACHE_VERSION = 1
+
+
+def fingerprint(provider: str, model: str, messages: List[Dict[str, str]],
+                max_tokens: Optional[int], temperature: float) -> str:
+    """Stable key of everything that determines a chat completion"""
+    payload = json.dumps(
+        [CACHE_VERSION, provider, model, messages, max_tokens, round(float(temperature), 4)],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LLMCacheSettings:
+    backend: str = "sqlite"  # none | memory | sqlite
+    ttl: int = 7 * 24 * 3600
+    max_entries: int = 50_000
+    max_bytes: int = 256 * 1024 * 1024
+    path: str = "./cache/llm_responses.db"
+
+    @classmethod
+    def from_env(cls) -> "LLMCacheSettings":
+        return cls(
+            backend=os.getenv("LLM_CACHE_BACKEND", cls.backend).strip().lower(),
+            ttl=_env_int("LLM_CACHE_TTL", cls.ttl),
+            max_entries=_env_int("LLM_CACHE_MAX_ENTRIES", cls.max_entries),
+            max_bytes=_env_int("LLM_CACHE_MAX_BYTES", cls.max_bytes),
+            path=os.getenv("LLM_CACHE_PATH", cls.path),
+        )
+
+    def build_backend(self) -> Optional[CacheBackend]:
+        if self.backend in ("", "none", "off"):
+            return None
+        if self.backend == "memory":
+            return MemoryCacheBackend(self.max_entries, self.max_bytes)
+        if self.backend == "sqlite":
+            return SQLiteCacheBackend(self.path, self.max_entries, self.max_bytes)
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {self.backend}")
+
+
+class LLMResponseCache:
+    """
+    Completed chat responses keyed by ``fingerprint``. Entries expire after
+    ``ttl`` seconds and the backend evicts least-recently-used ones once it
+    is over its entry or byte budget.
+
+    Token usage is split into what was actually billed (misses) and what
+    the cache saved (hits).
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.bytes_saved = 0
+        self.cached_tokens = 0
+        self.uncached_tokens = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.backend.get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += len(data)
+        response = json.loads(data)
+        with self._lock:
+            self.cached_tokens += response.get("total_tokens") or 0
+        return response
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        self.backend.set(key, json.dumps(response, separators=(",", ":")).encode("utf-8"), self.ttl)
+
+    def record_uncached(self, total_tokens: Optional[int], bypassed: bool = False) -> None:
+        with self._lock:
+            self.uncached_tokens += total_tokens or 0
+            if bypassed:
+                self.bypassed += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.backend.size()
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": entries,
+            "bytes": size,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "bytes_saved": self.bytes_saved,
+            "cached_tokens": self.cached_tokens,
+            "uncached_tokens": self.uncached_tokens,
+        }
+
+
+def build_llm_cache(settings: LLMCacheSettings) -> Optional[LLMResponseCache]:
+    backend = settings.build_backend()
+    return LLMResponseCache(backend, settings.ttl) if backend else None
@@ -0,0 +1,479 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+from openai import DEFAULT_CONNECTION_LIMITS, AsyncAzureOpenAI, AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
+
+from services.llm_cache import LLMCacheSettings, LLMResponseCache, build_llm_cache, fingerprint
+from services.llm_resilience import (
+    AttemptTimeout, CircuitBreaker, HedgePolicy, LatencyTracker, LLMTimeout, LLMUnavailable, RetryPolicy, is_retryable,
+)
+from services.llm_stub import StubChatClient
+from services.llm_usage import LLMUsageRecorder, UsageContext, current_usage, usage_recorder
+
+# Limits type of the HTTP library the installed SDK is built on
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # a user is waiting on the response
+    DEFAULT = 1
+    BACKGROUND = 2   # batch work; only runs ahead of nothing
+
+
+# Route name -> priority; override with LLM_ROUTE_PRIORITIES="route=background,..."
+ROUTE_PRIORITIES: Dict[str, Priority] = {
+    "pdf.analyze": Priority.INTERACTIVE,
+    "ai.analyze_pdf": Priority.INTERACTIVE,
+    "ai.search": Priority.INTERACTIVE,
+    "hicorebot": Priority.INTERACTIVE,
+    "summary.condense": Priority.DEFAULT,
+    "report": Priority.BACKGROUND,
+}
+
+DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gpt-3.5-turbo")
+# Route every call to one provider regardless of what the caller asked for,
+# e.g. LLM_PROVIDER=stub for offline load tests
+PROVIDER_OVERRIDE = os.getenv("LLM_PROVIDER", "").strip().lower() or None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _route_priorities() -> Dict[str, Priority]:
+    priorities = dict(ROUTE_PRIORITIES)
+    for item in os.getenv("LLM_ROUTE_PRIORITIES", "").split(","):
+        route, _, level = item.partition("=")
+        if route.strip() and level.strip():
+            priorities[route.strip()] = Priority[level.strip().upper()]
+    return priorities
+
+
+@dataclass
+class GatewaySettings:
+    max_in_flight: int = 8
+    timeout: float = 60.0
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    route_priorities: Dict[str, Priority] = field(default_factory=lambda: dict(ROUTE_PRIORITIES))
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    hedge: HedgePolicy = field(default_factory=HedgePolicy)
+    breaker_failures: int = 5
+    breaker_reset: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "GatewaySettings":
+        return cls(
+            max_in_flight=int(_env_float("LLM_MAX_IN_FLIGHT", cls.max_in_flight)),
+            timeout=_env_float("LLM_TIMEOUT", cls.timeout),
+            connect_timeout=_env_float("LLM_CONNECT_TIMEOUT", cls.connect_timeout),
+            max_connections=int(_env_float("LLM_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive=int(_env_float("LLM_MAX_KEEPALIVE", cls.max_keepalive)),
+            keepalive_expiry=_env_float("LLM_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            route_priorities=_route_priorities(),
+            retry=RetryPolicy.from_env(),
+            hedge=HedgePolicy.from_env(),
+            breaker_failures=int(_env_float("LLM_BREAKER_FAILURES", cls.breaker_failures)),
+            breaker_reset=_env_float("LLM_BREAKER_RESET", cls.breaker_reset),
+        )
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    model: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
+    latency_ms: float = 0.0
+    cached: bool = False  # served from the response cache; no tokens were billed
+
+
+class PriorityLimiter:
+    """
+    At most ``limit`` holders at a time; when full, waiters are admitted
+    lowest priority value first, FIFO within a priority. Must be used from
+    a single event loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int = Priority.DEFAULT) -> None:
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # the slot was handed over just as we were cancelled
+            raise
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free and nobody is waiting for it"""
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        while self._waiters:
+            *_, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # hand the slot over; in_flight is unchanged
+                return
+        self.in_flight -= 1
+
+
+def _openai_client(http_client: Any) -> AsyncOpenAI:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("WARNING: OPENAI_API_KEY environment variable is not set")
+    # retries are the gateway's job (RetryPolicy), not the SDK's
+    return AsyncOpenAI(api_key=api_key or "missing", base_url=os.getenv("OPENAI_BASE_URL") or None,
+                       http_client=http_client, max_retries=0)
+
+
+def _azure_client(http_client: Any) -> AsyncAzureOpenAI:
+    return AsyncAzureOpenAI(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2025-01-01-preview"),
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+PROVIDERS: Dict[str, Callable[[Any], Any]] = {
+    "openai": _openai_client,
+    "azure": _azure_client,
+    "stub": StubChatClient,
+}
+
+
+class LLMGateway:
+    """
+    The one way this process talks to an LLM.
+
+    All calls run on a private event loop thread, so sync callers (``def``
+    routes, worker threads) and async routes share the same clients,
+    keep-alive connection pool and in-flight limit. Async callers await the
+    result without blocking their own loop; sync callers block only their
+    own thread. Calls beyond ``max_in_flight`` queue by route priority, and
+    every call has a deadline that includes its time in the queue.
+    """
+
+    def __init__(self, settings: Optional[GatewaySettings] = None, cache: Optional[LLMResponseCache] = None,
+                 usage: Optional[LLMUsageRecorder] = None):
+        self.settings = settings or GatewaySettings.from_env()
+        self.cache = cache
+        self.usage = usage
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._limiter = PriorityLimiter(self.settings.max_in_flight)
+        self._http = None
+        self._clients: Dict[str, Any] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.tokens = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def priority_for(self, route: Optional[str]) -> Priority:
+        return self.settings.route_priorities.get(route or "", Priority.DEFAULT)
+
+    # --- async API -------------------------------------------------------
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.3,
+        route: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        provider: str = "openai",
+        cache: bool = True,
+    ) -> LLMResponse:
+        """
+        Run a chat completion through the shared client
+
+        Args:
+            messages: Chat messages
+            model: Model (or Azure deployment) name; LLM_DEFAULT_MODEL if not given
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+            route: Caller name, used to look up the priority
+            priority: Explicit priority, overriding the route's
+            timeout: Deadline in seconds, queueing included; LLM_TIMEOUT if not given
+            provider: Key of PROVIDERS; LLM_PROVIDER, when set, takes precedence
+            cache: False to skip the response cache lookup, e.g. when a fresh
+                sample is wanted; the new response still replaces the cached one
+
+        Returns:
+            LLMResponse with the completion text and token usage
+
+        Raises:
+            LLMTimeout: If the deadline passed
+            LLMUnavailable: If the provider's circuit breaker is open
+        """
+        future = self.submit(self._chat(
+            messages, model=model, max_tokens=max_tokens, temperature=temperature,
+            route=route, priority=priority, timeout=timeout, provider=provider, cache=cache,
+            usage_context=current_usage(),
+        ))
+        return await asyncio.wrap_future(future)
+
+    async def complete(self, system: str, user: str, max_tokens: Optional[int] = None, **kwargs) -> str:
+        return (await self.chat(_messages(system, user), max_tokens=max_tokens, **kwargs)).text
+
+    # --- sync facade -----------------------------------------------------
+
+    def chat_sync(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Blocking ``chat`` for code that is not running on an event loop"""
+        return self.submit(self._chat(messages, usage_context=current_usage(), **kwargs)).result()
+
+    def complete_sync(self, system: str, user: str, max_tokens: Optional[int] = None, **kwargs) -> str:
+        return self.chat_sync(_messages(system, user), max_tokens=max_tokens, **kwargs).text
+
+    def completion(self, route: Optional[str] = None, **kwargs) -> Callable[[str, str, int], str]:
+        """A blocking (system, user, max_tokens) -> text callable, e.g. for MapReduceSummarizer"""
+        def complete(system: str, user: str, max_tokens: int) -> str:
+            return self.complete_sync(system, user, max_tokens, route=route, **kwargs)
+        return complete
+
+    # --- lifecycle / introspection ----------------------------------------
+
+    def submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self._limiter.limit,
+            "in_flight": self._limiter.in_flight,
+            "queued": self._limiter.queued,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "total_tokens": self.tokens,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "breakers": {name: b.snapshot() for name, b in self._breakers.items()},
+            "response_cache": self.cache.stats() if self.cache else None,
+            "usage_ledger": self.usage.stats() if self.usage else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=10)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+        if self.usage:
+            self.usage.close()  # write out buffered ledger rows
+
+    # --- internals -------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _client(self, provider: str):
+        # only ever called on the gateway loop, so no locking is needed
+        if provider not in self._clients:
+            if self._http is None:
+                s = self.settings
+                self._http = DefaultAsyncHttpxClient(
+                    limits=Limits(
+                        max_connections=s.max_connections,
+                        max_keepalive_connections=s.max_keepalive,
+                        keepalive_expiry=s.keepalive_expiry,
+                    ),
+                    timeout=Timeout(s.timeout, connect=s.connect_timeout),
+                )
+            self._clients[provider] = PROVIDERS[provider](self._http)
+        return self._clients[provider]
+
+    async def _chat(self, messages, model=None, max_tokens=None, temperature=0.3, route=None,
+                    priority=None, timeout=None, provider="openai", cache=True,
+                    usage_context: Optional[UsageContext] = None) -> LLMResponse:
+        timeout = timeout or self.settings.timeout
+        priority = self.priority_for(route) if priority is None else priority
+        model = model or DEFAULT_MODEL
+        provider = PROVIDER_OVERRIDE or provider
+        start = time.perf_counter()
+        key = fingerprint(provider, model, messages, max_tokens, temperature) if self.cache else None
+        if key and cache:
+            # disk I/O stays off the gateway loop
+            hit = await asyncio.to_thread(self.cache.get, key)
+            if hit is not None:
+                return LLMResponse(**hit, cached=True, latency_ms=(time.perf_counter() - start) * 1000)
+
+        params: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        self.calls += 1
+        try:
+            async with asyncio.timeout(timeout):
+                response = await self._call_with_retries(provider, params, route, priority)
+        except TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeout(f"LLM call for {route or 'unnamed route'} exceeded {timeout:g}s")
+        except LLMUnavailable:
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens:
+            self.tokens += usage.total_tokens
+        result = LLMResponse(
+            text=(response.choices[0].message.content or "").strip(),
+            model=getattr(response, "model", model),
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            total_tokens=getattr(usage, "total_tokens", None),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+        if self.usage:
+            # captured on the caller's side: this coroutine runs on the gateway loop
+            self.usage.record(
+                usage_context, provider, route, result.model,
+                result.prompt_tokens or 0, result.completion_tokens or 0, result.latency_ms,
+            )
+        if key:
+            self.cache.record_uncached(result.total_tokens, bypassed=not cache)
+            stored = {k: v for k, v in asdict(result).items() if k not in ("cached", "latency_ms")}
+            await asyncio.to_thread(self.cache.put, key, stored)
+        return result
+
+    def _breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(
+                provider, self.settings.breaker_failures, self.settings.breaker_reset
+            )
+        return self._breakers[provider]
+
+    async def _call_with_retries(self, provider, params, route, priority):
+        policy = self.settings.retry
+        breaker = self._breaker(provider)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_call()
+            try:
+                response = await self._attempt(provider, params, route, priority)
+            except asyncio.CancelledError:
+                breaker.release_trial()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()  # the provider answered; the request itself was bad
+                    raise
+                breaker.record_failure()
+                if attempt >= policy.max_attempts:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(policy.backoff(attempt, e))
+                continue
+            breaker.record_success()
+            return response
+
+    async def _attempt(self, provider, params, route, priority):
+        """One attempt: a queued slot, plus a hedge on a spare slot if the route allows it"""
+        await self._limiter.acquire(priority)
+        try:
+            tracker = self._latency.setdefault(route or "", LatencyTracker())
+            primary = asyncio.ensure_future(self._create(provider, params, tracker))
+            tasks = {primary}
+            hedge = None
+            try:
+                delay = self.settings.hedge.delay(route, tracker)
+                if delay is not None:
+                    done, _ = await asyncio.wait(tasks, timeout=delay)
+                    if not done and self._limiter.try_acquire():
+                        self.hedges += 1
+                        hedge = asyncio.ensure_future(self._create(provider, params, tracker))
+                        hedge.add_done_callback(lambda _: self._limiter.release())
+                        tasks.add(hedge)
+                error = None
+                while tasks:
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is hedge:
+                                self.hedge_wins += 1
+                            return task.result()
+                        error = task.exception()
+                raise error
+            finally:
+                for task in (primary, hedge):
+                    if task is not None and not task.done():
+                        task.cancel()
+        finally:
+            self._limiter.release()
+
+    async def _create(self, provider, params, tracker: LatencyTracker):
+        start = time.perf_counter()
+        attempt_timeout = self.settings.retry.attempt_timeout
+        try:
+            async with asyncio.timeout(attempt_timeout):
+                response = await self._client(provider).chat.completions.create(**params)
+        except TimeoutError:
+            raise AttemptTimeout(f"attempt exceeded {attempt_timeout:g}s")
+        tracker.record(time.perf_counter() - start)
+        return response
+
+    async def _aclose(self) -> None:
+        self._clients.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def _messages(system: str, user: str) -> List[Dict[str, str]]:
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": user})
+    return messages
+
+
+# Process-wide instance; the loop thread and clients start on first use
+llm_gateway = LLMGateway(cache=build_llm_cache(LLMCacheSettings.from_env()), usage=usage_recorder)
@@ -0,0 +1,199 @@
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+import openai
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class LLMError(Exception):
+    """Base class for failures of the LLM call layer itself (not of the prompt)"""
+
+
+class LLMTimeout(LLMError, TimeoutError):
+    """The call (queueing and retries included) did not finish within its deadline"""
+
+
+class LLMUnavailable(LLMError):
+    """The provider's circuit breaker is open; the call was not attempted"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"LLM provider {provider} is unavailable; retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class AttemptTimeout(Exception):
+    """One attempt exceeded LLM_ATTEMPT_TIMEOUT; retried like a network error"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient provider trouble: worth retrying, and counted by the circuit breaker"""
+    if isinstance(error, (AttemptTimeout, openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500 or error.status_code == 408
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 4.0
+    attempt_timeout: Optional[float] = None  # None: bounded only by the call deadline
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        attempt_timeout = _env_float("LLM_ATTEMPT_TIMEOUT", 0)
+        return cls(
+            max_attempts=max(1, int(_env_float("LLM_RETRY_ATTEMPTS", cls.max_attempts))),
+            base_delay=_env_float("LLM_RETRY_BASE_DELAY", cls.base_delay),
+            max_delay=_env_float("LLM_RETRY_MAX_DELAY", cls.max_delay),
+            attempt_timeout=attempt_timeout or None,
+        )
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(delay, _retry_after(error) or 0)
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker. ``failure_threshold`` consecutive transient
+    failures open it; while open, calls fail immediately with
+    LLMUnavailable. After ``reset_after`` seconds one trial call is let
+    through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, provider: str, failure_threshold: int = 5, reset_after: float = 30.0):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise LLMUnavailable unless a call may go out now"""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_after:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise LLMUnavailable(self.provider, self.retry_after())
+
+    def retry_after(self) -> float:
+        return max(self.reset_after - (time.monotonic() - self.opened_at), 1.0)
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """The half-open trial ended without a verdict (e.g. cancelled)"""
+        self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 1) if self.state == self.OPEN else None,
+        }
+
+
+class LatencyTracker:
+    """Recent successful-call latencies of one route, for the hedging threshold"""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 20) -> Optional[float]:
+        if len(self.samples) < min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+@dataclass
+class HedgePolicy:
+    routes: frozenset = frozenset()  # "*" for every route
+    percentile: float = 0.95
+    min_delay: float = 0.5
+    min_samples: int = 20
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        routes = os.getenv("LLM_HEDGE_ROUTES", "")
+        return cls(
+            routes=frozenset(r.strip() for r in routes.split(",") if r.strip()),
+            percentile=_env_float("LLM_HEDGE_PERCENTILE", cls.percentile),
+            min_delay=_env_float("LLM_HEDGE_MIN_DELAY", cls.min_delay),
+            min_samples=int(_env_float("LLM_HEDGE_MIN_SAMPLES", cls.min_samples)),
+        )
+
+    def enabled_for(self, route: Optional[str]) -> bool:
+        return "*" in self.routes or (route or "") in self.routes
+
+    def delay(self, route: Optional[str], tracker: LatencyTracker) -> Optional[float]:
+        """Seconds to wait before hedging, or None to never hedge this call"""
+        if not self.enabled_for(route):
+            return None
+        threshold = tracker.percentile(self.percentile, self.min_samples)
+        return None if threshold is None else max(threshold, self.min_delay)
+
+
+async def llm_error_handler(request: Request, exc: LLMError) -> JSONResponse:
+    """503 (with Retry-After) while a provider is unavailable, 504 when a call timed out"""
+    if isinstance(exc, LLMUnavailable):
+        return JSONResponse(
+            status_code=503, content={"detail": str(exc)},
+            headers={"Retry-After": str(int(exc.retry_after + 0.999))},
+        )
+    if isinstance(exc, LLMTimeout):
+        return JSONResponse(status_code=504, content={"detail": str(exc)})
+    return JSONResponse(status_code=502, content={"detail": str(exc)})
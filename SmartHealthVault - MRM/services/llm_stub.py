@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+# Latency and usage shape of the offline backend (LLM_PROVIDER=stub)
+STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", 800))
+STUB_LATENCY_JITTER = float(os.getenv("LLM_STUB_LATENCY_JITTER", 0.5))  # sigma of the lognormal factor
+STUB_LATENCY_DIST = os.getenv("LLM_STUB_LATENCY_DIST", "lognormal")      # fixed | uniform | lognormal
+STUB_COMPLETION_TOKENS = int(os.getenv("LLM_STUB_COMPLETION_TOKENS", 200))
+STUB_SEED = os.getenv("LLM_STUB_SEED", "0")
+
+_WORDS = (
+    "patient presents stable vitals history findings assessment plan medication dose follow-up "
+    "review imaging laboratory results recommended monitoring treatment summary outcome"
+).split()
+
+
+def _rng(messages: List[Dict[str, str]], model: str) -> random.Random:
+    digest = hashlib.sha256(json.dumps([STUB_SEED, model, messages], sort_keys=True).encode("utf-8")).digest()
+    return random.Random(digest)
+
+
+def stub_latency(rng: random.Random) -> float:
+    """Seconds to wait, drawn from the configured distribution around LLM_STUB_LATENCY_MS"""
+    mean = STUB_LATENCY_MS / 1000
+    if STUB_LATENCY_DIST == "fixed":
+        return mean
+    if STUB_LATENCY_DIST == "uniform":
+        return rng.uniform(mean * (1 - STUB_LATENCY_JITTER), mean * (1 + STUB_LATENCY_JITTER))
+    # lognormal with the requested mean: long right tail like real completions
+    sigma = STUB_LATENCY_JITTER
+    return rng.lognormvariate(0, sigma) * mean / math.exp(sigma * sigma / 2)
+
+
+def stub_text(rng: random.Random, completion_tokens: int) -> str:
+    # roughly one token per word; a few lines so key-point parsing has something to split
+    words = [rng.choice(_WORDS) for _ in range(completion_tokens)]
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(f"- {line}" for line in lines)
+
+
+class _StubCompletions:
+    async def create(self, model: str, messages: List[Dict[str, str]], max_tokens: Optional[int] = None,
+                     temperature: float = 0.3, **kwargs):
+        rng = _rng(messages, model)
+        prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+        completion_tokens = max(1, int(rng.gauss(STUB_COMPLETION_TOKENS, STUB_COMPLETION_TOKENS / 4)))
+        if max_tokens is not None:
+            completion_tokens = min(completion_tokens, max_tokens)
+        await asyncio.sleep(stub_latency(rng))
+        return SimpleNamespace(
+            model=f"stub:{model}",
+            choices=[SimpleNamespace(message=SimpleNamespace(content=stub_text(rng, completion_tokens)))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+
+class StubChatClient:
+    """
+    Offline stand-in for AsyncOpenAI: the same prompt always yields the same
+    completion, latency and token usage, so runs are repeatable without
+    network access or API keys.
+    """
+
+    def __init__(self, http_client=None):
+        self.chat = SimpleNamespace(completions=_StubCompletions())
@@ -0,0 +1,195 @@
+import os
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from database.base import SessionLocal
+from database.db_manager import DatabaseManager
+from database.enums import DBType
+from parsers.llm_usage_parser import LLMUsageDay
+
+# USD per 1K (prompt, completion) tokens, matched on the longest model-name prefix;
+# extend/override with LLM_PRICES="model=prompt/completion,..."
+MODEL_PRICES_PER_1K: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4": (0.03, 0.06),  # also the HICoreBOT Azure deployment name
+    "gpt-4-turbo": (0.01, 0.03),
+}
+
+LLM_USAGE_ACCOUNTING = os.getenv("LLM_USAGE_ACCOUNTING", "true").strip().lower() in ("1", "true", "yes", "on")
+LLM_USAGE_FLUSH_INTERVAL = float(os.getenv("LLM_USAGE_FLUSH_INTERVAL", 2.0))  # seconds
+LLM_USAGE_BATCH_SIZE = int(os.getenv("LLM_USAGE_BATCH_SIZE", 200))
+LLM_USAGE_MAX_BUFFER = int(os.getenv("LLM_USAGE_MAX_BUFFER", 10000))  # rows kept while the DB is unreachable
+
+
+def _model_prices() -> Dict[str, Tuple[float, float]]:
+    prices = dict(MODEL_PRICES_PER_1K)
+    for item in os.getenv("LLM_PRICES", "").split(","):
+        model, _, rates = item.partition("=")
+        prompt, _, completion = rates.partition("/")
+        if model.strip() and prompt.strip() and completion.strip():
+            prices[model.strip()] = (float(prompt), float(completion))
+    return prices
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int,
+                  prices: Optional[Dict[str, Tuple[float, float]]] = None) -> Optional[float]:
+    """USD cost of one call, or None if the model has no known price"""
+    prices = MODEL_PRICES if prices is None else prices
+    matches = [name for name in prices if model.startswith(name)]
+    if not matches:
+        return None
+    prompt_rate, completion_rate = prices[max(matches, key=len)]
+    return round((prompt_tokens * prompt_rate + completion_tokens * completion_rate) / 1000, 8)
+
+
+MODEL_PRICES = _model_prices()
+
+
+@dataclass
+class UsageContext:
+    """Who the LLM calls made while handling the current request are billed to"""
+    user_id: Optional[str]
+    endpoint: Optional[str]
+    on_tokens: Optional[Callable[[int], None]] = None  # e.g. charge the caller's token bucket
+    tokens: int = 0
+
+
+_current: ContextVar[Optional[UsageContext]] = ContextVar("llm_usage_context", default=None)
+
+
+def current_usage() -> Optional[UsageContext]:
+    return _current.get()
+
+
+def set_usage_context(context: Optional[UsageContext]):
+    """Attribute LLM calls made from this context (and tasks/threads copied from it); returns a reset token"""
+    return _current.set(context)
+
+
+class LLMUsageRecorder:
+    """
+    Buffers one row per billed LLM call and writes them to ``llm_usage`` in
+    batches from a background thread, so recording never adds a database
+    round trip to the call path. Rows that cannot be written are kept (up
+    to ``max_buffer``) and retried on the next flush.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 flush_interval: float = LLM_USAGE_FLUSH_INTERVAL, batch_size: int = LLM_USAGE_BATCH_SIZE,
+                 max_buffer: int = LLM_USAGE_MAX_BUFFER):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, context: Optional[UsageContext], provider: str, route: Optional[str], model: str,
+               prompt_tokens: int, completion_tokens: int, latency_ms: Optional[float] = None) -> None:
+        total = prompt_tokens + completion_tokens
+        if context is not None:
+            context.tokens += total
+            if context.on_tokens:
+                context.on_tokens(total)
+        row = {
+            "user_id": context.user_id if context else None,
+            "endpoint": context.endpoint if context else None,
+            "route": route,
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total,
+            "cost_usd": estimate_cost(model, prompt_tokens, completion_tokens),
+            "latency_ms": latency_ms,
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self.recorded += 1
+            if len(self._rows) >= self.max_buffer:
+                self._rows.pop(0)
+                self.dropped += 1
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="llm-usage-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write buffered rows now; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                with self.session_factory() as session:
+                    results = DatabaseManager(session).get_database(DBType.LLM_USAGE_DB).insert_many(rows)
+            except Exception as e:
+                print(f"WARNING: could not write {len(rows)} LLM usage rows: {e}")
+                with self._lock:
+                    self._rows[:0] = rows
+                    excess = len(self._rows) - self.max_buffer
+                    if excess > 0:
+                        del self._rows[:excess]  # oldest first
+                        self.dropped += excess
+                return 0
+            written = sum(1 for r in results if r.ok)
+            if written < len(rows):
+                print(f"WARNING: {len(rows) - written} LLM usage rows were rejected by the database")
+                self.dropped += len(rows) - written
+            self.written += written
+            return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = len(self._rows)
+        return {"recorded": self.recorded, "written": self.written, "buffered": buffered, "dropped": self.dropped}
+
+    def close(self) -> None:
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+class LLMUsageManager:
+    def __init__(self, db_session: Session):
+        self.db = DatabaseManager(db_session).get_database(DBType.LLM_USAGE_DB)
+
+    def daily_usage(self, user_id: Optional[str] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[LLMUsageDay]:
+        """
+        Aggregate the usage ledger per user and day
+
+        Args:
+            user_id: Only this user's usage
+            start: Include calls from this time on
+            end: Include calls before this time
+
+        Returns:
+            One LLMUsageDay per (user, day), newest day first
+        """
+        return [LLMUsageDay.model_validate(row) for row in self.db.daily_totals(user_id, start, end)]
+
+
+# Process-wide recorder used by the LLM gateway; None when LLM_USAGE_ACCOUNTING is off
+usage_recorder: Optional[LLMUsageRecorder] = LLMUsageRecorder() if LLM_USAGE_ACCOUNTING else None
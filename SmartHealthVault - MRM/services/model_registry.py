@@ -0,0 +1,239 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from database.db_manager import DatabaseManager
+from database.enums import DBType
+from parsers.model_registry_parser import ModelInfo, ModelVersionResponse
+from schemas.model_registry_schema import ModelRegistryParser
+from services.single_flight import SingleFlight
+
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", "./model_store")  # <name>/<version>/ artifacts, <name>/ACTIVE
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", 8))         # loaded model versions kept per process
+
+
+@dataclass
+class ModelArtifact:
+    """
+    One stored model version. Arrays are .npy files opened memory-mapped:
+    pages are read on first use and shared with every other process that
+    maps the same version.
+    """
+    name: str
+    version: str
+    directory: str
+    manifest: Dict[str, Any]
+    metrics: Dict[str, Any]
+    feature_schema: Dict[str, Any]
+
+    def array(self, key: str) -> np.ndarray:
+        return np.load(os.path.join(self.directory, f"{key}.npy"), mmap_mode="r")
+
+
+class ArtifactStore:
+    """
+    Model files on disk: ``<root>/<name>/<version>/`` holds one .npy per
+    array plus manifest.json, metrics.json and schema.json, and
+    ``<root>/<name>/ACTIVE`` names the active version. A version directory
+    is written under a temporary name and renamed into place, so readers
+    never see a half-written version.
+    """
+
+    def __init__(self, root: str = MODEL_STORE_DIR):
+        self.root = root
+
+    def directory(self, name: str, version: str) -> str:
+        return os.path.join(self.root, name, version)
+
+    def write(self, name: str, version: str, arrays: Dict[str, np.ndarray], manifest: Dict[str, Any],
+              metrics: Dict[str, Any], feature_schema: Dict[str, Any]) -> str:
+        directory = self.directory(name, version)
+        if os.path.exists(directory):
+            raise ValueError(f"{name} version {version} already exists")
+        staging = os.path.join(self.root, name, f".{version}.{uuid.uuid4().hex[:8]}.tmp")
+        os.makedirs(staging)
+        try:
+            for key, value in arrays.items():
+                np.save(os.path.join(staging, f"{key}.npy"), np.ascontiguousarray(value))
+            for filename, content in (("manifest.json", {**manifest, "name": name, "version": version}),
+                                      ("metrics.json", metrics), ("schema.json", feature_schema)):
+                with open(os.path.join(staging, filename), "w") as f:
+                    json.dump(content, f, indent=2, default=str)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return directory
+
+    def read(self, name: str, version: str) -> ModelArtifact:
+        directory = self.directory(name, version)
+        loaded = {}
+        for filename in ("manifest.json", "metrics.json", "schema.json"):
+            with open(os.path.join(directory, filename)) as f:
+                loaded[filename] = json.load(f)
+        return ModelArtifact(name, version, directory, loaded["manifest.json"], loaded["metrics.json"],
+                             loaded["schema.json"])
+
+    def set_active(self, name: str, version: str) -> None:
+        pointer = os.path.join(self.root, name, "ACTIVE")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+
+
+ModelLoader = Callable[[ModelArtifact], Any]
+
+
+class ModelCache:
+    """
+    Process-wide LRU of loaded model versions, keyed by (name, version).
+    Versions are immutable, so an entry never goes stale; activating
+    another version simply starts using another key. Concurrent first
+    requests for the same version share a single load.
+    """
+
+    def __init__(self, capacity: int = MODEL_CACHE_SIZE):
+        self.capacity = capacity
+        self._models: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("model_cache.load")
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, name: str, version: str, load: Callable[[], Any]) -> Any:
+        key = (name, version)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+            self.misses += 1
+        return self._flight.do(key, self._load, key, load)
+
+    def _load(self, key: Tuple[str, str], load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._models:  # loaded by a flight that finished just before this one started
+                return self._models[key]
+        model = load()
+        with self._lock:
+            self._models[key] = model
+            self.loads += 1
+            while len(self._models) > self.capacity:
+                self._models.popitem(last=False)
+                self.evictions += 1
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            loaded = [f"{name}@{version}" for name, version in self._models]
+        return {"capacity": self.capacity, "loaded": loaded, "hits": self.hits, "misses": self.misses,
+                "loads": self.loads, "evictions": self.evictions}
+
+
+# model name -> how to turn its stored artifact into a servable object
+_loaders: Dict[str, ModelLoader] = {}
+
+
+def register_model_loader(name: str, loader: ModelLoader) -> None:
+    """Make ``name`` a known model; registered names are listed even before their first version"""
+    _loaders[name] = loader
+
+
+class ModelRegistry:
+    def __init__(self, db_session: Session, store: Optional[ArtifactStore] = None,
+                 cache: Optional[ModelCache] = None):
+        self.db = DatabaseManager(db_session).get_database(DBType.MODEL_REGISTRY_DB)
+        self.store = store or model_store
+        self.cache = cache or model_cache
+
+    def register_version(self, name: str, version: str, arrays: Dict[str, np.ndarray], manifest: Dict[str, Any],
+                         metrics: Dict[str, Any], feature_schema: Dict[str, Any],
+                         training_job_id: Optional[str] = None, description: Optional[str] = None,
+                         activate: bool = True) -> ModelVersionResponse:
+        """
+        Store a new model version's artifacts and record it in the registry
+
+        Args:
+            name: Model name
+            version: New, unique version of ``name``
+            arrays: Weights etc., stored memory-mappable
+            manifest: Anything else the model's loader needs
+            metrics: Training metrics
+            feature_schema: How inputs are turned into features
+            training_job_id: The job that trained it
+            description: Free text, e.g. from the training request
+            activate: Make it the version predictions use
+
+        Returns:
+            ModelVersionResponse of the stored version
+        """
+        directory = self.store.write(name, version, arrays, manifest, metrics, feature_schema)
+        model = self.db.insert(ModelRegistryParser.parse_version(
+            name, version, directory, metrics, feature_schema, training_job_id, description,
+        ))
+        if activate:
+            return self.activate(name, version)
+        return ModelRegistryParser.to_json(model)
+
+    def activate(self, name: str, version: str) -> ModelVersionResponse:
+        model = self.db.activate(name, version)
+        if model is None:
+            raise ValueError(f"No version {version} of model {name}")
+        self.store.set_active(name, version)
+        return ModelRegistryParser.to_json(model)
+
+    def list_models(self) -> List[ModelInfo]:
+        counts = dict(self.db.version_counts())
+        active = {m.name: m for m in self.db.list_active()}
+        return [
+            ModelInfo(
+                name=name, versions=counts.get(name, 0),
+                active_version=ModelRegistryParser.to_json(active[name]) if name in active else None,
+            )
+            for name in sorted(set(counts) | set(_loaders))
+        ]
+
+    def list_versions(self, name: str) -> List[ModelVersionResponse]:
+        return [ModelRegistryParser.to_json(m) for m in self.db.list_versions(name)]
+
+    def get_version(self, name: str, version: Optional[str] = None) -> Optional[ModelVersionResponse]:
+        """``version`` of ``name`` with its feature schema; the active version if not given"""
+        model = self.db.get_active(name) if version is None else self.db.get_version(name, version)
+        return ModelRegistryParser.to_json(model, include_schema=True) if model else None
+
+    def load(self, name: str, version: Optional[str] = None) -> Optional[Any]:
+        """
+        The loaded model for ``version`` of ``name`` (the active one if not given),
+        from the process-wide cache; None if there is no such version
+        """
+        if version is None:
+            active = self.db.get_active(name)
+            if active is None:
+                return None
+            version = active.version
+        elif self.db.get_version(name, version) is None:
+            return None
+        loader = _loaders.get(name)
+        if loader is None:
+            raise ValueError(f"No loader registered for model {name}")
+        return self.cache.get(name, version, lambda: loader(self.store.read(name, version)))
+
+
+# Process-wide artifact store and loaded-model cache shared by every request
+model_store = ArtifactStore()
+model_cache = ModelCache()
@@ -1,8 +1,10 @@
 from database.db_manager import DatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.notification_schema import NotificationParser
 from parsers.notification_parser import NotificationCreate
-from typing import List
+from parsers.batch_parser import BatchResponse, run_batch, to_batch_response
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 
 class NotificationManager:
@@ -14,16 +16,24 @@ class NotificationManager:
         created = self.db.insert(m)
         return NotificationParser.to_json(created)
 
+    def create_notifications(self, items: List[Dict[str, Any]]) -> BatchResponse:
+        return run_batch(items, NotificationCreate, NotificationParser.parse_create, self.db.insert_many)
+
     def get_notification(self, notification_id: str):
         n = self.db.get_by_id(notification_id)
         return NotificationParser.to_json(n) if n else None
 
-    def list_notifications(self) -> List:
-        return [NotificationParser.to_json(n) for n in self.db.list_all()]
+    def list_notifications(self, user_id: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        filters = {"user_id": user_id} if user_id else None
+        page = self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([NotificationParser.to_json(n) for n in page.items], page.next_cursor)
 
     def mark_as_read(self, notification_id: str):
         updated = self.db.update(notification_id, {"read": True})
         return NotificationParser.to_json(updated) if updated else None
 
+    def mark_many_as_read(self, notification_ids: List[str]) -> BatchResponse:
+        return to_batch_response(self.db.update_many([{"id": i, "read": True} for i in notification_ids]))
+
     def delete_notification(self, notification_id: str):
         return self.db.delete(notification_id)
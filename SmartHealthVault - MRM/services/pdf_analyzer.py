@@ -1,7 +1,8 @@
 import os
-import fitz  # PyMuPDF
+from services.llm_resilience import LLMError
+from services.pdf_extraction import PdfTextExtractor
+from services.summarizer import MapReduceSummarizer, chunk_text
 from typing import Optional, Dict, Any
-from openai import OpenAI
 from dotenv import load_dotenv
 import re
 
@@ -17,14 +18,16 @@ class PDFAnalyzer:
             uploads_dir: Path to the directory containing uploaded PDFs
         """
         self.uploads_dir = uploads_dir
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.summarizer = MapReduceSummarizer(route="pdf.analyze")
         
-    def extract_text_from_pdf(self, pdf_id: str) -> str:
+    def extract_text_from_pdf(self, pdf_id: str, pdf_path: Optional[str] = None) -> str:
         """
         Extract text from a PDF file
         
         Args:
             pdf_id: The ID of the PDF file (without .pdf extension)
+            pdf_path: Resolved location (e.g. from the PDF catalog); defaults
+                to ``<uploads_dir>/<pdf_id>.pdf``
             
         Returns:
             Extracted text from the PDF
@@ -32,15 +35,13 @@ class PDFAnalyzer:
         Raises:
             FileNotFoundError: If the PDF file doesn't exist
         """
-        pdf_path = os.path.join(self.uploads_dir, f"{pdf_id}.pdf")
+        pdf_path = pdf_path or os.path.join(self.uploads_dir, f"{pdf_id}.pdf")
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF with ID {pdf_id} not found in {self.uploads_dir}")
         
-        text = ""
         try:
-            with fitz.open(pdf_path) as doc:
-                for page in doc:
-                    text += page.get_text()
+            with PdfTextExtractor().extract(pdf_path) as doc:
+                text = doc.text()
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
             
@@ -56,24 +57,7 @@ class PDFAnalyzer:
     
     def chunk_text(self, text: str, chunk_size: int = 2000) -> list[str]:
         """Split text into chunks of specified size"""
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for word in words:
-            if current_length + len(word) + 1 > chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
-                current_length = 0
-                
-            current_chunk.append(word)
-            current_length += len(word) + 1
-            
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-            
-        return chunks
+        return chunk_text(text, chunk_size)
     
     def summarize_text(self, text: str, length: str = "medium") -> str:
         """
@@ -96,35 +80,35 @@ class PDFAnalyzer:
         max_tokens = length_map.get(length.lower(), 250)  # Default to medium
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes text concisely."},
-                    {"role": "user", "content": f"Please provide a {length} summary of the following text:\n\n{text}"}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.3
+            # Long documents are condensed chunk by chunk first (see services.summarizer)
+            result = self.summarizer.summarize(
+                text,
+                "You are a helpful assistant that summarizes text concisely.",
+                max_tokens,
+                instruction=f"Please provide a {length} summary of the following text:\n\n",
             )
+            return result.summary
             
-            return response.choices[0].message.content.strip()
-            
+        except LLMError:
+            raise
         except Exception as e:
             raise Exception(f"Error generating summary: {str(e)}")
     
-    def analyze_pdf(self, pdf_id: str, summary_length: str = "medium") -> Dict[str, Any]:
+    def analyze_pdf(self, pdf_id: str, summary_length: str = "medium", pdf_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze and summarize a PDF file
         
         Args:
             pdf_id: The ID of the PDF to analyze
             summary_length: Desired length of the summary (short, medium, long)
+            pdf_path: Resolved location of the file, if already known
             
         Returns:
             Dictionary containing analysis results
         """
         try:
             # Extract and clean text
-            text = self.extract_text_from_pdf(pdf_id)
+            text = self.extract_text_from_pdf(pdf_id, pdf_path)
             if not text:
                 return {"error": "No text could be extracted from the PDF"}
                 
@@ -148,6 +132,8 @@ class PDFAnalyzer:
                 "status": "completed"
             }
             
+        except LLMError:
+            raise
         except Exception as e:
             return {
                 "error": str(e),
@@ -0,0 +1,150 @@
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import anyio
+import fitz  # PyMuPDF
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db_manager import AsyncDatabaseManager, DatabaseManager
+from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
+from schemas.pdf_catalog_schema import PdfCatalogParser
+
+# Where PDFs were written before the blob store; indexed once, never written to again
+LEGACY_PDF_DIRS = ["./uploads/raw", "./uploads/raw/pdfs"]
+PDF_MIME_TYPE = "application/pdf"
+
+
+def count_pages(path: str) -> Optional[int]:
+    try:
+        with fitz.open(path) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PdfCatalogManager:
+    def __init__(self, db_session: Session):
+        self.db = DatabaseManager(db_session).get_database(DBType.PDF_CATALOG_DB)
+
+    def resolve_path(self, pdf_id: str) -> Optional[str]:
+        entry = self.db.get_by_id(pdf_id)
+        return entry.path if entry else None
+
+    def list_pdfs(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([PdfCatalogParser.to_json(e) for e in page.items], page.next_cursor)
+
+    def remove_content(self, sha256: str) -> bool:
+        """Drop the entry for content whose blob has just been deleted"""
+        return self.db.delete_by_sha256(sha256)
+
+    def remove_legacy_file(self, path: str, commit: bool = True) -> Optional[str]:
+        """
+        Drop the entry index_legacy_pdfs made for a legacy upload
+
+        Args:
+            path: The upload's file path
+            commit: False to leave the transaction open for the caller
+
+        Returns:
+            sha256 of the dropped entry, None if the file was not catalogued
+        """
+        entry = self.db.get_by_id(os.path.splitext(os.path.basename(path))[0])
+        if entry is None or os.path.abspath(entry.path) != os.path.abspath(path):
+            return None
+        self.db.delete_by_id(entry.id, commit=commit)
+        return entry.sha256
+
+    def index_legacy_pdfs(self, dirs=LEGACY_PDF_DIRS) -> int:
+        """
+        Catalog PDFs uploaded before the catalog existed
+
+        Args:
+            dirs: Directories to scan (not recursive)
+
+        Returns:
+            Number of files added
+        """
+        added = 0
+        for directory in dirs:
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if not entry.is_file() or not entry.name.lower().endswith(".pdf"):
+                    continue
+                pdf_id = os.path.splitext(entry.name)[0]
+                if self.db.get_by_id(pdf_id):
+                    continue
+                stat = entry.stat()
+                self.db.insert(PdfCatalogParser.parse_file(
+                    entry.path, stat.st_size, count_pages(entry.path),
+                    sha256=_sha256_file(entry.path),
+                    created_at=datetime.utcfromtimestamp(stat.st_mtime),
+                ))
+                added += 1
+        return added
+
+
+def index_legacy_pdfs_once(db_session: Session) -> int:
+    """Startup hook: index legacy uploads the first time the catalog is empty"""
+    manager = PdfCatalogManager(db_session)
+    if manager.db.count():
+        return 0
+    return manager.index_legacy_pdfs()
+
+
+class AsyncPdfCatalogManager:
+    def __init__(self, db_session: AsyncSession):
+        self.db = AsyncDatabaseManager(db_session).get_database(DBType.PDF_CATALOG_DB)
+
+    async def register(self, stored) -> None:
+        """
+        Catalog a freshly stored upload if it is a PDF
+
+        Args:
+            stored: StoredUpload already moved into the blob store
+        """
+        if stored.mime_type != PDF_MIME_TYPE or await self.db.get_by_sha256(stored.sha256):
+            return
+        page_count = await anyio.to_thread.run_sync(count_pages, stored.path)
+        await self.db.insert(PdfCatalogParser.parse_file(
+            stored.path, stored.size, page_count,
+            sha256=stored.sha256, filename=stored.original_filename,
+        ))
+
+    async def resolve_path(self, pdf_id: str) -> Optional[str]:
+        entry = await self.db.get_by_id(pdf_id)
+        return entry.path if entry else None
+
+    async def remove_content(self, sha256: str) -> bool:
+        return await self.db.delete_by_sha256(sha256)
+
+    async def remove_legacy_file(self, path: str, commit: bool = True) -> Optional[str]:
+        entry = await self.db.get_by_id(os.path.splitext(os.path.basename(path))[0])
+        if entry is None or os.path.abspath(entry.path) != os.path.abspath(path):
+            return None
+        await self.db.delete_by_id(entry.id, commit=commit)
+        return entry.sha256
+
+    async def list_pdfs(self, filters: Dict = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = await self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([PdfCatalogParser.to_json(e) for e in page.items], page.next_cursor)
+
+
+if __name__ == "__main__":
+    # python -m services.pdf_catalog_manager: (re)index legacy uploads on demand
+    from database.base import SessionLocal
+    with SessionLocal() as session:
+        print(f"Indexed {PdfCatalogManager(session).index_legacy_pdfs()} legacy PDFs")
@@ -0,0 +1,381 @@
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import fitz  # PyMuPDF
+
+PROCESSED_DIR = os.getenv("PROCESSED_DIR", "./uploads/processed")
+# Bump when the extraction output changes; older cache entries are re-extracted
+FORMAT_VERSION = 2
+# Worker processes for page-range extraction; 1 extracts in the calling process
+EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+# Smaller documents (or ranges) are not worth the round trip to the pool
+MIN_PAGES_PER_WORKER = int(os.getenv("PDF_MIN_PAGES_PER_WORKER", 32))
+# Disk budget of the extraction cache; least recently used entries are removed beyond it.
+# Entries of transient uploads (ad-hoc analysis) are never evicted otherwise
+PROCESSED_MAX_BYTES = int(os.getenv("PROCESSED_MAX_BYTES", 1024 ** 3))
+
+PAGES_FILE = "pages.bin"      # UTF-8 text of every page, back to back
+OFFSETS_FILE = "offsets.bin"  # page_count + 1 uint64 byte offsets into pages.bin
+META_FILE = "meta.json"
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ocr_page_images(doc, page) -> str:
+    # optional dependency: only needed when OCR is requested
+    import io
+    import pytesseract
+    from PIL import Image
+
+    text = ""
+    for img in page.get_images(full=True):
+        pix = fitz.Pixmap(doc, img[0])
+        if pix.n > 4:
+            pix = fitz.Pixmap(fitz.csGRAY, pix)
+        text += pytesseract.image_to_string(Image.open(io.BytesIO(pix.tobytes("png"))))
+    return text
+
+
+def extract_pages(pdf_path: str, start: int = 0, end: Optional[int] = None, ocr: bool = False) -> List[str]:
+    """Text of pages [start, end) of a PDF, optionally with OCR of embedded images appended"""
+    with fitz.open(pdf_path) as doc:
+        end = doc.page_count if end is None else min(end, doc.page_count)
+        pages = []
+        for number in range(start, end):
+            page = doc.load_page(number)
+            text = page.get_text()
+            if ocr:
+                text += _ocr_page_images(doc, page)
+            pages.append(text)
+        return pages
+
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into ``parts`` contiguous ranges of near-equal size"""
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process is multi-threaded and MuPDF is not fork-safe
+            _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def extract_pages_parallel(
+    pdf_path: str,
+    page_count: int,
+    ocr: bool = False,
+    workers: int = EXTRACT_WORKERS,
+    min_pages_per_worker: int = MIN_PAGES_PER_WORKER,
+) -> List[str]:
+    """
+    Per-page text of a whole PDF, split into page ranges across worker processes
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_count: Number of pages in the document
+        ocr: Also OCR embedded images
+        workers: Upper bound on the number of ranges extracted concurrently
+        min_pages_per_worker: Documents are split into at most
+            page_count // min_pages_per_worker ranges
+
+    Returns:
+        Page texts in document order
+    """
+    parts = min(workers, page_count // max(min_pages_per_worker, 1))
+    if parts <= 1:
+        return extract_pages(pdf_path, 0, page_count, ocr)
+    # each worker opens the document itself; only paths and page text cross processes
+    pool = _get_pool(workers)
+    futures = [pool.submit(extract_pages, pdf_path, start, end, ocr)
+               for start, end in _page_ranges(page_count, parts)]
+    pages: List[str] = []
+    try:
+        for future in futures:
+            pages.extend(future.result())
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM on a pathological file): start a fresh pool next time
+        print("WARNING: PDF extraction pool broke; extracting in-process")
+        shutdown_pool()
+        return extract_pages(pdf_path, 0, page_count, ocr)
+    return pages
+
+
+def read_document_info(pdf_path: str) -> Dict[str, Any]:
+    with fitz.open(pdf_path) as doc:
+        meta = doc.metadata or {}
+        return {
+            "page_count": doc.page_count,
+            "title": (meta.get("title") or "").strip(),
+            "author": (meta.get("author") or "").strip(),
+        }
+
+
+class ExtractedDocument:
+    """
+    Read-only view of a cached extraction. Page text is sliced out of a
+    memory-mapped ``pages.bin``, so opening a large document costs nothing
+    until its pages are read.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.offsets = array("Q")
+        with open(os.path.join(directory, OFFSETS_FILE), "rb") as f:
+            self.offsets.frombytes(f.read())
+        if self.meta.get("byteorder", sys.byteorder) != sys.byteorder:
+            self.offsets.byteswap()
+        self._file = open(os.path.join(directory, PAGES_FILE), "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._text_offsets: Dict[str, List[int]] = {}
+
+    @property
+    def sha256(self) -> str:
+        return self.meta["sha256"]
+
+    @property
+    def page_count(self) -> int:
+        return self.meta["page_count"]
+
+    @property
+    def title(self) -> str:
+        return self.meta.get("title", "")
+
+    def page(self, number: int) -> str:
+        return self._data[self.offsets[number]:self.offsets[number + 1]].decode("utf-8")
+
+    def pages(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        end = self.page_count if end is None else min(end, self.page_count)
+        return [self.page(n) for n in range(start, end)]
+
+    def text(self, separator: str = "", start: int = 0, end: Optional[int] = None) -> str:
+        return separator.join(self.pages(start, end))
+
+    def text_offsets(self, separator: str = "") -> List[int]:
+        """
+        Character offsets of each page within ``text(separator)``
+
+        Returns:
+            page_count + 1 offsets; page n spans [offsets[n], offsets[n + 1]),
+            the separator that follows it included
+        """
+        if separator not in self._text_offsets:
+            offsets = [0]
+            for n, chars in enumerate(self.meta["page_chars"]):
+                offsets.append(offsets[-1] + chars + (len(separator) if n < self.page_count - 1 else 0))
+            self._text_offsets[separator] = offsets
+        return self._text_offsets[separator]
+
+    def page_at(self, offset: int, separator: str = "") -> int:
+        """The page holding character ``offset`` of ``text(separator)``"""
+        offsets = self.text_offsets(separator)
+        return min(max(bisect_right(offsets, offset) - 1, 0), max(self.page_count - 1, 0))
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "ExtractedDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PdfTextExtractor:
+    """
+    The one PDF text-extraction path for the application.
+
+    Results are cached under ``<root>/<sha256>/`` (``<sha256>-ocr`` when
+    image OCR is included) as ``pages.bin`` + ``offsets.bin`` + ``meta.json``.
+    The key is the content hash, so a changed file can never be served
+    stale text; ``evict`` removes the entries once the content is deleted.
+    The directory is kept within ``max_bytes``: each hit refreshes the
+    entry's mtime and every write removes the least recently used entries.
+    """
+
+    def __init__(self, root: str = PROCESSED_DIR, max_bytes: int = PROCESSED_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def cache_dir(self, sha256: str, ocr: bool = False) -> str:
+        return os.path.join(self.root, f"{sha256}-ocr" if ocr else sha256)
+
+    def cached(self, sha256: str, ocr: bool = False) -> Optional[ExtractedDocument]:
+        directory = self.cache_dir(sha256, ocr)
+        try:
+            doc = ExtractedDocument(directory)
+        except (OSError, ValueError):
+            return None
+        if doc.meta.get("version") != FORMAT_VERSION:
+            doc.close()
+            return None
+        return doc
+
+    def extract(self, pdf_path: str, sha256: Optional[str] = None, ocr: bool = False) -> ExtractedDocument:
+        """
+        Per-page text of a PDF, from the cache when this content was seen before
+
+        Args:
+            pdf_path: Path to the PDF file
+            sha256: Content hash if already known (e.g. from record metadata);
+                computed from the file otherwise
+            ocr: Also OCR embedded images (needs pytesseract)
+
+        Returns:
+            ExtractedDocument; close it (or use it as a context manager) when done
+
+        Raises:
+            FileNotFoundError: If the PDF file doesn't exist
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        sha256 = sha256 or sha256_file(pdf_path)
+        doc = self.cached(sha256, ocr)
+        if doc is not None:
+            self._touch(doc.directory)
+            return doc
+        info = read_document_info(pdf_path)
+        pages = self._extract_pages(pdf_path, info["page_count"], ocr)
+        self._write(sha256, ocr, info, pages)
+        doc = ExtractedDocument(self.cache_dir(sha256, ocr))
+        self.prune(keep=doc.directory)
+        return doc
+
+    def _extract_pages(self, pdf_path: str, page_count: int, ocr: bool) -> List[str]:
+        return extract_pages_parallel(pdf_path, page_count, ocr)
+
+    def _write(self, sha256: str, ocr: bool, info: Dict[str, Any], pages: List[str]) -> None:
+        target = self.cache_dir(sha256, ocr)
+        os.makedirs(self.root, exist_ok=True)
+        staging = f"{target}.tmp-{uuid4().hex}"
+        os.makedirs(staging)
+        try:
+            offsets = array("Q", [0])
+            with open(os.path.join(staging, PAGES_FILE), "wb") as f:
+                for text in pages:
+                    data = text.encode("utf-8", errors="replace")
+                    f.write(data)
+                    offsets.append(offsets[-1] + len(data))
+            with open(os.path.join(staging, OFFSETS_FILE), "wb") as f:
+                offsets.tofile(f)
+            meta = {
+                **info,
+                "sha256": sha256,
+                "ocr": ocr,
+                "page_chars": [len(t) for t in pages],
+                "byteorder": sys.byteorder,
+                "version": FORMAT_VERSION,
+                "extracted_at": datetime.utcnow().isoformat(),
+            }
+            with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            if os.path.isdir(target):
+                # stale format version (or a concurrent writer won): replace it
+                shutil.rmtree(target, ignore_errors=True)
+            os.rename(staging, target)
+        except OSError:
+            if not os.path.isdir(target):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _touch(directory: str) -> None:
+        try:
+            os.utime(os.path.join(directory, META_FILE))
+        except OSError:
+            pass
+
+    def prune(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until the cache fits ``max_bytes``
+
+        Args:
+            keep: Entry directory never removed, e.g. the one just written
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            directory = os.path.join(self.root, name)
+            if ".tmp-" in name or not os.path.isdir(directory):
+                continue
+            try:
+                used = os.stat(os.path.join(directory, META_FILE)).st_mtime
+                size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+            except OSError:
+                continue
+            entries.append((used, size, directory))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, directory in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.abspath(directory) == os.path.abspath(keep):
+                continue
+            # open ExtractedDocuments keep their mapping; the pages stay readable until closed
+            shutil.rmtree(directory, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def evict(self, sha256: str) -> None:
+        """Drop every cached extraction of this content"""
+        for ocr in (False, True):
+            shutil.rmtree(self.cache_dir(sha256, ocr), ignore_errors=True)
+
+
+def extract_document(pdf_path: str, sha256: Optional[str] = None, ocr: bool = False) -> Tuple[str, int, str]:
+    """Convenience wrapper: (full text, page count, title) through the shared cache"""
+    with PdfTextExtractor().extract(pdf_path, sha256, ocr) as doc:
+        return doc.text(), doc.page_count, doc.title
@@ -0,0 +1,218 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from database.engine_config import _env_bool, _env_float, _env_int
+from services.llm_usage import UsageContext, set_usage_context
+
+# Header naming the caller; without it requests are limited per client address
+USER_HEADER = os.getenv("RATE_LIMIT_USER_HEADER", "X-User-ID")
+
+
+class TokenBucket:
+    """
+    ``burst`` capacity, refilled continuously at ``rate`` per second. The
+    level may go negative when usage is only known afterwards (LLM tokens);
+    the debt is then paid off by the refill before the next admission.
+    """
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.level = burst
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.burst, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)"""
+        self._refill(now)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else math.inf
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    per_minute: float  # sustained rate; 0 disables the limit
+    burst: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0
+
+
+@dataclass
+class RateLimitSettings:
+    enabled: bool = True
+    user_requests: BucketLimit = BucketLimit(20, 10)
+    user_tokens: BucketLimit = BucketLimit(40_000, 20_000)
+    global_requests: BucketLimit = BucketLimit(600, 100)
+    global_tokens: BucketLimit = BucketLimit(1_000_000, 200_000)
+    max_keys: int = 10_000  # per-user buckets kept; least recently used are forgotten
+
+    @classmethod
+    def from_env(cls) -> "RateLimitSettings":
+        def limit(prefix: str, default: BucketLimit) -> BucketLimit:
+            return BucketLimit(
+                per_minute=_env_float(f"{prefix}_PER_MIN", default.per_minute),
+                burst=_env_float(f"{prefix}_BURST", default.burst),
+            )
+
+        return cls(
+            enabled=_env_bool("RATE_LIMIT_ENABLED", cls.enabled),
+            user_requests=limit("RATE_LIMIT_USER_REQUESTS", cls.user_requests),
+            user_tokens=limit("RATE_LIMIT_USER_TOKENS", cls.user_tokens),
+            global_requests=limit("RATE_LIMIT_GLOBAL_REQUESTS", cls.global_requests),
+            global_tokens=limit("RATE_LIMIT_GLOBAL_TOKENS", cls.global_tokens),
+            max_keys=_env_int("RATE_LIMIT_MAX_KEYS", cls.max_keys),
+        )
+
+
+class RateLimiter:
+    """
+    Admission control for the AI endpoints. Each (user, endpoint) pair has
+    a request bucket and an LLM-token bucket, and all callers together share
+    a global pair. A request is admitted only if every bucket has room;
+    tokens are charged as each LLM call completes, so a user who has burnt
+    through their token budget is held back until it refills.
+    """
+
+    def __init__(self, settings: Optional[RateLimitSettings] = None, clock: Callable[[], float] = time.monotonic):
+        self.settings = settings or RateLimitSettings.from_env()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[Tuple[str, str], Tuple[Optional[TokenBucket], Optional[TokenBucket]]]" = OrderedDict()
+        now = clock()
+        self._global = (self._bucket(self.settings.global_requests, now), self._bucket(self.settings.global_tokens, now))
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+
+    @staticmethod
+    def _bucket(limit: BucketLimit, now: float) -> Optional[TokenBucket]:
+        return TokenBucket(limit.per_minute / 60, limit.burst, now) if limit.enabled else None
+
+    def _user_buckets(self, user_id: str, endpoint: str, now: float):
+        key = (user_id, endpoint)
+        buckets = self._users.get(key)
+        if buckets is None:
+            buckets = self._users[key] = (
+                self._bucket(self.settings.user_requests, now), self._bucket(self.settings.user_tokens, now),
+            )
+            if len(self._users) > self.settings.max_keys:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(key)
+        return buckets
+
+    def admit(self, user_id: str, endpoint: str) -> float:
+        """
+        Take one request from the caller's and the global request buckets
+
+        Args:
+            user_id: Caller identity
+            endpoint: Rate-limited endpoint name
+
+        Returns:
+            0 if the request is admitted, otherwise the seconds to wait before retrying
+        """
+        if not self.settings.enabled:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            user_requests, user_tokens = self._user_buckets(user_id, endpoint, now)
+            global_requests, global_tokens = self._global
+            buckets = {
+                "user_requests": user_requests, "user_tokens": user_tokens,
+                "global_requests": global_requests, "global_tokens": global_tokens,
+            }
+            # a token bucket only needs to be out of debt: the call's size is not known yet
+            waits: List[Tuple[float, str]] = [
+                (bucket.wait_time(1, now), scope) for scope, bucket in buckets.items() if bucket is not None
+            ]
+            wait, scope = max(waits, default=(0.0, ""))
+            if wait > 0:
+                self.rejected[scope] = self.rejected.get(scope, 0) + 1
+                return wait
+            for bucket in (user_requests, global_requests):
+                if bucket is not None:
+                    bucket.take(1, now)
+            self.admitted += 1
+            return 0.0
+
+    def charge(self, user_id: str, endpoint: str, tokens: int) -> None:
+        """Debit LLM tokens used on behalf of ``user_id`` from its and the global token bucket"""
+        if not self.settings.enabled or tokens <= 0:
+            return
+        with self._lock:
+            now = self.clock()
+            _, user_tokens = self._user_buckets(user_id, endpoint, now)
+            for bucket in (user_tokens, self._global[1]):
+                if bucket is not None:
+                    bucket.take(tokens, now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self.clock()
+            global_requests, global_tokens = self._global
+            for bucket in self._global:
+                if bucket is not None:
+                    bucket._refill(now)
+            return {
+                "enabled": self.settings.enabled,
+                "admitted": self.admitted,
+                "rejected": dict(self.rejected),
+                "tracked_keys": len(self._users),
+                "global_requests_available": round(global_requests.level, 2) if global_requests else None,
+                "global_tokens_available": round(global_tokens.level) if global_tokens else None,
+            }
+
+
+def client_id(request: Request) -> str:
+    """The caller a request is limited and billed as: the user header, else the client address"""
+    user_id = request.headers.get(USER_HEADER, "").strip()
+    if user_id:
+        return user_id
+    return f"ip:{request.client.host}" if request.client else "anonymous"
+
+
+def rate_limit(endpoint: str, limiter: Optional[RateLimiter] = None) -> Callable:
+    """
+    FastAPI dependency admitting a request to ``endpoint`` or rejecting it
+    with 429 and Retry-After. Admitted requests get a UsageContext, so the
+    LLM calls they make are charged to the caller's token bucket and
+    recorded in the usage ledger under their user id.
+    """
+    async def dependency(request: Request) -> UsageContext:
+        active = limiter or rate_limiter
+        user_id = client_id(request)
+        wait = active.admit(user_id, endpoint)
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded for {endpoint}; retry in {math.ceil(wait)}s",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+        context = UsageContext(user_id, endpoint, on_tokens=partial(active.charge, user_id, endpoint))
+        # set in the request's own context, which sync endpoints' worker threads copy
+        set_usage_context(context)
+        return context
+
+    return dependency
+
+
+# Process-wide limiter shared by every rate-limited endpoint
+rate_limiter = RateLimiter()
@@ -1,12 +1,59 @@
-from database.db_manager import DatabaseManager
+from database.db_manager import DatabaseManager, AsyncDatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.record_schema import RecordParser
 from parsers.record_parser import RecordCreate
-from typing import List
+from parsers.batch_parser import BatchResponse, run_batch
+from services.blob_store import AsyncBlobStore, BlobStore, sha256_from_path
+from services.pdf_catalog_manager import AsyncPdfCatalogManager, PdfCatalogManager
+from services.pdf_extraction import PdfTextExtractor, sha256_file
+import os
+import anyio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# uploads from before the blob store, one file per record
+LEGACY_UPLOAD_DIR = "./uploads/raw"
+
+def remove_legacy_file(file_path: Optional[str], sha256: Optional[str] = None) -> None:
+    """
+    Unlink a pre-blob-store upload and drop its cached text extraction;
+    paths outside the legacy upload directory are left alone
+
+    Args:
+        file_path: The deleted record's file path
+        sha256: Content hash from the PDF catalog, if it was catalogued; hashed from the file otherwise
+    """
+    if not file_path:
+        return
+    root = os.path.abspath(LEGACY_UPLOAD_DIR) + os.sep
+    if os.path.abspath(file_path).startswith(root) and os.path.exists(file_path):
+        try:
+            sha256 = sha256 or sha256_file(file_path)
+            os.remove(file_path)
+        except OSError as e:
+            # Log the error but don't fail the request
+            print(f"Warning: Could not delete file {file_path}: {str(e)}")
+    if sha256:
+        PdfTextExtractor().evict(sha256)
+
+
+def parse_unowned_record(payload: RecordCreate):
+    """
+    parse_create for records created without an upload: a blob path would
+    share the file without holding a reference, so deleting the record
+    would unlink it from under the upload that does
+    """
+    if sha256_from_path(payload.file_path):
+        raise ValueError("file_path may not point into the blob store; upload files through POST /records/")
+    return RecordParser.parse_create(payload)
+
 
 class RecordManager:
     def __init__(self, db_session: Session):
+        self.db_session = db_session
         self.db = DatabaseManager(db_session).get_database(DBType.RECORD_DB)
 
     def create_record(self, payload: RecordCreate):
@@ -14,31 +61,149 @@ class RecordManager:
         created = self.db.insert(model)
         return RecordParser.to_json(created)
 
+    def create_records(self, items: List[Dict[str, Any]]) -> BatchResponse:
+        """Create many records in chunked transactions, reporting a result per item"""
+        return run_batch(items, RecordCreate, parse_unowned_record, self.db.insert_many)
+
     def get_record(self, record_id: str):
         r = self.db.get_by_id(record_id)
         return RecordParser.to_json(r) if r else None
 
-    def list_records(self) -> List:
-        return [RecordParser.to_json(r) for r in self.db.list_all()]
+    def list_records(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = self.db.list_page(limit=limit, cursor=cursor)
+        return Page([RecordParser.to_json(r) for r in page.items], page.next_cursor)
 
     def update_record(self, record_id: str, updates: dict):
+        if "file_path" in updates:
+            current = self.db.get_by_id(record_id)
+            if sha256_from_path(updates["file_path"]) or (current and sha256_from_path(current.file_path)):
+                raise ValueError("A stored file can only be attached or replaced by uploading it")
         r = self.db.update(record_id, updates)
         return RecordParser.to_json(r) if r else None
 
-    def delete_record(self, record_id: str):
-        return self.db.delete(record_id)
+    def delete_record(self, record_id: str) -> bool:
+        """
+        Delete a record and release its file
+        
+        Args:
+            record_id: ID of the record to delete
+            
+        Returns:
+            True if the record existed and was deleted
+        """
+        r = self.db.get_by_id(record_id)
+        if not r:
+            return False
+        sha256 = sha256_from_path(r.file_path)
+        if not sha256:
+            # the record and its legacy catalog entry go in one transaction
+            try:
+                if not self.db.delete(record_id, commit=False):
+                    self.db_session.rollback()
+                    return False
+                catalogued = PdfCatalogManager(self.db_session).remove_legacy_file(r.file_path, commit=False) \
+                    if r.file_path else None
+                self.db_session.commit()
+            except BaseException:
+                self.db_session.rollback()
+                raise
+            remove_legacy_file(r.file_path, catalogued)
+            return True
+        # the row and the blob reference it holds go in one transaction;
+        # shared content is only unlinked once no other record references it
+        blobs = BlobStore(self.db_session)
+        try:
+            if not self.db.delete(record_id, commit=False):
+                blobs.rollback()
+                return False
+            freed = blobs.release(r.file_path, commit=False)
+            blobs.commit()
+        except BaseException:
+            blobs.rollback()
+            raise
+        if freed:
+            PdfCatalogManager(self.db_session).remove_content(sha256)
+            PdfTextExtractor().evict(sha256)
+        return True
 
-    def get_records_by_patient(self, patient_id: str) -> List[dict]:
+    def get_records_by_patient(
+        self,
+        patient_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        category: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Page:
         """
-        Get all records for a specific patient
+        Get one page of record summaries for a specific patient, newest first
         
         Args:
             patient_id: ID of the patient whose records to retrieve
+            limit: Maximum number of records to return
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+            category: Only return records in this category
+            created_from: Only return records created at or after this time
+            created_to: Only return records created before this time
             
         Returns:
-            List of record objects for the specified patient
+            Page of RecordSummary objects (no ``content``) for the specified patient
         """
-        # Get all records and filter by patient_id
-        all_records = self.db.list_all()
-        patient_records = [r for r in all_records if str(r.user_id) == str(patient_id)]
-        return [RecordParser.to_json(record) for record in patient_records]
+        filters = {
+            "user_id": str(patient_id),
+            "category": category,
+            "created_from": created_from,
+            "created_to": created_to,
+        }
+        page = self.db.list_page(filters, limit=limit, cursor=cursor, summary=True)
+        return Page([RecordParser.to_summary(record) for record in page.items], page.next_cursor)
+
+
+class AsyncRecordManager:
+    """Event-loop counterpart of RecordManager for ``async def`` routes."""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.db = AsyncDatabaseManager(db_session).get_database(DBType.RECORD_DB)
+
+    async def create_record(self, payload: RecordCreate):
+        model = RecordParser.parse_create(payload)
+        created = await self.db.insert(model)
+        return RecordParser.to_json(created)
+
+    async def get_record(self, record_id: str):
+        r = await self.db.get_by_id(record_id)
+        return RecordParser.to_json(r) if r else None
+
+    async def delete_record(self, record_id: str) -> bool:
+        r = await self.db.get_by_id(record_id)
+        if not r:
+            return False
+        sha256 = sha256_from_path(r.file_path)
+        if not sha256:
+            try:
+                if not await self.db.delete(record_id, commit=False):
+                    await self.db_session.rollback()
+                    return False
+                catalogued = await AsyncPdfCatalogManager(self.db_session).remove_legacy_file(
+                    r.file_path, commit=False) if r.file_path else None
+                await self.db_session.commit()
+            except BaseException:
+                await self.db_session.rollback()
+                raise
+            await anyio.to_thread.run_sync(remove_legacy_file, r.file_path, catalogued)
+            return True
+        blobs = AsyncBlobStore(self.db_session)
+        try:
+            if not await self.db.delete(record_id, commit=False):
+                await blobs.rollback()
+                return False
+            freed = await blobs.release(r.file_path, commit=False)
+            await blobs.commit()
+        except BaseException:
+            await blobs.rollback()
+            raise
+        if freed:
+            await AsyncPdfCatalogManager(self.db_session).remove_content(sha256)
+            await anyio.to_thread.run_sync(PdfTextExtractor().evict, sha256)
+        return True
@@ -0,0 +1,472 @@
+import math
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from database.base import SessionLocal
+from database.db_manager import DatabaseManager
+from database.enums import DBType
+from parsers.model_registry_parser import ModelVersionResponse
+from services.model_registry import ModelArtifact, ModelRegistry, register_model_loader
+
+RISK_MODEL_NAME = "diagnosis-risk-model"
+
+RISK_FEATURES_DIR = os.getenv("RISK_FEATURES_DIR", "./cache/risk_features")  # memory-mapped training matrices
+RISK_MAX_CATEGORIES = int(os.getenv("RISK_MAX_CATEGORIES", 32))              # most common record categories used
+RISK_LABEL_CATEGORY = os.getenv("RISK_LABEL_CATEGORY", "diagnosis")         # a record here marks a positive user
+RISK_PROGRESS_INTERVAL = 1.0  # seconds between progress reports while training
+
+GENDERS = ("male", "female", "other")
+GENDER_ALIASES = {"m": "male", "f": "female"}
+BLOOD_GROUPS = ("A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-")
+
+ProgressFn = Callable[[float, str], None]
+Profile = Tuple[str, Optional[int], Optional[str], Optional[str]]  # (user_id, age, gender, blood_group)
+
+
+@dataclass
+class FeatureSpec:
+    """
+    How a user becomes a feature row: standardized age (plus a missing
+    flag), one-hot gender and blood group (with an unknown slot each),
+    and log1p record counts - in total and per record category.
+    """
+    categories: List[str]
+    label_category: Optional[str] = None
+    age_mean: float = 0.0
+    age_std: float = 1.0
+    genders: List[str] = field(default_factory=lambda: list(GENDERS))
+    blood_groups: List[str] = field(default_factory=lambda: list(BLOOD_GROUPS))
+
+    def __post_init__(self):
+        self._gender_index = {g: i for i, g in enumerate(self.genders)}
+        self._blood_index = {b: i for i, b in enumerate(self.blood_groups)}
+        self._category_index = {c: i for i, c in enumerate(self.categories)}
+
+    @property
+    def names(self) -> List[str]:
+        return (
+            ["age", "age_missing"]
+            + [f"gender_{g}" for g in self.genders] + ["gender_unknown"]
+            + [f"blood_{b}" for b in self.blood_groups] + ["blood_unknown"]
+            + ["records_total"]
+            + [f"records_{c}" for c in self.categories]
+        )
+
+    @property
+    def width(self) -> int:
+        return 2 + len(self.genders) + 1 + len(self.blood_groups) + 1 + 1 + len(self.categories)
+
+    def encode(self, profiles: Sequence[Profile], counts: np.ndarray, totals: np.ndarray,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature rows for a batch of users
+
+        Args:
+            profiles: (user_id, age, gender, blood_group) per user
+            counts: Records per user and spec category, shape (users, len(categories))
+            totals: Records per user, the label category excluded
+            out: Zeroed float32 array of shape (users, width) to fill, e.g. a memmap slice
+
+        Returns:
+            The filled feature rows
+        """
+        n = len(profiles)
+        X = np.zeros((n, self.width), dtype=np.float32) if out is None else out
+        rows = np.arange(n)
+        ages = np.fromiter((np.nan if p[1] is None else p[1] for p in profiles), dtype=np.float64, count=n)
+        missing = np.isnan(ages)
+        X[:, 0] = np.where(missing, 0.0, (ages - self.age_mean) / self.age_std)
+        X[:, 1] = missing
+        offset = 2
+        unknown = len(self.genders)
+        genders = np.fromiter((self._gender_index.get(_gender(p[2]), unknown) for p in profiles), dtype=np.intp, count=n)
+        X[rows, offset + genders] = 1
+        offset += unknown + 1
+        unknown = len(self.blood_groups)
+        blood = np.fromiter((self._blood_index.get(_blood_group(p[3]), unknown) for p in profiles), dtype=np.intp, count=n)
+        X[rows, offset + blood] = 1
+        offset += unknown + 1
+        X[:, offset] = np.log1p(totals)
+        X[:, offset + 1:] = np.log1p(counts)
+        return X
+
+    def category_column(self, category: Optional[str]) -> Optional[int]:
+        return self._category_index.get(category)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureSpec":
+        return cls(**data)
+
+
+def _gender(value: Optional[str]) -> Optional[str]:
+    value = (value or "").strip().lower()
+    return GENDER_ALIASES.get(value, value)
+
+
+def _blood_group(value: Optional[str]) -> Optional[str]:
+    return (value or "").replace(" ", "").upper()
+
+
+def build_feature_spec(session: Session, label_category: Optional[str] = RISK_LABEL_CATEGORY,
+                       max_categories: int = RISK_MAX_CATEGORIES) -> FeatureSpec:
+    """Vocabulary and age scaling from the current users and records"""
+    managers = DatabaseManager(session)
+    totals = managers.get_database(DBType.RECORD_DB).category_totals()
+    categories = [c for c, _ in totals if c and c != label_category][:max_categories]
+    mean, mean_sq = managers.get_database(DBType.USER_DB).age_moments()
+    if mean is None:
+        return FeatureSpec(categories, label_category)
+    std = math.sqrt(max(float(mean_sq) - float(mean) ** 2, 0.0))
+    return FeatureSpec(categories, label_category, float(mean), std if std > 1e-6 else 1.0)
+
+
+def record_counts(session: Session, spec: FeatureSpec, user_ids: List[str]
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-user record counts for a batch of users
+
+    Returns:
+        (counts per spec category, totals without the label category, has a label-category record)
+    """
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+    counts = np.zeros((len(user_ids), len(spec.categories)), dtype=np.float32)
+    totals = np.zeros(len(user_ids), dtype=np.float32)
+    labelled = np.zeros(len(user_ids), dtype=bool)
+    for user_id, category, n in DatabaseManager(session).get_database(DBType.RECORD_DB).category_counts(user_ids):
+        row = index[user_id]
+        if spec.label_category is not None and category == spec.label_category:
+            labelled[row] = True
+            continue
+        totals[row] += n
+        column = spec.category_column(category)
+        if column is not None:
+            counts[row, column] = n
+    return counts, totals, labelled
+
+
+@dataclass
+class TrainingSet:
+    """Features and labels as .npy files, opened memory-mapped"""
+    directory: str
+    rows: int
+    spec: FeatureSpec
+
+    @property
+    def features(self) -> np.ndarray:
+        return np.load(os.path.join(self.directory, "features.npy"), mmap_mode="r")[:self.rows]
+
+    @property
+    def labels(self) -> np.ndarray:
+        return np.load(os.path.join(self.directory, "labels.npy"), mmap_mode="r")[:self.rows]
+
+    def remove(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def build_training_set(session: Session, directory: str, spec: FeatureSpec,
+                       labels: Optional[Dict[str, int]] = None, batch_size: int = 5000) -> TrainingSet:
+    """
+    Write the feature matrix of all users to ``directory`` batch by batch,
+    so memory use stays flat however many users there are
+
+    Args:
+        session: Database session
+        directory: Where features.npy / labels.npy are written
+        spec: Feature encoding
+        labels: Explicit {user_id: 0|1}; only these users are used. Otherwise a user
+            is positive when they have a record in ``spec.label_category``
+        batch_size: Users read and encoded per batch
+
+    Returns:
+        TrainingSet over the written rows
+    """
+    users = DatabaseManager(session).get_database(DBType.USER_DB)
+    capacity = len(labels) if labels is not None else users.count()
+    os.makedirs(directory, exist_ok=True)
+    X = np.lib.format.open_memmap(os.path.join(directory, "features.npy"), mode="w+",
+                                  dtype=np.float32, shape=(max(capacity, 1), spec.width))
+    y = np.lib.format.open_memmap(os.path.join(directory, "labels.npy"), mode="w+",
+                                  dtype=np.float32, shape=(max(capacity, 1),))
+    rows = 0
+    for batch in users.iter_profiles(batch_size):
+        if labels is not None:
+            batch = [p for p in batch if p[0] in labels]
+        batch = batch[:capacity - rows]  # users created while this runs
+        if not batch:
+            continue
+        user_ids = [p[0] for p in batch]
+        counts, totals, labelled = record_counts(session, spec, user_ids)
+        spec.encode(batch, counts, totals, out=X[rows:rows + len(batch)])
+        y[rows:rows + len(batch)] = [labels[u] for u in user_ids] if labels is not None else labelled
+        rows += len(batch)
+    X.flush(); y.flush()
+    del X, y
+    return TrainingSet(directory, rows, spec)
+
+
+@dataclass
+class TrainingParams:
+    epochs: int = 5
+    batch_size: int = 8192
+    learning_rate: float = 0.05
+    l2: float = 1e-4
+    validation_fraction: float = 0.2
+    class_weight: str = "balanced"  # balanced | none
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, parameters: Dict[str, Any]) -> "TrainingParams":
+        params = cls(**{k: v for k, v in parameters.items() if k in cls.__dataclass_fields__})
+        if params.epochs < 1 or params.batch_size < 1:
+            raise ValueError("epochs and batch_size must be at least 1")
+        if not 0 <= params.validation_fraction < 1:
+            raise ValueError("validation_fraction must be in [0, 1)")
+        if params.class_weight not in ("balanced", "none"):
+            raise ValueError("class_weight must be 'balanced' or 'none'")
+        return params
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    # tanh form: no overflow warnings for large |z|
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+class LogisticRegressionTrainer:
+    """
+    L2-regularized logistic regression trained with Adam on mini-batches.
+    Batches are contiguous row ranges of the (memory-mapped) feature
+    matrix, read sequentially and visited in a shuffled order each epoch,
+    so only one batch is ever resident. A seeded random ``validation_fraction``
+    of the rows is held out for the metrics.
+    """
+
+    def __init__(self, params: Optional[TrainingParams] = None):
+        self.params = params or TrainingParams()
+
+    def fit(self, X: np.ndarray, y: np.ndarray, progress: Optional[ProgressFn] = None
+            ) -> Tuple[np.ndarray, float, Dict[str, Any]]:
+        """
+        Args:
+            X: Feature matrix, shape (rows, features); may be a memmap
+            y: 0/1 labels, shape (rows,)
+            progress: Called with (fraction done, message) about once a second
+
+        Returns:
+            (weights, bias, metrics); metrics carry the TrainingMetrics fields
+        """
+        p = self.params
+        started = time.monotonic()
+        n, d = X.shape
+        rng = np.random.default_rng(p.seed)
+        validation = rng.random(n) < p.validation_fraction
+        train = ~validation
+        if not validation.any():
+            validation = train  # too few rows to hold any out: report training metrics
+        positives = float(np.asarray(y)[train].sum())
+        train_rows = int(train.sum())
+        if positives == 0 or positives == train_rows:
+            raise ValueError("Training data needs both positive and negative examples")
+        if p.class_weight == "balanced":
+            pos_weight, neg_weight = train_rows / (2 * positives), train_rows / (2 * (train_rows - positives))
+        else:
+            pos_weight = neg_weight = 1.0
+
+        w = np.zeros(d, dtype=np.float32)
+        b = 0.0
+        m_w, v_w = np.zeros_like(w), np.zeros_like(w)
+        m_b = v_b = 0.0
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        starts = np.arange(0, n, p.batch_size)
+        last_report = time.monotonic()
+
+        for epoch in range(p.epochs):
+            loss_sum = weight_sum = 0.0
+            for i, start in enumerate(rng.permutation(starts)):
+                end = min(start + p.batch_size, n)
+                keep = train[start:end]
+                xb = np.asarray(X[start:end])[keep]
+                yb = np.asarray(y[start:end])[keep]
+                if not len(yb):
+                    continue
+                pb = sigmoid(xb @ w + b)
+                sample_weight = np.where(yb > 0.5, pos_weight, neg_weight).astype(np.float32)
+                err = (pb - yb) * sample_weight
+                grad_w = xb.T @ err / len(yb) + p.l2 * w
+                grad_b = float(err.mean())
+
+                step += 1
+                m_w = beta1 * m_w + (1 - beta1) * grad_w
+                v_w = beta2 * v_w + (1 - beta2) * grad_w * grad_w
+                m_b = beta1 * m_b + (1 - beta1) * grad_b
+                v_b = beta2 * v_b + (1 - beta2) * grad_b * grad_b
+                lr = p.learning_rate * math.sqrt(1 - beta2 ** step) / (1 - beta1 ** step)
+                w -= (lr * m_w / (np.sqrt(v_w) + eps)).astype(np.float32)
+                b -= lr * m_b / (math.sqrt(v_b) + eps)
+
+                loss_sum += float((sample_weight * _log_loss(pb, yb)).sum())
+                weight_sum += float(sample_weight.sum())
+                if progress and time.monotonic() - last_report >= RISK_PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    progress((epoch + (i + 1) / len(starts)) / p.epochs, f"Epoch {epoch + 1}/{p.epochs}")
+            if progress:
+                last_report = time.monotonic()
+                loss = loss_sum / weight_sum if weight_sum else float("nan")
+                progress((epoch + 1) / p.epochs, f"Epoch {epoch + 1}/{p.epochs}: training loss {loss:.4f}")
+
+        metrics = evaluate(X, y, w, b, validation, p.batch_size)
+        metrics["training_time_seconds"] = time.monotonic() - started
+        metrics["training_rows"] = train_rows
+        return w, b, metrics
+
+
+def _log_loss(p: np.ndarray, y: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-7, 1 - 1e-7)
+    return -(y * np.log(p) + (1 - y) * np.log(1 - p))
+
+
+def evaluate(X: np.ndarray, y: np.ndarray, w: np.ndarray, b: float, rows: np.ndarray,
+             batch_size: int = 8192, threshold: float = 0.5) -> Dict[str, Any]:
+    """Accuracy, precision, recall, F1 and log loss over the ``rows`` mask, batch by batch"""
+    tp = fp = fn = tn = 0
+    loss = 0.0
+    for start in range(0, X.shape[0], batch_size):
+        keep = rows[start:start + batch_size]
+        xb = np.asarray(X[start:start + batch_size])[keep]
+        yb = np.asarray(y[start:start + batch_size])[keep] > 0.5
+        if not len(yb):
+            continue
+        pb = sigmoid(xb @ w + b)
+        predicted = pb >= threshold
+        tp += int((predicted & yb).sum()); fp += int((predicted & ~yb).sum())
+        fn += int((~predicted & yb).sum()); tn += int((~predicted & ~yb).sum())
+        loss += float(_log_loss(pb, yb).sum())
+    total = tp + fp + fn + tn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "accuracy": (tp + tn) / total if total else None,
+        "precision": precision,
+        "recall": recall,
+        "f1_score": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "loss": loss / total if total else None,
+        "validation_rows": total,
+    }
+
+
+@dataclass
+class RiskModel:
+    name: str
+    version: str
+    weights: np.ndarray
+    bias: float
+    spec: FeatureSpec
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    trained_at: Optional[str] = None
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return sigmoid(X @ self.weights + self.bias)
+
+    def explain(self, x: np.ndarray, top: int = 3) -> List[Tuple[str, float]]:
+        """The features that moved one row's score the most, as (name, logit contribution)"""
+        contributions = self.weights * x
+        order = np.argsort(-np.abs(contributions))[:top]
+        return [(self.spec.names[i], float(contributions[i])) for i in order if contributions[i] != 0]
+
+    def register(self, registry: ModelRegistry, training_job_id: Optional[str] = None,
+                 description: Optional[str] = None) -> ModelVersionResponse:
+        """Store this version in the model registry and make it the active one"""
+        return registry.register_version(
+            self.name, self.version,
+            arrays={"weights": self.weights},
+            manifest={"bias": self.bias, "trained_at": self.trained_at},
+            metrics=self.metrics,
+            feature_schema={**self.spec.to_dict(), "features": self.spec.names},
+            training_job_id=training_job_id, description=description,
+        )
+
+    @classmethod
+    def from_artifact(cls, artifact: ModelArtifact) -> "RiskModel":
+        schema = {k: v for k, v in artifact.feature_schema.items() if k != "features"}
+        return cls(
+            name=artifact.name, version=artifact.version, weights=artifact.array("weights"),
+            bias=artifact.manifest["bias"], spec=FeatureSpec.from_dict(schema), metrics=artifact.metrics,
+            trained_at=artifact.manifest.get("trained_at"),
+        )
+
+
+def score_user(session: Session, model: RiskModel, user_id: str) -> Optional[Tuple[float, List[Tuple[str, float]]]]:
+    """
+    Risk of one user under ``model``
+
+    Returns:
+        (probability, main contributing features), or None if the user does not exist
+    """
+    user = DatabaseManager(session).get_database(DBType.USER_DB).get_by_id(user_id)
+    if user is None:
+        return None
+    profile = (user.id, user.age, user.gender, user.blood_group)
+    counts, totals, _ = record_counts(session, model.spec, [user.id])
+    x = model.spec.encode([profile], counts, totals)[0]
+    return float(model.predict_proba(x)), model.explain(x)
+
+
+def train_risk_model(training_data: Dict[str, Any], parameters: Dict[str, Any],
+                     progress: Optional[ProgressFn] = None,
+                     session_factory: Callable[[], Session] = SessionLocal,
+                     training_job_id: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build features for every user, train, and register a new active model version
+
+    Args:
+        training_data: Optional "labels" ({user_id: 0|1}) or "label_category" (default
+            RISK_LABEL_CATEGORY: users with such a record are positive)
+        parameters: TrainingParams fields, plus "max_categories"
+        progress: Called with (fraction done, message)
+        session_factory: Sessions for reading users and records and registering the model
+        training_job_id: The job training it, recorded in the registry
+        description: Recorded in the registry
+
+    Returns:
+        {"metrics", "model_version", "rows", "features"}
+    """
+    params = TrainingParams.from_dict(parameters)
+    labels = training_data.get("labels")
+    if labels is not None:
+        labels = {str(k): int(bool(v)) for k, v in labels.items()}
+    label_category = None if labels is not None else training_data.get("label_category", RISK_LABEL_CATEGORY)
+    version = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    report = progress or (lambda fraction, message: None)
+
+    report(0.0, "Building features")
+    with session_factory() as session:
+        spec = build_feature_spec(session, label_category,
+                                  int(parameters.get("max_categories", RISK_MAX_CATEGORIES)))
+        dataset = build_training_set(session, os.path.join(RISK_FEATURES_DIR, version), spec, labels)
+    try:
+        if dataset.rows == 0:
+            raise ValueError("No users to train on")
+        report(0.1, f"Training on {dataset.rows} users x {spec.width} features")
+        weights, bias, metrics = LogisticRegressionTrainer(params).fit(
+            dataset.features, dataset.labels, lambda fraction, message: report(0.1 + 0.9 * fraction, message),
+        )
+    finally:
+        dataset.remove()
+    model = RiskModel(RISK_MODEL_NAME, version, weights, bias, spec, metrics, datetime.utcnow().isoformat())
+    with session_factory() as session:
+        model.register(ModelRegistry(session), training_job_id, description)
+    return {"metrics": metrics, "model_version": version, "rows": dataset.rows, "features": spec.width}
+
+
+register_model_loader(RISK_MODEL_NAME, RiskModel.from_artifact)
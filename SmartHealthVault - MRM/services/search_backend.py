@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "ddgs").strip().lower()  # ddgs | fixture
+SEARCH_FIXTURES = os.getenv(
+    "SEARCH_FIXTURES", os.path.join(os.path.dirname(os.path.dirname(__file__)), "fixtures", "search_results.json")
+)
+SEARCH_FIXTURE_LATENCY_MS = float(os.getenv("SEARCH_FIXTURE_LATENCY_MS", 0))
+
+
+class SearchBackend(ABC):
+    """Web search returning DDGS-shaped results: dicts with title, href and body"""
+
+    @abstractmethod
+    def text(self, query: str, max_results: int = 5) -> List[Dict[str, str]]: ...
+
+
+class DDGSSearchBackend(SearchBackend):
+    def text(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        from ddgs import DDGS
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+
+class FixtureSearchBackend(SearchBackend):
+    """
+    Offline search for load tests. The fixture file maps queries to result
+    lists; any other query gets a deterministic selection from the
+    ``"*"`` pool (or every result in the file), so repeated runs see
+    identical results.
+    """
+
+    def __init__(self, path: str = SEARCH_FIXTURES, latency_ms: float = SEARCH_FIXTURE_LATENCY_MS):
+        with open(path, encoding="utf-8") as f:
+            fixtures: Dict[str, List[Dict[str, str]]] = json.load(f)
+        self.by_query = {q.strip().lower(): r for q, r in fixtures.items() if q != "*"}
+        self.pool = fixtures.get("*") or [r for results in fixtures.values() for r in results]
+        self.latency_ms = latency_ms
+
+    def text(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        results = self.by_query.get(query.strip().lower())
+        if results is None and self.pool:
+            start = int(hashlib.sha256(query.encode("utf-8")).hexdigest(), 16) % len(self.pool)
+            results = [self.pool[(start + i) % len(self.pool)] for i in range(min(max_results, len(self.pool)))]
+        return [dict(r) for r in (results or [])[:max_results]]
+
+
+_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """The backend selected by SEARCH_BACKEND (created on first use)"""
+    global _backend
+    if _backend is None:
+        if SEARCH_BACKEND == "fixture":
+            _backend = FixtureSearchBackend()
+        elif SEARCH_BACKEND == "ddgs":
+            _backend = DDGSSearchBackend()
+        else:
+            raise ValueError(f"Unknown SEARCH_BACKEND: {SEARCH_BACKEND}")
+    return _backend
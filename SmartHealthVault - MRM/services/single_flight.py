@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# name -> group, for /metrics/coalescing
+_groups: Dict[str, "SingleFlight | AsyncSingleFlight"] = {}
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0  # calls that waited on another caller's computation
+
+    def record(self, leader: bool) -> None:
+        self.calls += 1
+        if leader:
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key for thread-based callers
+    (``def`` routes): the first caller runs the function, callers arriving
+    while it runs wait for and share its result, or its exception. Nothing
+    is kept once the call finishes; this deduplicates in-flight work within
+    one process, it is not a cache. Shared results must be treated as
+    read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = FlightStats()
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        _groups[name] = self
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            self.stats.record(leader)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    ``SingleFlight`` for coroutines on one event loop. The computation runs
+    as its own task, so a caller that goes away (client disconnect) does not
+    cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = FlightStats()
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        _groups[name] = self
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        task = self._calls.get(key)
+        leader = task is None
+        if leader:
+            task = self._calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda t: self._finished(key, t))
+        self.stats.record(leader)
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure is not logged as lost
+
+
+def single_flight_stats() -> Dict[str, Any]:
+    return {
+        name: {**vars(group.stats), "in_flight": group.in_flight}
+        for name, group in _groups.items()
+    }
@@ -0,0 +1,186 @@
+import contextvars
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from database.cache import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from services.llm_gateway import llm_gateway
+
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-3.5-turbo")
+# Size of a map-step chunk, in characters (~2k tokens)
+CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", 8000))
+# Most text a single prompt may carry; longer input is reduced level by level until it fits
+REDUCE_INPUT_CHARS = int(os.getenv("SUMMARY_REDUCE_INPUT_CHARS", 12000))
+# Chunk summaries in flight at once, across all requests in this process
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 4))
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "sqlite").strip().lower()
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "./cache/summaries.db")
+SUMMARY_CACHE_TTL = int(os.getenv("SUMMARY_CACHE_TTL", 30 * 24 * 3600))
+# Bump when NOTES_PROMPT changes so cached chunk summaries are not reused
+PROMPT_VERSION = 1
+
+NOTES_PROMPT = (
+    "You condense one section of a longer document. Keep every relevant fact: "
+    "findings, diagnoses, medications and doses, dates, numbers and names. "
+    "Write compact prose with no preamble."
+)
+NOTES_MAX_TOKENS = 400
+CONDENSED_NOTE = "(The text below is condensed notes from consecutive sections of a longer document.)\n\n"
+
+# (system prompt, user prompt, max tokens) -> completion text
+Completion = Callable[[str, str, int], str]
+
+_in_flight = threading.BoundedSemaphore(SUMMARY_CONCURRENCY)
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def chunk_text(text: str, chunk_size: int = CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of at most ``chunk_size`` characters on word boundaries"""
+    chunks = []
+    current: List[str] = []
+    length = 0
+    for word in text.split():
+        if length + len(word) + 1 > chunk_size and current:
+            chunks.append(" ".join(current))
+            current = []
+            length = 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _pack(notes: List[str], limit: int) -> List[str]:
+    """Join consecutive notes into groups of at most ``limit`` characters"""
+    groups: List[str] = []
+    current: List[str] = []
+    length = 0
+    for note in notes:
+        if current and length + len(note) + 2 > limit:
+            groups.append("\n\n".join(current))
+            current = []
+            length = 0
+        current.append(note)
+        length += len(note) + 2
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def default_cache() -> Optional[CacheBackend]:
+    """The process-wide chunk summary cache selected by SUMMARY_CACHE_BACKEND"""
+    global _cache
+    with _cache_lock:
+        if _cache is None and SUMMARY_CACHE_BACKEND not in ("", "none", "off"):
+            if SUMMARY_CACHE_BACKEND == "memory":
+                _cache = MemoryCacheBackend(10_000, 64 * 1024 * 1024)
+            else:
+                _cache = SQLiteCacheBackend(SUMMARY_CACHE_PATH, 100_000, 256 * 1024 * 1024)
+        return _cache
+
+
+@dataclass
+class SummaryResult:
+    summary: str
+    chunks: int      # map-step chunks (0 when the text fit in one prompt)
+    depth: int       # condensing levels before the final reduce
+    cache_hits: int  # chunk summaries served from the cache
+
+
+class MapReduceSummarizer:
+    """
+    Hierarchical summarization for text longer than one prompt.
+
+    The text is split into chunks that are condensed concurrently (map);
+    the condensed notes are packed and condensed again until they fit in a
+    single prompt, which produces the final summary (reduce). The number of
+    levels follows from the document size: text that already fits goes
+    straight to the final call.
+
+    Condensed notes do not depend on the requested summary length and are
+    cached by a hash of their input, so re-summarizing the same document at
+    another length only reruns the final call.
+    """
+
+    def __init__(
+        self,
+        complete: Optional[Completion] = None,
+        route: str = "summary.condense",
+        model: str = SUMMARY_MODEL,
+        chunk_chars: int = CHUNK_CHARS,
+        reduce_input_chars: int = REDUCE_INPUT_CHARS,
+        cache: Optional[CacheBackend] = None,
+    ):
+        self.complete = complete or llm_gateway.completion(route, model=model)
+        self.model = model
+        self.chunk_chars = chunk_chars
+        self.reduce_input_chars = reduce_input_chars
+        self.cache = cache if cache is not None else default_cache()
+
+    def summarize(self, text: str, system_prompt: str, max_tokens: int, instruction: str = "") -> SummaryResult:
+        """
+        Summarize text of any length
+
+        Args:
+            text: The text to summarize
+            system_prompt: System prompt of the final call (length, key points, ...)
+            max_tokens: Token budget of the final call
+            instruction: Prefix of the final user prompt, e.g. "Text to summarize:\\n\\n"
+
+        Returns:
+            SummaryResult with the summary and how it was produced
+        """
+        text = text.strip()
+        if len(text) <= self.reduce_input_chars:
+            return SummaryResult(self.complete(system_prompt, f"{instruction}{text}", max_tokens), 0, 0, 0)
+
+        chunks = chunk_text(text, self.chunk_chars)
+        notes, hits = self._condense(chunks)
+        depth = 1
+        while len(notes) > 1 and sum(len(n) + 2 for n in notes) > self.reduce_input_chars:
+            groups = _pack(notes, self.reduce_input_chars)
+            if len(groups) == len(notes):
+                break  # notes are as long as the limit; condensing further cannot shrink them
+            notes, level_hits = self._condense(groups)
+            hits += level_hits
+            depth += 1
+
+        body = CONDENSED_NOTE + "\n\n".join(notes)
+        summary = self.complete(system_prompt, f"{instruction}{body}", max_tokens)
+        return SummaryResult(summary, len(chunks), depth, hits)
+
+    def _condense(self, pieces: List[str]):
+        results: List[Optional[str]] = [self._cached(p) for p in pieces]
+        hits = sum(r is not None for r in results)
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            # worker threads start with an empty context; give each a copy of ours so
+            # the map calls are attributed to the same request (usage accounting)
+            context = contextvars.copy_context()
+            with ThreadPoolExecutor(max_workers=min(SUMMARY_CONCURRENCY, len(missing))) as pool:
+                condense = lambda i: context.copy().run(self._condense_one, pieces[i])
+                for i, note in zip(missing, pool.map(condense, missing)):
+                    results[i] = note
+        return results, hits
+
+    def _condense_one(self, piece: str) -> str:
+        with _in_flight:
+            note = self.complete(NOTES_PROMPT, piece, NOTES_MAX_TOKENS)
+        if self.cache is not None:
+            self.cache.set(self._key(piece), note.encode("utf-8"), SUMMARY_CACHE_TTL)
+        return note
+
+    def _cached(self, piece: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        data = self.cache.get(self._key(piece))
+        return data.decode("utf-8") if data is not None else None
+
+    def _key(self, piece: str) -> str:
+        digest = hashlib.sha256(piece.encode("utf-8")).hexdigest()
+        return f"summary:v{PROMPT_VERSION}:{self.model}:{digest}"
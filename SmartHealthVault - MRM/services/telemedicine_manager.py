@@ -1,8 +1,9 @@
 from database.db_manager import DatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.telemedicine_schema import TelemedicineParser
 from parsers.telemedicine_parser import AppointmentCreate
-from typing import List
+from typing import Optional
 from sqlalchemy.orm import Session
 
 class TelemedicineManager:
@@ -18,8 +19,13 @@ class TelemedicineManager:
         r = self.db.get_by_id(appointment_id)
         return TelemedicineParser.to_json(r) if r else None
 
-    def list_appointments(self) -> List:
-        return [TelemedicineParser.to_json(r) for r in self.db.list_all()]
+    def list_appointments(self, doctor_id: str = None, user_id: str = None,
+                          limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        filters = {}
+        if doctor_id: filters["doctor_id"] = doctor_id
+        if user_id: filters["user_id"] = user_id
+        page = self.db.list_page(filters, limit=limit, cursor=cursor)
+        return Page([TelemedicineParser.to_json(r) for r in page.items], page.next_cursor)
 
     def update_appointment(self, appointment_id: str, updates: dict):
         r = self.db.update(appointment_id, updates)
@@ -0,0 +1,143 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+import anyio
+from fastapi import UploadFile
+
+from services.blob_store import STAGING_DIR
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MAX_PDF_BYTES = int(os.getenv("UPLOAD_MAX_PDF_BYTES", 25 * 1024 * 1024))
+MAX_IMAGE_BYTES = int(os.getenv("UPLOAD_MAX_IMAGE_BYTES", 10 * 1024 * 1024))
+
+
+@dataclass(frozen=True)
+class UploadType:
+    mime_type: str
+    extension: str
+    max_bytes: int
+    magic: tuple  # accepted leading byte signatures
+
+
+UPLOAD_TYPES = [
+    UploadType("application/pdf", ".pdf", MAX_PDF_BYTES, (b"%PDF-",)),
+    UploadType("image/png", ".png", MAX_IMAGE_BYTES, (b"\x89PNG\r\n\x1a\n",)),
+    UploadType("image/jpeg", ".jpg", MAX_IMAGE_BYTES, (b"\xff\xd8\xff",)),
+    UploadType("image/gif", ".gif", MAX_IMAGE_BYTES, (b"GIF87a", b"GIF89a")),
+]
+ALLOWED_TYPES = {t.mime_type for t in UPLOAD_TYPES}
+
+
+class UploadRejected(Exception):
+    """The upload failed validation; ``status_code`` is the HTTP status to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff(head: bytes) -> Optional[UploadType]:
+    """Identify the file type from its first bytes, ignoring the client's content_type"""
+    for upload_type in UPLOAD_TYPES:
+        if head.startswith(upload_type.magic):
+            return upload_type
+    return None
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+    mime_type: str
+    original_filename: Optional[str] = None
+
+    def metadata(self) -> Dict[str, Any]:
+        """Record metadata so later stages never need to re-read the file"""
+        return {
+            "sha256": self.sha256,
+            "size_bytes": self.size,
+            "mime_type": self.mime_type,
+            "original_filename": self.original_filename,
+        }
+
+
+class UploadPipeline:
+    """
+    Streams an ``UploadFile`` into the blob store's staging directory in
+    fixed-size chunks; ``AsyncBlobStore.put`` then files it by content hash.
+
+    The type is sniffed from the first chunk, and the SHA-256 and byte count
+    are computed in the same pass as the write. Writes go through anyio's
+    thread-backed file object, so the event loop never blocks on disk I/O.
+    Data is written to a temporary name and renamed only once it has
+    passed every check, so a rejected upload leaves nothing behind.
+    """
+
+    def __init__(self, staging_dir: str = STAGING_DIR, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self.staging_dir = staging_dir
+        self.chunk_size = chunk_size
+
+    async def ingest(self, file: UploadFile) -> StoredUpload:
+        """
+        Validate and store an uploaded file
+
+        Args:
+            file: The multipart file from the request
+
+        Returns:
+            StoredUpload with the staged path, SHA-256, size and sniffed MIME type
+
+        Raises:
+            UploadRejected: 400 for an empty file, 415 for an unrecognized type,
+                413 when the file exceeds its type's size limit
+        """
+        head = await file.read(self.chunk_size)
+        if not head:
+            raise UploadRejected(400, "Uploaded file is empty")
+        upload_type = sniff(head)
+        if upload_type is None:
+            raise UploadRejected(
+                415, f"File type not allowed. Allowed types: {', '.join(sorted(ALLOWED_TYPES))}"
+            )
+        # starlette knows the spooled size up front; reject without streaming when it can
+        if file.size is not None and file.size > upload_type.max_bytes:
+            raise self._too_large(upload_type)
+
+        await anyio.Path(self.staging_dir).mkdir(parents=True, exist_ok=True)
+        path = os.path.join(self.staging_dir, f"{uuid4().hex}{upload_type.extension}")
+        partial = f"{path}.part"
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with await anyio.open_file(partial, "wb") as out:
+                chunk = head
+                while chunk:
+                    size += len(chunk)
+                    if size > upload_type.max_bytes:
+                        raise self._too_large(upload_type)
+                    digest.update(chunk)
+                    await out.write(chunk)
+                    chunk = await file.read(self.chunk_size)
+            await anyio.Path(partial).rename(path)
+        except BaseException:
+            await anyio.Path(partial).unlink(missing_ok=True)
+            raise
+
+        return StoredUpload(
+            path=path,
+            sha256=digest.hexdigest(),
+            size=size,
+            mime_type=upload_type.mime_type,
+            original_filename=file.filename,
+        )
+
+    @staticmethod
+    def _too_large(upload_type: UploadType) -> UploadRejected:
+        limit_mb = upload_type.max_bytes / (1024 * 1024)
+        return UploadRejected(413, f"{upload_type.mime_type} uploads are limited to {limit_mb:g} MB")
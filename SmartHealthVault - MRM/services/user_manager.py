@@ -1,8 +1,11 @@
 from database.db_manager import DatabaseManager
 from database.enums import DBType
+from database.pagination import DEFAULT_PAGE_SIZE, Page
 from schemas.user_schema import UserParser
 from parsers.user_parser import UserCreate
-from typing import List, Optional
+from parsers.batch_parser import BatchResponse, run_batch
+from database.bulk import BulkItemResult
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -17,13 +20,33 @@ class UserManager:
         created = self.db.insert(model)
         return UserParser.to_response(created)
 
+    def import_users(self, items: List[Dict[str, Any]]) -> BatchResponse:
+        """
+        Bulk-create users, rejecting emails that are already registered or
+        repeated within the batch with one lookup instead of one per user
+        """
+        def write(models: List) -> List[BulkItemResult]:
+            taken = self.db.existing_emails([m.email for m in models])
+            results, fresh, positions = [], [], []
+            for i, m in enumerate(models):
+                if m.email in taken:
+                    results.append(BulkItemResult(i, None, "error", "Email already registered"))
+                    continue
+                taken.add(m.email)
+                fresh.append(m)
+                positions.append(i)
+            results += [r._replace(index=positions[r.index]) for r in self.db.insert_many(fresh)]
+            return results
+
+        return run_batch(items, UserCreate, UserParser.parse_create, write)
+
     def get_user(self, user_id: str):
         m = self.db.get_by_id(user_id)
         return UserParser.to_response(m) if m else None
 
-    def list_users(self) -> List:
-        rows = self.db.list_all()
-        return [UserParser.to_response(r) for r in rows]
+    def list_users(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Page:
+        page = self.db.list_page(limit=limit, cursor=cursor)
+        return Page([UserParser.to_response(r) for r in page.items], page.next_cursor)
 
     def update_user(self, user_id: str, updates: dict):
         # Handle password hashing
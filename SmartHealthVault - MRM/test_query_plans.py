@@ -0,0 +1,135 @@
+"""
+EXPLAIN QUERY PLAN checks for hot lookup queries.
+
+Each case runs the statement the application actually issues (captured from
+the concrete database classes where one exists) against a freshly migrated
+SQLite database and fails if SQLite falls back to a full table scan.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import sessionmaker
+
+from database.engine_config import EngineSettings, build_engine
+from database.migrations import upgrade_database
+from database.pagination import encode_cursor
+from database.concrete.doctor_db import DoctorDatabase
+from database.concrete.insurance_db import InsuranceDatabase
+from database.concrete.notification_db import NotificationDatabase
+from database.concrete.record_db import RecordDatabase
+from database.concrete.telemedicine_db import TelemedicineDatabase
+from database.concrete.user_db import UserDatabase
+from models.ai_ml_model import AIResultModel
+from models.insurance_model import ClaimModel
+from models.record_model import RecordModel
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    engine = build_engine(EngineSettings(database_url=f"sqlite:///{path}"))
+    upgrade_database(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def capture(engine, call):
+    """Run ``call`` and return the last (statement, parameters) it executed."""
+    executed = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+    return executed[-1]
+
+
+def query_plan(engine, statement, parameters):
+    with engine.connect() as conn:
+        raw = conn.connection.dbapi_connection.cursor()
+        rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def assert_no_scan(plan, table):
+    # "SCAN t USING INDEX ix" is an ordered index walk (keyset pages stop
+    # after LIMIT rows); only a bare "SCAN t" reads the whole table
+    scans = [step for step in plan if step.startswith(f"SCAN {table}") and "INDEX" not in step]
+    assert not scans, f"full scan of {table}: {plan}"
+    assert any("USING" in step and "INDEX" in step for step in plan), plan
+
+
+SINCE, UNTIL = datetime(2024, 1, 1), datetime(2025, 1, 1)
+CURSOR = encode_cursor(UNTIL, "r1")
+
+LOOKUPS = [
+    ("records", lambda s: RecordDatabase(s).list_all({"user_id": "u1"})),
+    ("appointments", lambda s: TelemedicineDatabase(s).list_all({"doctor_id": "d1"})),
+    ("appointments", lambda s: TelemedicineDatabase(s).list_all({"user_id": "u1"})),
+    ("notifications", lambda s: NotificationDatabase(s).list_all({"user_id": "u1"})),
+    ("policies", lambda s: InsuranceDatabase(s).list_all({"patient_id": "u1"})),
+    ("doctors", lambda s: DoctorDatabase(s).list_all({"specialization": "cardiology"})),
+    ("records", lambda s: RecordDatabase(s).list_page({"user_id": "u1"}, limit=20)),
+    ("records", lambda s: RecordDatabase(s).list_page(
+        {"user_id": "u1", "category": "lab"}, limit=20, cursor=CURSOR, summary=True)),
+    ("records", lambda s: RecordDatabase(s).list_page(
+        {"user_id": "u1", "created_from": SINCE, "created_to": UNTIL}, limit=20, summary=True)),
+    ("notifications", lambda s: NotificationDatabase(s).list_page({"user_id": "u1"}, limit=20)),
+    ("users", lambda s: UserDatabase(s).list_page(limit=20)),
+    ("doctors", lambda s: DoctorDatabase(s).list_page(limit=20)),
+]
+
+
+@pytest.mark.parametrize("table,call", LOOKUPS)
+def test_repository_lookup_uses_index(engine, session, table, call):
+    statement, parameters = capture(engine, lambda: call(session))
+    assert_no_scan(query_plan(engine, statement, parameters), table)
+
+
+PATIENT_PAGES = [
+    {"user_id": "u1"},
+    {"user_id": "u1", "category": "lab"},
+    {"user_id": "u1", "created_from": SINCE, "created_to": UNTIL},
+]
+
+
+@pytest.mark.parametrize("filters", PATIENT_PAGES)
+def test_patient_record_page_walks_index_in_order(engine, session, filters):
+    statement, parameters = capture(
+        engine, lambda: RecordDatabase(session).list_page(filters, limit=20, cursor=CURSOR, summary=True)
+    )
+    plan = query_plan(engine, statement, parameters)
+    assert_no_scan(plan, "records")
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    assert "content" not in statement.split("FROM")[0]
+
+
+TIMELINES = [
+    ("records", select(RecordModel).where(RecordModel.user_id == "u1")
+        .order_by(RecordModel.created_at.desc()).limit(20)),
+    ("ai_results", select(AIResultModel).where(AIResultModel.user_id == "u1")
+        .order_by(AIResultModel.created_at.desc()).limit(20)),
+    ("claims", select(ClaimModel).where(ClaimModel.policy_id == "p1")),
+    ("claims", select(ClaimModel).where(ClaimModel.patient_id == "u1")
+        .order_by(ClaimModel.created_at.desc())),
+]
+
+
+@pytest.mark.parametrize("table,stmt", TIMELINES)
+def test_timeline_query_uses_index_without_sort(engine, session, table, stmt):
+    statement, parameters = capture(engine, lambda: session.execute(stmt).all())
+    plan = query_plan(engine, statement, parameters)
+    assert_no_scan(plan, table)
+    assert not any("TEMP B-TREE" in step for step in plan), plan